@@ -0,0 +1,106 @@
+"""Compare the streaming reader against pd.read_excel on a synthetic MSRC export.
+
+    python benchmarks/bench_reader.py --rows 100000
+
+Each mode runs in its own process so peak RSS isn't polluted by the others.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+HEADERS = ["Release date", "Product", "Platform", "Impact", "Max Severity", "Article", "Download",
+           "Build Number", "Details"]
+PRODUCTS = ["Windows Server 2016", "Windows Server 2019", "Windows Server 2022", "Windows 11 Version 24H2",
+            "Microsoft .NET Framework 4.8", "Windows 10 Version 22H2"]
+IMPACTS = ["Elevation of Privilege", "Remote Code Execution", "Information Disclosure", "Denial of Service",
+           "Security Feature Bypass", "Spoofing"]
+
+
+def make_export(path, rows):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, HEADERS)
+    for i in range(1, rows + 1):
+        worksheet.write_row(i, 0, [
+            "Feb 10, 2026",
+            PRODUCTS[i % len(PRODUCTS)],
+            "",
+            IMPACTS[i % len(IMPACTS)],
+            "Important",
+            str(5075000 + i % 500),
+            "Security Update",
+            f"10.0.14393.{8000 + i % 900}",
+            f"CVE-2026-{20000 + i % 1500}",
+        ])
+    workbook.close()
+
+
+def run_mode(mode, path):
+    start = time.perf_counter()
+    if mode == "read_excel":
+        import pandas as pd
+
+        df = pd.read_excel(path)
+        df = df.iloc[:, [8, 0]].copy()
+        rows = len(df)
+    elif mode == "read_columns":
+        from msrc_scraper.reader import read_columns
+
+        rows = len(read_columns(path, ["Details", "Release date"]))
+    else:
+        from msrc_scraper.reader import iter_rows
+
+        rows = sum(1 for _ in iter_rows(path, ["Details", "Release date"]))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "rows": rows, "seconds": round(elapsed, 3), "peak_rss_mb": round(peak_kb / 1024, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--input", help="benchmark an existing export instead of a synthetic one")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.input)
+        return
+
+    tmp = None
+    path = args.input
+    if not path:
+        tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+        tmp.close()
+        path = tmp.name
+        print(f"Generating {args.rows} row export...")
+        make_export(path, args.rows)
+
+    results = []
+    try:
+        for mode in ("read_excel", "read_columns", "iter_rows"):
+            out = subprocess.run([sys.executable, __file__, "--mode", mode, "--input", path],
+                                 check=True, capture_output=True, text=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{mode:>13}: {result['rows']} rows in {result['seconds']:.2f}s, peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if tmp:
+            os.remove(path)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Memory of an enriched result frame: plain string columns vs msrc_scraper.results.compact.
+
+    python benchmarks/bench_results.py --rows 1000000
+
+Builds a synthetic full-year, all-products result the way main_final.py
+does (one string object per Details / Release date cell as read from the
+workbook, titles and assessments fanned out per CVE, a constant Today's
+Date) and reports the deep memory usage of what the script holds on to.
+Each mode runs in its own process; the compact mode also checks that
+``expand`` round-trips exactly.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+COLUMNS = ["Details", "Release date", "Today's Date", "Exploitability assessment", "Product"]
+ASSESSMENTS = ["Exploitation Less Likely"] * 6 + ["Exploitation More Likely"] * 3 \
+    + ["Exploitation Unlikely", "Exploitation Detected", "Unknown"]
+COMPONENTS = ["Windows Kernel", "Windows Hyper-V", "Microsoft Office", "Windows SMB", "Win32k", ".NET Framework",
+              "Windows Remote Desktop", "Microsoft Edge (Chromium-based)", "Windows DNS Server", "SQL Server"]
+IMPACTS = ["Elevation of Privilege", "Remote Code Execution", "Information Disclosure", "Denial of Service",
+           "Security Feature Bypass", "Spoofing"]
+
+
+def make_frame(rows, cves, seed=0):
+    import pandas as pd
+
+    from msrc_scraper.dedup import CveGroups
+
+    rng = random.Random(seed)
+    months = [date(2026, m, 10 + (m % 5)) for m in range(1, 13)]
+    ids = [f"CVE-2026-{20000 + i}" for i in range(cves)]
+    released = {cve: months[i * len(months) // cves].strftime("%b %d, %Y") for i, cve in enumerate(ids)}
+    details, dates = [], []
+    for _ in range(rows):
+        cve = ids[rng.randrange(cves)]
+        # "".join builds a new str like every cell openpyxl reads
+        details.append("".join(cve))
+        dates.append("".join(released[cve]))
+    df = pd.DataFrame({"Details": details, "Release date": dates}, dtype=object)
+    df["Release date"] = pd.to_datetime(df["Release date"], errors="coerce").dt.strftime("%Y-%m-%d").astype(object)
+    groups = CveGroups(df["Details"])
+    titles = {cve: f"{rng.choice(COMPONENTS)} {rng.choice(IMPACTS)} Vulnerability" for cve in ids}
+    assessments = {cve: rng.choice(ASSESSMENTS) for cve in ids}
+    df["Product"] = pd.Series(groups.fan_out(titles), dtype=object)
+    df["Exploitability assessment"] = pd.Series(groups.fan_out(assessments), dtype=object)
+    df["Today's Date"] = date.today().isoformat()
+    return df[COLUMNS]
+
+
+def run_mode(mode, rows, cves):
+    from msrc_scraper.results import compact, expand, memory_mb
+
+    df = make_frame(rows, cves)
+    result = {"mode": mode, "rows": rows}
+    if mode == "compact":
+        start = time.perf_counter()
+        small = compact(df)
+        result["compact_seconds"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        back = expand(small)
+        result["expand_seconds"] = round(time.perf_counter() - start, 3)
+        result["round_trip"] = bool(back.astype(object).equals(df.astype(object)))
+        del back
+        # What the script keeps around from here on
+        del df
+        df = small
+    result["frame_mb"] = round(memory_mb(df), 1)
+    result["dtypes"] = {column: str(dtype) for column, dtype in df.dtypes.items()}
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--cves", type=int, default=1200, help="distinct CVEs in the year (default: %(default)s)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.rows, args.cves)
+        return
+
+    results = []
+    for mode in ("strings", "compact"):
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, "--rows", str(args.rows),
+                              "--cves", str(args.cves)], check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        results.append(result)
+        extra = ""
+        if mode == "compact":
+            extra = (f", compact {result['compact_seconds']:.2f}s, expand {result['expand_seconds']:.2f}s,"
+                     f" round trip {'ok' if result['round_trip'] else 'MISMATCH'}")
+        print(f"{mode:>8}: {result['rows']} rows, frame {result['frame_mb']} MB{extra}")
+    strings, compacted = results
+    print(f"Compact frame is {strings['frame_mb'] / max(compacted['frame_mb'], 0.1):.0f}x smaller")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
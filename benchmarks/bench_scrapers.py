@@ -0,0 +1,327 @@
+"""Offline throughput benchmark for the scrapers against the local mock MSRC site.
+
+    python benchmarks/bench_scrapers.py --cves 300 --latency 0.05 --error-rate 0.02 --json bench.json
+
+Starts msrc_scraper.mock_msrc on a free port with a synthetic month of CVEs
+(or ``--root`` recordings), points MSRC_API_BASE / MSRC_SITE_BASE /
+MSRC_RSS_URL at it and runs each scenario in its own process so peak RSS
+and browser process counts aren't polluted by the others:
+
+    titles_api      add_product_titles through the CVRF API
+    titles_browser  add_product_titles with --backend browser
+    exploitability  add_exploitability with --backend browser
+    fetch_cve_data  fetch_cve_data for every CVE on one context
+    grid            the grid-scrape scraper (capture mode, headless)
+
+Pass ``--compare`` an earlier ``--json`` file to see the change per scenario.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+SCENARIOS = ("titles_api", "titles_browser", "exploitability", "fetch_cve_data", "grid")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class ProcessSampler:
+    """Samples the RSS of this process plus its children, and how many of them are browsers."""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_browsers = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        self._sample()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        if not os.path.isdir("/proc"):
+            return
+        parents = {}
+        names = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # "pid (comm) state ppid ...", comm may itself contain spaces or parens
+            names[int(entry)] = stat[stat.index("(") + 1:stat.rindex(")")]
+            parents[int(entry)] = int(stat[stat.rindex(")") + 2:].split()[1])
+        tree = {os.getpid()}
+        grew = True
+        while grew:
+            grew = False
+            for pid, ppid in parents.items():
+                if ppid in tree and pid not in tree:
+                    tree.add(pid)
+                    grew = True
+        rss = 0
+        for pid in tree:
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    rss += int(f.read().split()[1]) * self.page_size
+            except (OSError, IndexError, ValueError):
+                continue
+        browsers = sum(1 for pid in tree if "chrom" in names.get(pid, "") or "headless" in names.get(pid, ""))
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_browsers = max(self.peak_browsers, browsers)
+
+    @property
+    def peak_rss_mb(self):
+        if self.peak_rss:
+            return round(self.peak_rss / 1e6, 1)
+        # No /proc: fall back to the largest single process
+        usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                    resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return round(usage / 1024, 1)
+
+
+def timed(fn, latencies, failures):
+    """Wrap an async per-page function so every call's duration is recorded."""
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        except Exception:
+            failures.append(1)
+            raise
+        finally:
+            latencies.append(time.perf_counter() - start)
+    return wrapper
+
+
+def input_frame(root, columns):
+    import pandas as pd
+
+    from msrc_scraper.mock_msrc import Recordings
+
+    items = Recordings(root).items
+    df = pd.DataFrame({"Details": [item["cveNumber"] for item in items],
+                       "Release date": [item["releaseDate"][:10] for item in items]})
+    return df[columns]
+
+
+async def run_scenario(name, root, concurrency, workdir):
+    from msrc_scraper.routing import ResourceBlocker, RoutePolicy
+
+    latencies = []
+    failures = []
+    rows = cves = 0
+    if name in ("titles_api", "titles_browser", "fetch_cve_data"):
+        from msrc_scraper import enrich as script
+
+        script.read_cve_page = timed(script.read_cve_page, latencies, failures)
+        df = input_frame(root, ["Details", "Release date"])
+        rows, cves = len(df), df["Details"].nunique()
+        if name == "fetch_cve_data":
+            from playwright.async_api import async_playwright
+
+            sem = asyncio.Semaphore(concurrency)
+
+            async def fetch(context, cve):
+                async with sem:
+                    return await script.fetch_cve_data(context, f"{script.base_url}{cve}")
+
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=True)
+                context = await browser.new_context()
+                await ResourceBlocker(RoutePolicy()).install(context)
+                await asyncio.gather(*(fetch(context, cve) for cve in df["Details"].unique()))
+                await browser.close()
+        else:
+            backend = "api" if name == "titles_api" else "browser"
+            await script.add_product_titles(df, backend=backend, blocker=ResourceBlocker(RoutePolicy()),
+                                            concurrency=concurrency)
+    elif name == "exploitability":
+        from msrc_scraper import enrich as script
+
+        script.read_exploitability = timed(script.read_exploitability, latencies, failures)
+        df = input_frame(root, ["Details"])
+        rows, cves = len(df), df["Details"].nunique()
+        await script.add_exploitability(df, concurrency=concurrency, backend="browser",
+                                        blocker=ResourceBlocker(RoutePolicy()))
+    elif name == "grid":
+        from msrc_scraper import update_guide as script
+
+        script.fetch_title = timed(script.fetch_title, latencies, failures)
+        # The scraper writes its workbook to the working directory
+        os.chdir(workdir)
+        await script.scrape(mode="capture", headless=True)
+        from msrc_scraper.reader import iter_rows
+
+        details = [row[0] for row in iter_rows(os.path.join(workdir, "msrc_windows_server_2016.xlsx"), ["Article"])]
+        rows, cves = len(details), len(set(details))
+    else:
+        raise SystemExit(f"Unknown scenario {name!r}")
+    return rows, cves, latencies, len(failures)
+
+
+def run_child(args):
+    from msrc_scraper import readiness
+
+    with ProcessSampler() as sampler:
+        start = time.perf_counter()
+        rows, cves, latencies, failures = asyncio.run(run_scenario(args.scenario, args.root, args.concurrency,
+                                                                   args.workdir))
+        elapsed = time.perf_counter() - start
+    ready = {kind: round(percentile(values, 50), 3) for kind, values in readiness.stats.samples.items()}
+    print(json.dumps({
+        "scenario": args.scenario,
+        "rows": rows,
+        "cves": cves,
+        "seconds": round(elapsed, 3),
+        "cves_per_sec": round(cves / elapsed, 2) if elapsed else None,
+        "pages": len(latencies),
+        "page_failures": failures,
+        "latency_ms": {f"p{p}": round(percentile(latencies, p) * 1000, 1) if latencies else None
+                       for p in (50, 95, 99)},
+        "ready_p50_s": ready,
+        "ready_timeouts": dict(readiness.stats.timeouts),
+        "peak_rss_mb": sampler.peak_rss_mb,
+        "peak_browser_processes": sampler.peak_browsers,
+    }))
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def diff_counts(after, before):
+    return {key: {k: v - before.get(key, {}).get(k, 0) for k, v in after[key].items()} for key in after}
+
+
+def compare(results, previous_file):
+    with open(previous_file, encoding="utf-8") as f:
+        previous = {r["scenario"]: r for r in json.load(f).get("results", []) if "error" not in r}
+    print(f"\nCompared with {previous_file}:")
+    for result in results:
+        old = previous.get(result["scenario"])
+        if not old or "error" in result:
+            continue
+        change = (result["cves_per_sec"] / old["cves_per_sec"] - 1) if old.get("cves_per_sec") else 0
+        print(f"{result['scenario']:>15}: {old['cves_per_sec']} -> {result['cves_per_sec']} CVEs/s ({change:+.0%}),"
+              f" p95 {old['latency_ms']['p95']} -> {result['latency_ms']['p95']} ms,"
+              f" peak RSS {old['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cves", type=int, default=200, help="size of the synthetic month")
+    parser.add_argument("--root", help="serve these recordings instead of a synthetic month")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated (default: all)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every mock response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--render-delay", type=float, default=0.2, help="seconds before CVE pages show content")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json file to compare against")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_child(args)
+        return
+
+    from msrc_scraper.mock_msrc import serve, synthesize
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    tmp = tempfile.TemporaryDirectory()
+    root = args.root
+    if not root:
+        root = os.path.join(tmp.name, "recordings")
+        synthesize(root, args.cves, seed=args.seed)
+    server = serve(root, port=0, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                   render_delay=args.render_delay, seed=args.seed)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Mock MSRC on {base} ({root})")
+
+    results = []
+    try:
+        for name in scenarios:
+            workdir = tempfile.mkdtemp(dir=tmp.name)
+            env = dict(os.environ, MSRC_API_BASE=base, MSRC_SITE_BASE=base, MSRC_RSS_URL=f"{base}/update-guide/rss",
+                       MSRC_CACHE_DIR=os.path.join(workdir, "cache"))
+            before = server.stats.as_dict()
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", name, "--root", root,
+                                   "--concurrency", str(args.concurrency), "--workdir", workdir],
+                                  env=env, capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode != 0 or not lines:
+                # Last exception line, not Playwright's decorated hint box
+                errors = [l for l in proc.stderr.splitlines() if "Error" in l or "Exception" in l]
+                error = (errors or proc.stderr.strip().splitlines() or ["no output"])[-1].strip()
+                print(f"{name:>15}: failed: {error}")
+                results.append({"scenario": name, "error": error})
+                continue
+            result = json.loads(lines[-1])
+            result["server"] = diff_counts(server.stats.as_dict(), before)
+            results.append(result)
+            latency = result["latency_ms"]
+            print(f"{name:>15}: {result['cves']} CVEs in {result['seconds']:.2f}s ({result['cves_per_sec']} CVEs/s),"
+                  f" page p50/p95/p99 {latency['p50']}/{latency['p95']}/{latency['p99']} ms,"
+                  f" peak RSS {result['peak_rss_mb']} MB, {result['peak_browser_processes']} browser processes")
+    finally:
+        server.shutdown()
+        tmp.cleanup()
+
+    report = {
+        "version": git_version(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: getattr(args, k) for k in ("cves", "root", "concurrency", "latency", "jitter", "error_rate",
+                                                  "render_delay", "seed")},
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
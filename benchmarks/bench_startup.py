@@ -0,0 +1,133 @@
+"""Startup time of the msrc-scraper CLI: --help and enrich runs served entirely from the cache.
+
+    python benchmarks/bench_startup.py --repeat 7
+
+Runs each scenario in a fresh interpreter and reports the median wall
+time, the whole process from exec to exit, against its budget in BUDGETS
+(--budget-ms overrides them all). A bare ``python -c pass`` is printed
+alongside for reference only. The cache scenarios enrich a synthetic
+export whose CVEs are all in a pre-filled CVE cache, so nothing goes to
+the network or the browser: ``cache_stream`` with --stream, which never
+loads pandas, and ``cache_default`` without it, which does.
+
+Exits non-zero when a scenario goes over its budget or imports one of the
+libraries it shouldn't need (``-X importtime`` of one extra run).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+# ---- CONFIG ----
+# Median wall time allowed per scenario, in ms, with --cves 200
+BUDGETS = {"help": 250, "enrich_help": 250, "grid_help": 250, "cache_stream": 1500, "cache_default": 2500}
+# Libraries each scenario must not import
+HEAVY = ("pandas", "playwright", "httpx", "pyarrow")
+FORBIDDEN = {name: HEAVY for name in BUDGETS}
+# pandas imports pyarrow itself when it is installed
+FORBIDDEN["cache_default"] = ("playwright", "httpx")
+
+
+def make_fixture(workdir, cves):
+    """Export with ``cves`` CVEs x 5 products and a CVE cache that knows every one of them."""
+    import xlsxwriter
+
+    from msrc_scraper.cache import CveCache
+
+    path = os.path.join(workdir, "export.xlsx")
+    workbook = xlsxwriter.Workbook(path)
+    sheet = workbook.add_worksheet()
+    sheet.write_row(0, 0, ["Release date", "Product", "Platform", "Impact", "Max Severity", "Article", "Download",
+                           "Build Number", "Details"])
+    ids = [f"CVE-2026-{21000 + i}" for i in range(cves)]
+    row = 1
+    for cve in ids:
+        for product in range(5):
+            sheet.write_row(row, 0, ["Feb 10, 2026", f"Windows Server 20{16 + product}", "", "", "", f"KB50{row}",
+                                     "", "", cve])
+            row += 1
+    workbook.close()
+    cache = CveCache(cache_dir=os.path.join(workdir, "cache"))
+    for cve in ids:
+        cache.put(cve, title=f"Windows Kernel Elevation of Privilege Vulnerability {cve}",
+                  exploitability="Exploitation Less Likely")
+    cache.close()
+    return path
+
+
+def command(name, workdir, export):
+    cli = ["-m", "msrc_scraper"]
+    if name == "help":
+        return cli + ["--help"]
+    if name == "enrich_help":
+        return cli + ["enrich", "--help"]
+    if name == "grid_help":
+        return cli + ["grid-scrape", "--help"]
+    run = cli + ["enrich", export, "-o", os.path.join(workdir, f"{name}.xlsx"), "--no-snapshots",
+                 "--store", os.path.join(workdir, "results.sqlite3")]
+    return run + ["--stream"] if name == "cache_stream" else run
+
+
+def imported(stderr):
+    """Top-level packages in -X importtime output."""
+    packages = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            packages.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return packages
+
+
+def run(args_list, env, repeat):
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args_list], env=env, check=True, capture_output=True)
+        walls.append((time.perf_counter() - start) * 1000)
+    traced = subprocess.run([sys.executable, "-X", "importtime", *args_list], env=env, check=True,
+                            capture_output=True, text=True)
+    return statistics.median(walls), imported(traced.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="runs per scenario, the median counts (default: %(default)s)")
+    parser.add_argument("--cves", type=int, default=200, help="CVEs in the cached export (default: %(default)s)")
+    parser.add_argument("--budget-ms", type=float, help="one wall time budget for every scenario instead of BUDGETS")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        export = make_fixture(workdir, args.cves)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(ROOT), MSRC_CACHE_DIR=os.path.join(workdir, "cache"),
+                   # Anything that isn't cached fails fast instead of reaching MSRC
+                   MSRC_API_BASE="http://127.0.0.1:9", MSRC_SITE_BASE="http://127.0.0.1:9")
+        baseline, _ = run(["-c", "pass"], env, args.repeat)
+        print(f"{'python -c pass':>14}: {baseline:6.1f} ms")
+        for name, budget in BUDGETS.items():
+            budget = args.budget_ms or budget
+            wall, packages = run(command(name, workdir, export), env, args.repeat)
+            heavy = sorted(p for p in FORBIDDEN[name] if p in packages)
+            over = wall > budget
+            failed = failed or over or bool(heavy)
+            results.append({"scenario": name, "wall_ms": round(wall, 1), "budget_ms": budget,
+                            "heavy_imports": heavy})
+            flags = (" OVER BUDGET" if over else "") + (f" imported {', '.join(heavy)}" if heavy else "")
+            print(f"{name:>14}: {wall:6.1f} ms of {budget:.0f} ms{flags}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"baseline_ms": round(baseline, 1), "cves": args.cves, "results": results}, f, indent=2)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared helpers for the MSRC update scraper scripts."""
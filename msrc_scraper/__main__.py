@@ -0,0 +1,3 @@
+from msrc_scraper.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""Browserless CVE enrichment from the MSRC CVRF API.
+
+One monthly CVRF document describes every CVE released that month, so a
+whole MSRC export is usually covered by one or two requests. CVEs that
+aren't found in the API are handed to the next backend (the Playwright
+page scraper) by ``enrich_with_fallback``.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from msrc_scraper.extract import FIELDS
+from msrc_scraper.metrics import failure_kind, metrics
+from msrc_scraper.snapshots import capture_json
+
+# ---- CONFIG ----
+# Point MSRC_API_BASE at a local stand-in (see mock_msrc.py) to run offline
+api_base = os.environ.get("MSRC_API_BASE", "https://api.msrc.microsoft.com").rstrip("/")
+# Same for the Update Guide site the browser loads (CVE pages and the grid)
+site_base = os.environ.get("MSRC_SITE_BASE", "https://msrc.microsoft.com").rstrip("/")
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# CVRF threat types
+THREAT_IMPACT = 0
+THREAT_EXPLOIT_STATUS = 1
+THREAT_SEVERITY = 3
+
+
+def document_id_for(release_date):
+    """Monthly CVRF document id ("2026-Feb") for a release date string or datetime."""
+    if not release_date:
+        return None
+    if not isinstance(release_date, datetime):
+        try:
+            release_date = datetime.fromisoformat(str(release_date)[:10])
+        except ValueError:
+            return None
+    return f"{release_date.year}-{MONTHS[release_date.month - 1]}"
+
+
+def parse_exploit_status(value):
+    """Turn "Publicly Disclosed:No;Exploited:No;Latest Software Release:Exploitation Less Likely"
+    into the assessment the Update Guide shows."""
+    status = {}
+    for part in value.split(";"):
+        key, _, val = part.partition(":")
+        status[key.strip()] = val.strip()
+    if status.get("Exploited") == "Yes":
+        return "Exploitation Detected"
+    return status.get("Latest Software Release") or status.get("Older Software Release") or "Unknown"
+
+
+def parse_cvrf(doc):
+    """Map every CVE in a CVRF JSON document to its enrichment record."""
+    doc_date = (doc.get("DocumentTracking") or {}).get("InitialReleaseDate") or ""
+    records = {}
+    for vuln in doc.get("Vulnerability") or []:
+        cve = vuln.get("CVE")
+        if not cve:
+            continue
+        record = dict.fromkeys(FIELDS, "Unknown")
+        record["title"] = ((vuln.get("Title") or {}).get("Value") or "Unknown").strip()
+        for threat in vuln.get("Threats") or []:
+            value = ((threat.get("Description") or {}).get("Value") or "").strip()
+            if not value:
+                continue
+            if threat.get("Type") == THREAT_EXPLOIT_STATUS and record["exploitability"] == "Unknown":
+                record["exploitability"] = parse_exploit_status(value)
+            elif threat.get("Type") == THREAT_SEVERITY and record["severity"] == "Unknown":
+                record["severity"] = value
+            elif threat.get("Type") == THREAT_IMPACT and record["impact"] == "Unknown":
+                record["impact"] = value
+        scores = [s.get("BaseScore") for s in vuln.get("CVSSScoreSets") or [] if s.get("BaseScore") is not None]
+        if scores:
+            record["cvss"] = str(max(scores))
+        revisions = vuln.get("RevisionHistory") or []
+        release = revisions[0].get("Date") if revisions else doc_date
+        if release:
+            record["release_date"] = release[:10]
+        records[cve] = record
+    return records
+
+
+def make_client(concurrency=10):
+    """Pooled keep-alive client, HTTP/2 when the h2 package is installed."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(
+        base_url=api_base,
+        http2=http2,
+        limits=limits,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        headers={"Accept": "application/json"},
+    )
+
+
+class ApiBackend:
+    """Enrichment backend that batches CVEs by monthly CVRF document."""
+
+    name = "api"
+
+    def __init__(self, concurrency=10, record_dir=None):
+        self.concurrency = concurrency
+        self.record_dir = record_dir
+        self.documents = {}
+        self.requests = 0
+
+    async def _get_json(self, client, path):
+        self.requests += 1
+        resp = await client.get(path)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _load_document(self, client, doc_id):
+        if doc_id in self.documents:
+            return self.documents[doc_id]
+        try:
+            doc = await self._get_json(client, f"/cvrf/v3.0/cvrf/{doc_id}")
+        except Exception as e:
+            metrics.failure("api_" + failure_kind(e))
+            print(f"Could not fetch CVRF document {doc_id}: {e}")
+            doc = None
+        if doc:
+            capture_json("cvrf", doc_id, doc)
+        if doc and self.record_dir:
+            os.makedirs(os.path.join(self.record_dir, "cvrf"), exist_ok=True)
+            with open(os.path.join(self.record_dir, "cvrf", f"{doc_id}.json"), "w", encoding="utf-8") as f:
+                json.dump(doc, f)
+        self.documents[doc_id] = parse_cvrf(doc) if doc else {}
+        return self.documents[doc_id]
+
+    async def _lookup_document_id(self, client, cve):
+        try:
+            data = await self._get_json(client, f"/cvrf/v3.0/updates('{cve}')")
+        except Exception as e:
+            metrics.failure("api_" + failure_kind(e))
+            print(f"Could not look up CVRF document for {cve}: {e}")
+            return None
+        values = (data or {}).get("value") or []
+        return values[0].get("ID") if values else None
+
+    async def enrich(self, cves, release_dates=None, checkpoint=None):
+        """Return {cve: record} for every CVE the API knows about.
+
+        ``release_dates`` maps CVE -> release date and is used to guess the
+        monthly document. CVEs that aren't in their guessed document are
+        looked up individually through the updates endpoint.
+        """
+        release_dates = release_dates or {}
+        wanted = list(dict.fromkeys(cves))
+        results = {}
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def load(client, doc_id):
+            async with sem:
+                return await self._load_document(client, doc_id)
+
+        async def lookup(client, cve):
+            async with sem:
+                return cve, await self._lookup_document_id(client, cve)
+
+        async with make_client(self.concurrency) as client:
+            doc_ids = {document_id_for(release_dates.get(cve)) for cve in wanted} - {None}
+            for records in await asyncio.gather(*(load(client, d) for d in doc_ids)):
+                results.update({cve: records[cve] for cve in wanted if cve in records})
+
+            missing = [cve for cve in wanted if cve not in results]
+            if missing:
+                found = await asyncio.gather(*(lookup(client, cve) for cve in missing))
+                doc_ids = {doc_id for _, doc_id in found if doc_id} - set(self.documents)
+                await asyncio.gather(*(load(client, d) for d in doc_ids))
+                for cve, doc_id in found:
+                    if doc_id and cve in self.documents.get(doc_id, {}):
+                        results[cve] = self.documents[doc_id][cve]
+
+        print(f"MSRC API: {len(results)}/{len(wanted)} CVEs from {len(self.documents)} CVRF documents"
+              f" in {self.requests} requests")
+        if checkpoint is not None:
+            for cve, record in results.items():
+                checkpoint(cve, record)
+        return results
+
+
+class PlaywrightBackend:
+    """Adapter that runs a per-CVE page fetch ``fetch(page, cve) -> record`` on a PagePool."""
+
+    name = "browser"
+
+    def __init__(self, fetch, concurrency=8, contexts=1, blocker=None):
+        self.fetch = fetch
+        self.concurrency = concurrency
+        self.contexts = contexts
+        self.blocker = blocker
+
+    async def enrich(self, cves, release_dates=None, checkpoint=None):
+        from playwright.async_api import async_playwright
+
+        from msrc_scraper.browser import open_browser
+        from msrc_scraper.pool import PagePool
+
+        cves = list(dict.fromkeys(cves))
+        async with async_playwright() as playwright:
+            async with open_browser(playwright) as browser, \
+                    PagePool(browser, max_concurrency=self.concurrency, contexts=self.contexts,
+                             blocker=self.blocker) as pool:
+                records = await pool.map(self.fetch, cves, on_result=self._checkpoint(checkpoint))
+        if self.blocker:
+            self.blocker.report()
+        return {cve: record for cve, record in zip(cves, records) if is_useful(record)}
+
+    def _checkpoint(self, checkpoint):
+        if checkpoint is None:
+            return None
+
+        def on_result(cve, record):
+            if is_useful(record):
+                checkpoint(cve, record)
+        return on_result
+
+
+def is_useful(record):
+    """Whether a backend actually found something: a record with any known field, or a known value."""
+    if isinstance(record, dict):
+        return any(v != "Unknown" for v in record.values())
+    return record not in (None, "Unknown")
+
+
+async def enrich_with_fallback(cves, backends, release_dates=None, checkpoint=None, on_backend=None):
+    """Ask each backend in turn for the CVEs the previous ones couldn't resolve.
+
+    ``checkpoint(cve, record)`` is called for every resolved CVE as soon as
+    its backend has it, e.g. to journal progress, and ``on_backend()`` once
+    each backend has returned, e.g. to flush a partial workbook.
+    """
+    results = {}
+    pending = list(dict.fromkeys(cves))
+    for backend in backends:
+        if not pending:
+            break
+        try:
+            found = await backend.enrich(pending, release_dates=release_dates, checkpoint=checkpoint)
+        except ImportError as e:
+            print(f"Skipping {backend.name} backend: {e}")
+            continue
+        except Exception as e:
+            metrics.failure(f"{backend.name}_backend")
+            print(f"{backend.name} backend failed: {e}")
+            continue
+        metrics.count("resolved", backend.name, len(found))
+        results.update(found)
+        pending = [cve for cve in pending if cve not in found]
+        if on_backend is not None:
+            on_backend()
+    return results
+
+
+async def _record(doc_ids, out_dir):
+    backend = ApiBackend(record_dir=out_dir)
+    async with make_client() as client:
+        for doc_id in doc_ids:
+            records = await backend._load_document(client, doc_id)
+            print(f"Recorded {doc_id}: {len(records)} CVEs")
+
+
+def run_record(args):
+    """The ``record`` subcommand of msrc_scraper.cli."""
+    asyncio.run(_record(args.doc_ids, args.out))
+
+
+if __name__ == "__main__":
+    import sys
+
+    from msrc_scraper.cli import main
+
+    raise SystemExit(main(["record", *sys.argv[1:]]))
@@ -0,0 +1,151 @@
+"""Warm browser daemon that the scrapers attach to instead of launching Chromium.
+
+    msrc-scraper browser serve
+
+starts Chromium on a persistent profile with a CDP endpoint, accepts the
+Update Guide cookie consent once and saves the resulting storage state.
+The scripts call ``open_browser`` which attaches to the daemon over CDP
+when it answers and falls back to a local launch otherwise; ``new_context``
+seeds every context with the saved consent cookies either way. Closing an
+attached browser only disconnects, the daemon keeps running.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from msrc_scraper.api import site_base
+from msrc_scraper.cache import default_cache_dir
+
+# ---- CONFIG ----
+# MSRC_BROWSER_ENDPOINT overrides the endpoint the daemon advertises in browser.json
+endpoint_file = os.path.join(default_cache_dir, "browser.json")
+consent_state_file = os.path.join(default_cache_dir, "consent_state.json")
+profile_dir = os.path.join(default_cache_dir, "browser-profile")
+default_port = 9333
+
+# Cleared by --no-daemon
+use_daemon = True
+
+
+def daemon_endpoint(timeout=0.5):
+    """CDP endpoint of a running daemon, or None. Costs one local HTTP request."""
+    endpoint = os.environ.get("MSRC_BROWSER_ENDPOINT")
+    if not endpoint and os.path.exists(endpoint_file):
+        try:
+            with open(endpoint_file, encoding="utf-8") as f:
+                endpoint = json.load(f).get("endpoint")
+        except (OSError, ValueError):
+            endpoint = None
+    if not endpoint:
+        return None
+    try:
+        with urlopen(f"{endpoint}/json/version", timeout=timeout):
+            return endpoint
+    except (URLError, OSError, ValueError):
+        return None
+
+
+@asynccontextmanager
+async def open_browser(playwright, headless=True, **launch_options):
+    """Attach to the warm daemon if it is up, else launch Chromium locally."""
+    browser = None
+    endpoint = daemon_endpoint() if use_daemon else None
+    if endpoint:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint)
+            print(f"Attached to browser daemon at {endpoint}")
+        except Exception as e:
+            print(f"Browser daemon at {endpoint} unavailable ({e}), launching locally")
+    if browser is None:
+        browser = await playwright.chromium.launch(headless=headless, **launch_options)
+    try:
+        yield browser
+    finally:
+        await browser.close()
+
+
+async def new_context(browser, **options):
+    """New context carrying the daemon's saved consent cookies, when there are any."""
+    if "storage_state" not in options and os.path.exists(consent_state_file):
+        options["storage_state"] = consent_state_file
+    return await browser.new_context(**options)
+
+
+async def warm_context(browser):
+    """The daemon's long-lived context when attached, else a fresh one. Returns (context, owned)."""
+    if browser.contexts:
+        return browser.contexts[0], False
+    return await new_context(browser), True
+
+
+async def accept_consent(page):
+    await page.goto(f"{site_base}/update-guide", timeout=60000)
+    for button in await page.query_selector_all("button"):
+        if (await button.inner_text()).strip() == "Accept":
+            await button.click()
+            print("Cookie consent accepted")
+            return True
+    return False
+
+
+async def serve(port=default_port, headless=True):
+    from playwright.async_api import async_playwright
+
+    os.makedirs(default_cache_dir, exist_ok=True)
+    async with async_playwright() as playwright:
+        context = await playwright.chromium.launch_persistent_context(
+            profile_dir, headless=headless, args=[f"--remote-debugging-port={port}"])
+        page = context.pages[0] if context.pages else await context.new_page()
+        try:
+            await accept_consent(page)
+        except Exception as e:
+            print(f"Could not pre-accept cookie consent: {e}")
+        await context.storage_state(path=consent_state_file)
+        # Leave the Update Guide loaded so its scripts stay in the profile's cache
+        endpoint = f"http://127.0.0.1:{port}"
+        with open(endpoint_file, "w", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint, "pid": os.getpid(), "started": time.time()}, f)
+        print(f"Browser daemon listening on {endpoint} (profile {profile_dir})")
+
+        stop = asyncio.Event()
+        try:
+            import signal
+
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+        except (ImportError, NotImplementedError):
+            pass
+        try:
+            await stop.wait()
+        finally:
+            if os.path.exists(endpoint_file):
+                os.remove(endpoint_file)
+            await context.close()
+            print("Browser daemon stopped")
+
+
+def browser_from_args(args):
+    global use_daemon
+    use_daemon = not args.no_daemon
+
+
+def run(args):
+    """The ``browser`` subcommand of msrc_scraper.cli."""
+    if args.action == "serve":
+        asyncio.run(serve(args.port, headless=not args.headed))
+    else:
+        endpoint = daemon_endpoint()
+        print(f"Browser daemon running at {endpoint}" if endpoint else "No browser daemon running")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from msrc_scraper.cli import main
+
+    raise SystemExit(main(["browser", *sys.argv[1:]]))
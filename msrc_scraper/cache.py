@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import time
+
+# ---- CONFIG ----
+# Override with MSRC_CACHE_DIR or --cache-dir
+default_cache_dir = os.environ.get("MSRC_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "msrc_scraper"
+)
+
+DAY = 24 * 60 * 60
+
+# Titles practically never change once published, exploitability gets re-assessed
+default_ttls = {
+    "title": 180 * DAY,
+    "exploitability": 1 * DAY,
+}
+
+# Values that mean "we didn't get anything" and must never be cached
+MISSING = (None, "", "Unknown")
+
+
+class CveCache:
+    """SQLite-backed cache of per-CVE enrichment fields, keyed on CVE id.
+
+    Every field is stored next to its own fetch timestamp so each one can
+    expire on its own TTL. ``refresh=True`` makes every lookup miss while
+    still writing fresh results back.
+    """
+
+    def __init__(self, cache_dir=None, ttls=None, max_entries=100000, max_age=365 * DAY, refresh=False):
+        self.cache_dir = cache_dir or default_cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "cve_cache.sqlite3")
+        self.ttls = dict(default_ttls)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cve ("
+            " cve_id TEXT PRIMARY KEY,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._ensure_fields(self.ttls)
+        self.evict()
+
+    def _ensure_fields(self, fields):
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(cve)")}
+        for field in fields:
+            if field not in existing:
+                self.conn.execute(f'ALTER TABLE cve ADD COLUMN "{field}" TEXT')
+                self.conn.execute(f'ALTER TABLE cve ADD COLUMN "{field}_fetched_at" REAL')
+        self.conn.commit()
+
+    def get(self, cve, field):
+        """Return the cached value of ``field`` for ``cve`` or None if missing/stale."""
+        value = self._lookup(cve, field)
+        self._count(value is not None)
+        return value
+
+    def get_all(self, cve, fields):
+        """Return {field: value} when every field is fresh, otherwise None. Counts as one hit or miss."""
+        values = {}
+        for field in fields:
+            value = self._lookup(cve, field)
+            if value is None:
+                self._count(False)
+                return None
+            values[field] = value
+        self._count(True)
+        return values
+
+    def _lookup(self, cve, field):
+        if self.refresh:
+            return None
+        row = self.conn.execute(
+            f'SELECT "{field}", "{field}_fetched_at" FROM cve WHERE cve_id = ?', (cve,)
+        ).fetchone()
+        if row is None or row[0] is None or row[1] is None:
+            return None
+        if time.time() - row[1] > self.ttls.get(field, 0):
+            return None
+        return row[0]
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put(self, cve, fetched_at=None, **fields):
+        """Store values for ``cve``. Placeholder values such as "Unknown" are skipped.
+
+        ``fetched_at`` dates values that were fetched earlier (e.g. from a snapshot); they don't replace
+        values fetched after them.
+        """
+        fields = {k: v for k, v in fields.items() if v not in MISSING}
+        if not fields:
+            return
+        self._ensure_fields([f for f in fields if f not in self.ttls])
+        now = fetched_at or time.time()
+        self.conn.execute(
+            "INSERT INTO cve (cve_id, fetched_at) VALUES (?, ?)"
+            " ON CONFLICT(cve_id) DO UPDATE SET fetched_at = MAX(fetched_at, excluded.fetched_at)",
+            (cve, now),
+        )
+        for field, value in fields.items():
+            self.conn.execute(
+                f'UPDATE cve SET "{field}" = ?, "{field}_fetched_at" = ?'
+                f' WHERE cve_id = ? AND ("{field}_fetched_at" IS NULL OR "{field}_fetched_at" <= ?)',
+                (value, now, cve, now),
+            )
+        self.conn.commit()
+
+    def evict(self):
+        """Drop entries older than max_age, then the oldest ones beyond max_entries."""
+        if self.max_age:
+            self.conn.execute("DELETE FROM cve WHERE fetched_at < ?", (time.time() - self.max_age,))
+        if self.max_entries:
+            self.conn.execute(
+                "DELETE FROM cve WHERE cve_id NOT IN"
+                " (SELECT cve_id FROM cve ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        self.conn.commit()
+
+    def close(self):
+        self.evict()
+        self.conn.close()
+        print(f"CVE cache: {self.hits} hits, {self.misses} misses ({self.path})")
+
+
+def cache_from_args(args):
+    if args.no_cache:
+        return None
+    return CveCache(cache_dir=args.cache_dir, refresh=args.refresh)
@@ -0,0 +1,292 @@
+"""Single command line for the MSRC scrapers.
+
+    msrc-scraper extract "Security Updates.xlsx" -o filtered_updates.xlsx
+    msrc-scraper enrich "Security Updates.xlsx" -o filtered_updates.xlsx
+    msrc-scraper enrich filtered_updates.xlsx --fields exploitability -o exploitability_extract.xlsx
+    msrc-scraper grid-scrape --product "Windows Server 2016" --headless
+    msrc-scraper write filtered_updates.parquet -o filtered_updates.xlsx
+    msrc-scraper store query --product "Windows Server 2016*" --days 90 --exploitability Detected
+    msrc-scraper snapshots reextract --update-cache
+    msrc-scraper browser serve
+    msrc-scraper record 2026-Feb --out recordings
+
+(``python -m msrc_scraper`` works the same without installing.) Every
+option is defined here and read back by the ``*_from_args`` function of
+the module it configures. This module only imports the small modules
+that hold their defaults; the subcommand's own modules (asyncio, pandas,
+Playwright, httpx) are imported once the arguments are parsed, so
+``--help`` starts quickly, and so does ``enrich --stream`` when the cache
+has every CVE (the default enrich path reads the export with pandas).
+``benchmarks/bench_startup.py`` checks that it stays that way.
+"""
+import argparse
+import importlib
+import sys
+
+from msrc_scraper.cache import DAY, default_cache_dir
+from msrc_scraper.routing import default_block_types
+from msrc_scraper.sidecar import OUTPUT_FORMATS
+from msrc_scraper.snapshots import default_keep, default_max_age, default_snapshot_dir
+from msrc_scraper.store import default_store_path
+
+# ---- CONFIG ----
+default_outputs = {"extract": "filtered_updates.xlsx", "enrich": "filtered_updates.xlsx",
+                   "exploitability": "exploitability_extract.xlsx"}
+
+
+# ---- SHARED OPTIONS ----
+def _cache_options(parser):
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore cached CVE data and fetch everything again")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"directory for the CVE cache (default: {default_cache_dir})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="don't read or write the CVE cache at all")
+
+
+def _routing_options(parser):
+    parser.add_argument("--no-block", action="store_true",
+                        help="load every page resource (also records sizes for the blocked-bytes estimate)")
+    parser.add_argument("--block-types", default=",".join(default_block_types),
+                        help="comma separated resource types to block (default: %(default)s)")
+    parser.add_argument("--block-url", action="append", default=[],
+                        help="extra URL glob to block, may be repeated")
+    parser.add_argument("--allow-url", action="append", default=[],
+                        help="URL glob that is never blocked, may be repeated")
+
+
+def _pool_options(parser):
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="maximum number of pages loading at once (default: %(default)s)")
+    parser.add_argument("--contexts", type=int, default=1,
+                        help="number of browser contexts to spread the pages over (default: %(default)s)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="worker processes, each with its own browser; --concurrency and --contexts"
+                             " apply per shard (default: %(default)s)")
+
+
+def _output_options(parser):
+    parser.add_argument("--formats", default="xlsx",
+                        help=f"comma separated output formats out of {', '.join(OUTPUT_FORMATS)} (default: %(default)s)")
+
+
+def _priority_options(parser):
+    parser.add_argument("--no-priority", action="store_true",
+                        help="enrich CVEs in export order instead of most urgent first")
+    parser.add_argument("--partial-every", type=float, default=30, metavar="SECONDS",
+                        help="rewrite <output>.partial.xlsx with the results so far this often, 0 to turn it off"
+                             " (default: %(default)s)")
+
+
+def _metrics_options(parser):
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="where to write the JSON run report (default: <output>.metrics.json)")
+    parser.add_argument("--prometheus", metavar="PATH",
+                        help="also write Prometheus text-format metrics to this file")
+
+
+def _browser_options(parser):
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="always launch a local browser, even if the browser daemon is running")
+
+
+def _snapshot_options(parser):
+    parser.add_argument("--no-snapshots", action="store_true",
+                        help=f"don't save rendered pages and API responses to {default_snapshot_dir}")
+    parser.add_argument("--snapshot-keep", type=int, default=default_keep, metavar="N",
+                        help="snapshots kept per page or document (default: %(default)s)")
+    parser.add_argument("--snapshot-days", type=float, default=default_max_age / DAY, metavar="DAYS",
+                        help="drop snapshots older than this (default: %(default)s)")
+
+
+def _store_options(parser):
+    parser.add_argument("--store", default=None, metavar="PATH",
+                        help=f"result store to record enriched rows in (default: {default_store_path})")
+    parser.add_argument("--no-store", action="store_true", help="don't record enriched rows in the result store")
+
+
+# ---- SUBCOMMANDS ----
+
+
+def _input_argument(parser, help):
+    parser.add_argument("input", nargs="?", help=help)
+    parser.add_argument("-o", "--output", help="output file; other --formats are written next to it")
+
+
+def _extract_arguments(parser):
+    _input_argument(parser, "MSRC Security Updates export (.xlsx)")
+    _output_options(parser)
+
+
+def _enrich_arguments(parser):
+    _input_argument(parser, "MSRC Security Updates export, or the filtered workbook for --fields exploitability")
+    parser.add_argument("--fields", choices=["all", "titles", "exploitability"], default="all",
+                        help="title and exploitability assessment, titles only (cache, RSS feed, browser), or"
+                             " exploitability only for an already filtered workbook (default: %(default)s)")
+    parser.add_argument("--backend", choices=["api", "browser"], default="api",
+                        help="enrich through the MSRC API with browser fallback, or the browser only")
+    parser.add_argument("--no-rss", action="store_true",
+                        help="--fields titles: don't use the MSRC RSS feed, open every uncached CVE page")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="--fields titles: only use the cache and the RSS feed, never open a browser")
+    parser.add_argument("--missing-title", default="Unknown", metavar="TEXT",
+                        help="--fields titles: written for CVEs no tier knows (default: %(default)s)")
+    _cache_options(parser)
+    _routing_options(parser)
+    _pool_options(parser)
+    _output_options(parser)
+    parser.add_argument("--incremental", action="store_true",
+                        help="only enrich CVEs that are new or changed since the last output file")
+    parser.add_argument("--stream", action="store_true",
+                        help="read, enrich and write chunk by chunk instead of one phase after the other")
+    parser.add_argument("--chunk-size", type=int, default=500, help="rows per chunk with --stream (default: %(default)s)")
+    _priority_options(parser)
+    _metrics_options(parser)
+    _browser_options(parser)
+    _snapshot_options(parser)
+    _store_options(parser)
+
+
+def _grid_scrape_arguments(parser):
+    parser.add_argument("--mode", choices=["capture", "scroll"], default="capture",
+                        help="read rows from the grid's JSON API (all columns) or by scrolling the grid")
+    parser.add_argument("--product", action="append", default=[],
+                        help="product to scan (menu text, * wildcards allowed), may be repeated")
+    parser.add_argument("--family", default="Windows", help="product family for --product (default: %(default)s)")
+    parser.add_argument("--products-file",
+                        help='JSON list of scans: [{"name": ..., "family": ..., "products": [patterns]}]')
+    parser.add_argument("--output", choices=["workbooks", "sheets"], default="workbooks",
+                        help="one workbook per scan, or one sheet per scan in msrc_update_guide.xlsx")
+    parser.add_argument("--headless", action="store_true", help="run Chromium without a window")
+    _cache_options(parser)
+    _metrics_options(parser)
+    _browser_options(parser)
+    _snapshot_options(parser)
+    _store_options(parser)
+
+
+def _write_arguments(parser):
+    _input_argument(parser, "enriched results (.xlsx, .parquet, .csv or .jsonl)")
+    parser.add_argument("--columns", type=lambda value: [c.strip() for c in value.split(",") if c.strip()],
+                        help="comma separated columns to keep, in this order (default: all)")
+    _output_options(parser)
+
+
+def _store_arguments(parser):
+    parser.add_argument("--store", default=None, help=f"store path (default: {default_store_path})")
+    sub = parser.add_subparsers(dest="action", required=True, metavar="ACTION")
+    query = sub.add_parser("query", help="filter stored rows, print them and optionally export them")
+    query.add_argument("cves", nargs="*", help="only these CVEs")
+    query.add_argument("--product", help='affected product, * wildcards allowed (e.g. "Windows Server 2016*")')
+    query.add_argument("--days", type=int, help="released in the last N days")
+    query.add_argument("--since", help="released on or after this date (YYYY-MM-DD)")
+    query.add_argument("--until", help="released on or before this date (YYYY-MM-DD)")
+    query.add_argument("--exploitability", action="append", default=[],
+                       help='assessment contains this text (e.g. "Detected"), may be repeated')
+    query.add_argument("--min-exploitability", help='this assessment or a more severe one (e.g. "More Likely")')
+    query.add_argument("--title", help="full-text search on the title: words, AND / OR / NOT between them and"
+                                       " word* for a prefix, e.g. 'kernel AND elevation'")
+    query.add_argument("--limit", type=int, help="at most this many rows")
+    query.add_argument("--show", type=int, default=50, help="rows to print (default: %(default)s)")
+    query.add_argument("--out", help="export the matches to this .xlsx, .csv or .jsonl file")
+    imp = sub.add_parser("import", help="add the rows of workbooks written by the scripts")
+    imp.add_argument("paths", nargs="+")
+    sub.add_parser("stats", help="row, CVE and product counts")
+
+
+def _snapshots_arguments(parser):
+    parser.add_argument("--dir", default=None, help=f"snapshot directory (default: {default_snapshot_dir})")
+    sub = parser.add_subparsers(dest="action", required=True, metavar="ACTION")
+    redo = sub.add_parser("reextract", help="re-run extraction over the stored snapshots, no browser needed")
+    redo.add_argument("cves", nargs="*", help="only these CVEs (default: every stored page)")
+    redo.add_argument("--source", choices=["page", "cvrf"], default="page",
+                      help="rendered pages (extract_html) or CVRF documents (parse_cvrf)")
+    redo.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    redo.add_argument("--out", help="write the records as JSON lines to this file")
+    redo.add_argument("--update-cache", action="store_true",
+                      help="write re-extracted titles and exploitability into the CVE cache")
+    redo.add_argument("--cache-dir", default=None, help="CVE cache directory for --update-cache")
+    show = sub.add_parser("show", help="print the newest stored page of a CVE (or a CVRF document id)")
+    show.add_argument("key")
+    show.add_argument("--kind", default="page")
+    sub.add_parser("stats", help="snapshot counts and compression")
+    prune = sub.add_parser("prune", help="drop old snapshots now instead of at the end of the next run")
+    prune.add_argument("--keep", type=int, default=default_keep, help="snapshots kept per key (default: %(default)s)")
+    prune.add_argument("--days", type=float, default=default_max_age / DAY,
+                       help="drop snapshots older than this (default: %(default)s)")
+
+
+def _browser_arguments(parser):
+    sub = parser.add_subparsers(dest="action", required=True, metavar="ACTION")
+    serve = sub.add_parser("serve", help="start the daemon (Ctrl+C to stop)")
+    serve.add_argument("--port", type=int, default=9333, help="CDP port (default: %(default)s)")
+    serve.add_argument("--headed", action="store_true", help="show the browser window")
+    sub.add_parser("status", help="print the endpoint of the running daemon, if any")
+
+
+def _record_arguments(parser):
+    parser.add_argument("doc_ids", nargs="+", help='monthly document ids, e.g. "2026-Feb"')
+    parser.add_argument("--out", default="recordings", help="directory to write recordings to")
+
+
+# name: (help, argument definitions, "module:function" that runs it)
+COMMANDS = {
+    "extract": ("filter an export down to Details and Release date", _extract_arguments, "enrich:run_extract"),
+    "enrich": ("add CVE titles and exploitability assessments to an export", _enrich_arguments,
+               "enrich:run_enrich"),
+    "grid-scrape": ("scrape the Update Guide grid for one or more products", _grid_scrape_arguments,
+                    "update_guide:run"),
+    "write": ("write results as .xlsx with clickable CVE links (and other --formats)", _write_arguments,
+              "enrich:run_write"),
+    "store": ("query the local store of enriched rows", _store_arguments, "store:run"),
+    "snapshots": ("inspect stored page snapshots and re-run extraction offline", _snapshots_arguments,
+                  "snapshots:run"),
+    "browser": ("run the warm Chromium the scrapers attach to over CDP", _browser_arguments, "browser:run"),
+    "record": ("record CVRF documents for the local stand-in server (mock_msrc)", _record_arguments,
+               "api:run_record"),
+}
+
+
+def build_parser():
+    """The parser and {command: subparser}."""
+    parser = argparse.ArgumentParser(prog="msrc-scraper", description="MSRC Security Update Guide scrapers")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    commands = {}
+    for name, (help, add_arguments, _) in COMMANDS.items():
+        commands[name] = sub.add_parser(name, help=help, description=help[0].upper() + help[1:])
+        add_arguments(commands[name])
+    return parser, commands
+
+
+def _check(parser, args):
+    if args.command not in ("extract", "enrich", "write"):
+        return
+    if not args.input:
+        parser.error("the input file is required")
+    if args.command == "enrich":
+        if args.stream and args.incremental:
+            parser.error("--incremental needs the previous output up front and can't be combined with --stream")
+        if args.stream and args.shards > 1:
+            parser.error("--stream runs one browser in this process and can't be combined with --shards")
+        if args.fields != "all" and args.stream:
+            parser.error("--stream enriches titles and exploitability together, use it with --fields all")
+        if args.fields == "titles" and args.incremental:
+            parser.error("--incremental needs --fields all or exploitability")
+    if not args.output:
+        if args.command == "write":
+            parser.error("-o/--output is required")
+        key = "exploitability" if getattr(args, "fields", None) == "exploitability" else args.command
+        args.output = default_outputs[key]
+
+
+def main(argv=None, **defaults):
+    """Run the command line. ``defaults`` override argument defaults of the chosen subcommand (script wrappers)."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser, commands = build_parser()
+    if defaults and argv and argv[0] in commands:
+        commands[argv[0]].set_defaults(**defaults)
+    args = parser.parse_args(argv)
+    _check(commands[args.command], args)
+    module, function = COMMANDS[args.command][2].split(":")
+    getattr(importlib.import_module(f"msrc_scraper.{module}"), function)(args)
+    return 0
@@ -0,0 +1,45 @@
+"""Group export rows by CVE so each CVE is enriched once and fanned back out.
+
+The MSRC "Security Updates" export has one row per product x KB x CVE, so
+the same CVE id shows up dozens of times in a single file.
+"""
+
+
+def is_cve(value):
+    return isinstance(value, str) and value.startswith("CVE-")
+
+
+class CveGroups:
+    """Row indexes of every CVE id in a column, in first-seen order."""
+
+    def __init__(self, details):
+        self.total_rows = 0
+        self.rows = {}
+        for idx, value in enumerate(details):
+            self.total_rows += 1
+            if is_cve(value):
+                self.rows.setdefault(value, []).append(idx)
+
+    @property
+    def unique(self):
+        return list(self.rows)
+
+    @property
+    def cve_rows(self):
+        return sum(len(idxs) for idxs in self.rows.values())
+
+    def fan_out(self, results, default="Unknown"):
+        """Turn {cve: value} into one value per row, ``default`` for misses and non-CVE rows."""
+        values = [default] * self.total_rows
+        for cve, idxs in self.rows.items():
+            value = results.get(cve, default)
+            for idx in idxs:
+                values[idx] = value
+        return values
+
+    def summary(self):
+        unique = len(self.rows)
+        cve_rows = self.cve_rows
+        saved = cve_rows - unique
+        print(f"Dedup: {unique} unique CVEs across {cve_rows} CVE rows ({self.total_rows} rows total),"
+              f" {saved} duplicate lookups skipped")
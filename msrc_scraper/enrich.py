@@ -0,0 +1,530 @@
+"""Filter an MSRC export and enrich it with CVE titles and exploitability.
+
+The ``extract``, ``enrich`` and ``write`` subcommands of msrc_scraper.cli,
+formerly main_final.py and exploitability.py. ``enrich --fields`` picks
+the flavour:
+
+    all             title and exploitability assessment (MSRC API first, browser for the rest)
+    titles          title only (cache, RSS feed, browser)
+    exploitability  exploitability assessment for an already filtered workbook
+
+pandas, Playwright and the RSS / shard machinery are imported where they
+are used, so a run served from the cache never loads them.
+"""
+import asyncio
+import os
+from datetime import date
+
+from msrc_scraper.api import ApiBackend, PlaywrightBackend, enrich_with_fallback, site_base
+from msrc_scraper.dedup import CveGroups
+from msrc_scraper.extract import FIELDS, extract_cve_details
+from msrc_scraper.incremental import merge, resolved
+from msrc_scraper.metrics import failure_kind, metrics, report_path_for
+from msrc_scraper.priority import PartialOutput, checkpoints
+from msrc_scraper import readiness
+from msrc_scraper.readiness import wait_for_exploitability, wait_for_title
+from msrc_scraper.sidecar import read_columns_cached, write_outputs
+from msrc_scraper.snapshots import capture_page
+
+# ---- CONFIG ----
+base_url = f"{site_base}/update-guide/vulnerability/"
+ENRICHED_COLUMNS = ["Details", "Release date", "Today's Date", "Exploitability assessment", "Product"]
+
+
+# ---- PHASE 1: Extract columns ----
+def extract_columns(input_file, with_products=False, iso_dates=True):
+    import pandas as pd
+
+    # The result store also records which product and KB each row is about
+    columns = ["Details", "Release date"] + (["Product", "Article"] if with_products else [])
+    filtered_df = read_columns_cached(input_file, columns).rename(columns={"Product": "Affected product"})
+
+    if iso_dates:
+        filtered_df["Release date"] = pd.to_datetime(filtered_df["Release date"], errors='coerce').dt.strftime('%Y-%m-%d')
+
+    return filtered_df
+
+
+def read_details(input_file):
+    # main_final --formats xlsx,parquet leaves a Parquet copy we can read instead.
+    # Release dates tell the API which monthly CVRF documents to fetch
+    try:
+        return read_columns_cached(input_file, ["Details", "Release date"], prefer_parquet=True)
+    except (KeyError, ValueError):
+        # A hand-made list of CVEs without dates, the API looks them up one by one
+        return read_columns_cached(input_file, ["Details"], prefer_parquet=True)
+
+
+# ---- PHASE 2: Fetch titles and exploitability ----
+async def read_cve_page(page, url):
+    """Load a CVE page into an existing page and extract its details. Raises on navigation errors."""
+    cve = url.rsplit("/", 1)[-1]
+    with metrics.step(cve, "goto"):
+        await page.goto(url, timeout=30000)
+    # Resolve as soon as the content is there instead of sleeping and re-checking
+    with metrics.step(cve, "ready"):
+        await wait_for_title(page, timeout=10000)
+        # The rest of the page renders with the title, so this is a frame or two at most; the timeout only
+        # bounds pages without a details list, at about the old fixed one second sleep
+        await wait_for_exploitability(page, timeout=1000)
+    with metrics.step(cve, "extract"):
+        details = await extract_cve_details(page)
+    with metrics.step(cve, "snapshot"):
+        await capture_page(page, cve)
+    if details["title"] == "Unknown":
+        metrics.failure("empty_page")
+    return details
+
+
+async def fetch_cve_data(context, url):
+    """Fetch title, exploitability, CVSS, severity, impact and release date from a CVE page."""
+    try:
+        page = await context.new_page()
+        details = await read_cve_page(page, url)
+        await page.close()
+        return details
+    except Exception as e:
+        metrics.failure(failure_kind(e))
+        print(f"Error fetching data for {url}: {e}")
+        return dict.fromkeys(FIELDS, "Unknown")
+
+
+async def fetch_cve_record(page, cve):
+    url = f"{base_url}{cve}"
+    print(f"Fetching: {url}")
+    return await read_cve_page(page, url)
+
+
+async def add_product_titles(df, cache=None, backend="api", blocker=None, concurrency=8, contexts=1,
+                             known=None, journal=None, shards=1, store=None, priority=None, partial_file=None,
+                             partial_every=30):
+    from msrc_scraper.results import compact
+
+    groups = CveGroups(df["Details"])
+    groups.summary()
+    # Already resolved by a previous output (--incremental) or an interrupted run's journal. CVEs they only
+    # got some fields of are fetched again, keeping those fields if the new fetch misses them
+    earlier = {cve: record for cve, record in (known or {}).items() if cve in groups.rows}
+    results = {cve: record for cve, record in earlier.items() if resolved(record)}
+    if cache:
+        for cve in groups.unique:
+            if cve in results:
+                continue
+            cached = cache.get_all(cve, ("title", "exploitability"))
+            if cached:
+                results[cve] = cached
+    release_dates = dict(zip(df["Details"], df["Release date"]))
+    # Most urgent CVEs first, so they are the first ones in the journal and the partial workbook
+    order = priority.summary(groups.unique, release_dates) if priority else groups.unique
+    pending = [cve for cve in order if cve not in results]
+    partial = None
+    # Nothing to fetch, nothing to show early
+    if partial_file and partial_every > 0 and pending:
+        today = date.today().isoformat()
+        released = list(df["Release date"])
+
+        def partial_rows(found):
+            for cve in order:
+                record = found.get(cve)
+                if record:
+                    for i in groups.rows[cve]:
+                        yield (cve, released[i], today, record.get("exploitability", "Unknown"),
+                               record.get("title", "Unknown"))
+
+        partial = PartialOutput(partial_file, ENRICHED_COLUMNS, partial_rows, interval=partial_every)
+        partial.update(results)
+
+    # MSRC API first, Chromium only for whatever it couldn't resolve
+    if shards > 1:
+        from msrc_scraper.shard import ShardedBackend
+
+        backends = [ShardedBackend(fetch_cve_record, shards=shards, concurrency=concurrency, contexts=contexts,
+                                   blocker=blocker)]
+    else:
+        backends = [PlaywrightBackend(fetch_cve_record, concurrency=concurrency, contexts=contexts, blocker=blocker)]
+    if backend == "api":
+        backends.insert(0, ApiBackend())
+    checkpoint = checkpoints(journal.record if journal else None, partial.record if partial else None)
+    fetched = await enrich_with_fallback(pending, backends, release_dates=release_dates, checkpoint=checkpoint,
+                                         on_backend=partial.flush if partial else None)
+    if cache:
+        for cve, record in fetched.items():
+            cache.put(cve, title=record["title"], exploitability=record["exploitability"])
+    for cve in pending:
+        if cve in fetched or cve in earlier:
+            results[cve] = merge(earlier.get(cve), fetched.get(cve))
+    if partial:
+        partial.close()
+
+    df["Product"] = groups.fan_out({cve: r["title"] for cve, r in results.items()})
+    df["Exploitability assessment"] = groups.fan_out({cve: r["exploitability"] for cve, r in results.items()})
+    if store is not None:
+        blank = [None] * len(df)
+        rows = zip(df["Details"], df["Release date"], df.get("Affected product", blank), df.get("Article", blank))
+        store.add(({**results.get(cve, {}), "cve": cve, "release_date": released, "product": product, "kb": kb}
+                   for cve, released, product, kb in rows), source="main_final")
+
+    # Add today's date in ISO format
+    df["Today's Date"] = date.today().isoformat()
+
+    return compact(df[ENRICHED_COLUMNS])
+
+
+async def read_title(page, url):
+    """Load a CVE page into an existing page and return its title. Raises on navigation errors."""
+    cve = url.rsplit("/", 1)[-1]
+    with metrics.step(cve, "goto"):
+        await page.goto(url, timeout=30000)
+    with metrics.step(cve, "ready"):
+        ready = await wait_for_title(page, timeout=10000)
+    with metrics.step(cve, "snapshot"):
+        await capture_page(page, cve)
+    if ready is None:
+        metrics.failure("empty_page")
+        return "Unknown"
+    with metrics.step(cve, "extract"):
+        title = (await page.inner_text("h1.ms-fontWeight-semibold")).strip()
+    return title.split('\n')[0].split('<span')[0].strip()
+
+
+async def fetch_title_record(page, cve):
+    url = f"{base_url}{cve}"
+    print(f"Fetching: {url}")
+    return await read_title(page, url)
+
+
+async def fetch_titles_in_browser(cves, blocker=None, concurrency=8, contexts=1, shards=1):
+    if shards > 1:
+        from msrc_scraper.shard import ShardedBackend
+
+        found = await ShardedBackend(fetch_title_record, shards=shards, concurrency=concurrency, contexts=contexts,
+                                     blocker=blocker).enrich(cves)
+        return {cve: found.get(cve, "Unknown") for cve in cves}
+    from playwright.async_api import async_playwright
+
+    from msrc_scraper.browser import open_browser
+    from msrc_scraper.pool import PagePool
+
+    async with async_playwright() as playwright:
+        async with open_browser(playwright) as browser, \
+                PagePool(browser, max_concurrency=concurrency, contexts=contexts, blocker=blocker) as pool:
+            fetched = await pool.map(fetch_title_record, cves, default="Unknown")
+    if blocker:
+        blocker.report()
+    return dict(zip(cves, fetched))
+
+
+async def add_titles(df, cache=None, blocker=None, concurrency=8, contexts=1, use_rss=True, use_browser=True,
+                     shards=1, store=None, missing="Unknown"):
+    from msrc_scraper.results import compact
+    from msrc_scraper.titles import RssTitleMap, TitleResolver
+
+    groups = CveGroups(df["Details"])
+    groups.summary()
+
+    async def browser_tier(cves):
+        return await fetch_titles_in_browser(cves, blocker=blocker, concurrency=concurrency, contexts=contexts,
+                                             shards=shards)
+
+    # Cache, then the RSS feed, and Chromium only for what neither of them knows
+    resolver = TitleResolver(cache=cache, rss=RssTitleMap() if use_rss else None,
+                             browser=browser_tier if use_browser else None)
+    titles = await resolver.resolve(groups.unique)
+    df["Product"] = groups.fan_out(titles, default=missing)
+    if store is not None:
+        release_dates = dict(zip(df["Details"], df["Release date"]))
+        store.update({cve: {"title": title, "release_date": release_dates.get(cve)} for cve, title in titles.items()},
+                     source="main_final")
+    return compact(df)
+
+
+async def read_exploitability(page, cve):
+    """Load a CVE page into an existing page and return its exploitability assessment."""
+    with metrics.step(cve, "goto"):
+        await page.goto(f"{base_url}{cve}", timeout=15000)
+    # Resolves as soon as the assessment has a value next to it
+    with metrics.step(cve, "ready"):
+        ready = await wait_for_exploitability(page, timeout=10000)
+    if ready is None:
+        print(f"Exploitability assessment didn't render for {cve}")
+    with metrics.step(cve, "extract"):
+        details = await extract_cve_details(page)
+    with metrics.step(cve, "snapshot"):
+        saved = await capture_page(page, cve)
+    if details["exploitability"] != "Unknown":
+        return details["exploitability"]
+    metrics.failure("empty_page")
+    if saved:
+        print(f"Exploitability not found for {cve}, page saved (msrc-scraper snapshots show {cve})")
+    else:
+        print(f"Exploitability not found for {cve}")
+    return "Unknown"
+
+
+async def fetch_exploitability_record(page, cve):
+    print(f"Fetching: {base_url}{cve}")
+    return await read_exploitability(page, cve)
+
+
+async def add_exploitability(df, concurrency=5, cache=None, backend="api", blocker=None, contexts=1,
+                             known=None, journal=None, shards=1, store=None, priority=None, partial_file=None,
+                             partial_every=30):
+    from msrc_scraper.results import compact
+
+    groups = CveGroups(df["Details"])
+    groups.summary()
+    # Only used to pick CVRF documents and order the work, the output is Details + Exploitability
+    release_dates = dict(zip(df["Details"], df.pop("Release date"))) if "Release date" in df else None
+    # Already resolved by a previous output (--incremental) or an interrupted run's journal
+    known = {cve: value for cve, value in (known or {}).items() if cve in groups.rows}
+    if cache:
+        for cve in groups.unique:
+            if cve in known:
+                continue
+            cached = cache.get(cve, "exploitability")
+            if cached is not None:
+                known[cve] = cached
+    # Most urgent CVEs first (release dates from the input, severity from earlier runs in the result store)
+    order = priority.summary(groups.unique, release_dates) if priority else groups.unique
+    partial = None
+    if partial_file and partial_every > 0 and any(cve not in known for cve in order):
+        def partial_rows(found):
+            for cve in order:
+                if cve in found:
+                    for _ in groups.rows[cve]:
+                        yield (cve, found[cve])
+
+        partial = PartialOutput(partial_file, ["Details", "Exploitability"], partial_rows, interval=partial_every)
+        partial.update(known)
+    if backend == "api":
+        pending = [cve for cve in order if cve not in known]
+        checkpoint = checkpoints(journal.record if journal else None,
+                                 partial_exploitability(partial) if partial else None)
+        found = await enrich_with_fallback(pending, [ApiBackend()], release_dates=release_dates,
+                                           checkpoint=checkpoint,
+                                           on_backend=partial.flush if partial else None)
+        for cve, record in found.items():
+            if record["exploitability"] != "Unknown":
+                known[cve] = record["exploitability"]
+                if cache:
+                    cache.put(cve, exploitability=known[cve])
+
+    pending = [cve for cve in order if cve not in known]
+    values = []
+    checkpoint = checkpoints(checkpoint_exploitability(journal), partial.record if partial else None)
+    if pending and shards > 1:
+        from msrc_scraper.shard import ShardedBackend
+
+        found = await ShardedBackend(fetch_exploitability_record, shards=shards, concurrency=concurrency,
+                                     contexts=contexts, blocker=blocker).enrich(pending, checkpoint=checkpoint)
+        values = [found.get(cve, "Unknown") for cve in pending]
+    elif pending:
+        from playwright.async_api import async_playwright
+
+        from msrc_scraper.browser import open_browser
+        from msrc_scraper.pool import PagePool
+
+        async with async_playwright() as playwright:
+            async with open_browser(playwright) as browser, \
+                    PagePool(browser, max_concurrency=concurrency, contexts=contexts, blocker=blocker) as pool:
+                values = await pool.map(fetch_exploitability_record, pending, default="Unknown",
+                                        on_result=checkpoint)
+        if blocker:
+            blocker.report()
+    for cve, value in zip(pending, values):
+        known[cve] = value
+        if cache:
+            cache.put(cve, exploitability=value)
+    if partial:
+        partial.close()
+    df["Exploitability"] = groups.fan_out(known)
+    if store is not None:
+        store.update({cve: {"exploitability": value} for cve, value in known.items()}, source="exploitability")
+    return compact(df)
+
+
+def checkpoint_exploitability(journal):
+    if journal is None:
+        return None
+
+    def on_result(cve, value):
+        if value != "Unknown":
+            journal.record(cve, {"exploitability": value})
+    return on_result
+
+
+def partial_exploitability(partial):
+    # API checkpoints carry whole records, the partial workbook only wants the assessment
+    def on_result(cve, record):
+        if record["exploitability"] != "Unknown":
+            partial.record(cve, record["exploitability"])
+    return on_result
+
+
+# ---- PHASE 3: Write Excel with clickable links ----
+def write_with_links(df, output_file, formats=("xlsx",)):
+    for path in write_outputs(df, output_file, formats):
+        print(f"Saved clickable CVE links to {path}" if path.endswith(".xlsx") else f"Saved {path}")
+
+
+def read_frame(path, columns=None):
+    """Every column (or ``columns``) of a workbook or of a Parquet/CSV/JSONL file written by write_outputs."""
+    if columns:
+        return read_columns_cached(path, list(columns))
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xlsx":
+        from msrc_scraper.reader import read_header
+
+        return read_columns_cached(path, read_header(path))
+    import pandas as pd
+
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext == ".csv":
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    if ext == ".jsonl":
+        return pd.read_json(path, lines=True, dtype=False)
+    raise SystemExit(f"Don't know how to read {path}, expected .xlsx, .parquet, .csv or .jsonl")
+
+
+# ---- COMMANDS ----
+def run_extract(args):
+    from msrc_scraper.sidecar import formats_from_args
+
+    filtered_df = extract_columns(args.input)
+    write_with_links(filtered_df, args.output, formats_from_args(args))
+
+
+def run_write(args):
+    from msrc_scraper.sidecar import formats_from_args
+
+    df = read_frame(args.input, args.columns)
+    print(f"Read {len(df)} rows from {args.input}")
+    write_with_links(df, args.output, formats_from_args(args))
+
+
+def run_enrich(args):
+    from msrc_scraper.browser import browser_from_args
+    from msrc_scraper.cache import cache_from_args
+    from msrc_scraper.routing import ResourceBlocker, policy_from_args
+    from msrc_scraper.sidecar import formats_from_args
+    from msrc_scraper.snapshots import snapshots_from_args
+    from msrc_scraper.store import store_from_args
+
+    browser_from_args(args)
+    snapshots_from_args(args)
+    cache = cache_from_args(args)
+    blocker = ResourceBlocker(policy_from_args(args))
+    store = store_from_args(args)
+    formats = formats_from_args(args)
+    if args.fields == "titles":
+        _enrich_titles(args, cache, blocker, store, formats)
+    elif args.fields == "exploitability":
+        _enrich_exploitability(args, cache, blocker, store, formats)
+    else:
+        _enrich_all(args, cache, blocker, store, formats)
+
+
+def _close(cache, store):
+    from msrc_scraper import snapshots
+
+    readiness.stats.report()
+    snapshots.close()
+    if cache:
+        metrics.cache("cve_cache", cache.hits, cache.misses)
+        cache.close()
+    if store:
+        store.close()
+
+
+def _enrich_titles(args, cache, blocker, store, formats):
+    # Phase 1
+    with metrics.phase("extract"):
+        filtered_df = extract_columns(args.input, iso_dates=False)
+    # Phase 2 (async)
+    with metrics.phase("enrich"):
+        filtered_df = asyncio.run(add_titles(filtered_df, cache=cache, blocker=blocker,
+                                             concurrency=args.concurrency, contexts=args.contexts,
+                                             use_rss=not args.no_rss, use_browser=not args.no_browser,
+                                             shards=args.shards, store=store, missing=args.missing_title))
+    _close(cache, store)
+    # Phase 3
+    with metrics.phase("write"):
+        write_with_links(filtered_df, args.output, formats)
+    metrics.write_report(args.metrics or report_path_for(args.output), args.prometheus)
+
+
+def _enrich_exploitability(args, cache, blocker, store, formats):
+    from msrc_scraper.incremental import Journal, carry_over, journal_path_for
+    from msrc_scraper.priority import partial_path_for, priority_from_args
+
+    journal = Journal(journal_path_for(args.output))
+    known = {cve: record["exploitability"] for cve, record in journal.load().items()
+             if record.get("exploitability", "Unknown") != "Unknown"}
+    with metrics.phase("extract"):
+        filtered_df = read_details(args.input)
+        if args.incremental:
+            previous = carry_over(filtered_df, args.output, {"Exploitability": "exploitability"})
+            known = {**{cve: record["exploitability"] for cve, record in previous.items()}, **known}
+    metrics.count("already_known", "", len(known))
+    with metrics.phase("enrich"):
+        filtered_df = asyncio.run(add_exploitability(filtered_df, concurrency=args.concurrency, cache=cache,
+                                                     backend=args.backend, blocker=blocker, contexts=args.contexts,
+                                                     known=known, journal=journal, shards=args.shards,
+                                                     store=store,
+                                                     priority=priority_from_args(args, store=store),
+                                                     partial_file=partial_path_for(args.output),
+                                                     partial_every=args.partial_every))
+    _close(cache, store)
+    with metrics.phase("write"):
+        write_with_links(filtered_df, args.output, formats)
+    journal.finish()
+    metrics.write_report(args.metrics or report_path_for(args.output), args.prometheus)
+
+
+def _enrich_all(args, cache, blocker, store, formats):
+    from msrc_scraper.incremental import Journal, carry_over, journal_path_for
+    from msrc_scraper.priority import partial_path_for, priority_from_args
+
+    journal = Journal(journal_path_for(args.output))
+    known = journal.load()
+    if args.stream:
+        from msrc_scraper.pipeline import Pipeline
+
+        pipeline = Pipeline(fetch_cve_record, cache=cache, journal=journal, known=known, blocker=blocker,
+                            concurrency=args.concurrency, contexts=args.contexts, use_api=args.backend == "api",
+                            chunksize=args.chunk_size, store=store)
+        with metrics.phase("pipeline"):
+            paths = pipeline.run(args.input, args.output, formats)
+        for path in paths:
+            print(f"Saved {path}")
+        _close(cache, store)
+        journal.finish()
+        metrics.write_report(args.metrics or report_path_for(args.output), args.prometheus)
+        return
+
+    # Phase 1
+    with metrics.phase("extract"):
+        filtered_df = extract_columns(args.input, with_products=store is not None)
+        if args.incremental:
+            previous = carry_over(filtered_df, args.output,
+                                  {"Product": "title", "Exploitability assessment": "exploitability"},
+                                  compare=("Release date",))
+            # The journal is newer than the previous output
+            known = {cve: merge(previous.get(cve), known.get(cve)) for cve in {**previous, **known}}
+    metrics.count("already_known", "", sum(1 for record in known.values() if resolved(record)))
+    # Phase 2 (async)
+    with metrics.phase("enrich"):
+        filtered_df = asyncio.run(add_product_titles(filtered_df, cache=cache, backend=args.backend, blocker=blocker,
+                                                     concurrency=args.concurrency, contexts=args.contexts,
+                                                     known=known, journal=journal, shards=args.shards,
+                                                     store=store,
+                                                     priority=priority_from_args(args, store=store),
+                                                     partial_file=partial_path_for(args.output),
+                                                     partial_every=args.partial_every))
+    _close(cache, store)
+    # Phase 3
+    with metrics.phase("write"):
+        write_with_links(filtered_df, args.output, formats)
+    journal.finish()
+    metrics.write_report(args.metrics or report_path_for(args.output), args.prometheus)
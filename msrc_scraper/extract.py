@@ -0,0 +1,217 @@
+"""Single round-trip extraction of everything we read from a CVE detail page.
+
+All the DOM walking happens inside one ``page.evaluate`` call, so a page
+costs one CDP round trip instead of one per element. ``extract_html`` runs
+the same rules over saved page HTML without a browser (see snapshots.py);
+keep the two in step.
+"""
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+
+FIELDS = ("title", "exploitability", "cvss", "severity", "impact", "release_date")
+# Least to most severe
+EXPLOITABILITY_LEVELS = ("Unknown", "Exploitation Unlikely", "Exploitation Less Likely", "Exploitation More Likely",
+                         "Exploitation Detected")
+
+EXTRACT_JS = r"""
+() => {
+    const clean = (s) => (s || "").replace(/\s+/g, " ").trim();
+    const out = {};
+
+    const h1 = document.querySelector("h1.ms-fontWeight-semibold");
+    const title = h1 ? clean(h1.innerText.split("\n")[0]) : "";
+    out.title = title && !/loading/i.test(title) ? title : null;
+
+    // <dt>label</dt><dd>value</dd> pairs from every description list on the page
+    const pairs = {};
+    for (const dt of document.querySelectorAll("dl dt")) {
+        const dd = dt.nextElementSibling;
+        if (dd && dd.tagName === "DD") {
+            pairs[clean(dt.innerText).toLowerCase()] = clean(dd.innerText);
+        }
+    }
+    const pair = (...labels) => {
+        for (const label of labels) {
+            if (pairs[label]) return pairs[label];
+        }
+        return null;
+    };
+
+    const text = document.body ? document.body.innerText : "";
+    const lines = text.split("\n").map(clean).filter(Boolean);
+    const after = (label) => {
+        const i = lines.findIndex((l) => l.toLowerCase().startsWith(label));
+        if (i < 0) return null;
+        const rest = clean(lines[i].slice(label.length).replace(/^:/, ""));
+        return rest || lines[i + 1] || null;
+    };
+    const match = (re) => {
+        const m = text.match(re);
+        return m ? clean(m[1]) : null;
+    };
+
+    out.exploitability = pair("exploitability assessment")
+        || after("exploitability assessment")
+        || match(/(Exploitation (?:More Likely|Less Likely|Unlikely|Detected))/);
+    out.cvss = match(/CVSS:\s*3\.\d\s*(\d{1,2}(?:\.\d)?)/) || pair("base score");
+    out.severity = pair("max severity", "severity", "max severity rating")
+        || match(/Max Severity[:\s]*(Critical|Important|Moderate|Low)/i);
+    out.impact = pair("impact") || match(/\b(Remote Code Execution|Elevation of Privilege|Information Disclosure|Denial of Service|Security Feature Bypass|Spoofing|Tampering)\b/);
+    out.release_date = match(/Released:\s*([A-Z][a-z]{2} \d{1,2}, \d{4})/) || pair("released", "release date");
+    return out;
+}
+"""
+
+
+def _iso_date(value):
+    for fmt in ("%b %d, %Y", "%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+def _details(raw):
+    details = {field: raw.get(field) or "Unknown" for field in FIELDS}
+    if details["release_date"] != "Unknown":
+        details["release_date"] = _iso_date(details["release_date"])
+    return details
+
+
+async def extract_cve_details(page):
+    """Return {title, exploitability, cvss, severity, impact, release_date} for a loaded CVE page.
+
+    Fields that aren't on the page (yet) come back as "Unknown".
+    """
+    return _details(await page.evaluate(EXTRACT_JS))
+
+
+# Elements innerText puts on their own line
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+              "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+              "ol", "p", "pre", "section", "table", "tbody", "td", "th", "thead", "tr", "ul"}
+SKIP_TAGS = {"script", "style", "noscript", "template", "head"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+_SPACE = re.compile(r"\s+")
+
+
+def _clean(value):
+    return _SPACE.sub(" ", value or "").strip()
+
+
+class _RenderedText(HTMLParser):
+    """The parts of the DOM EXTRACT_JS looks at: body innerText, the title h1 and <dt>/<dd> pairs."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = []
+        self.skip = 0
+        self.title = None
+        self.pairs = {}
+        # [kind, text parts, dt label, *child tags still open]
+        self.captures = []
+        self.pending_dt = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+            return
+        if self.skip:
+            return
+        if tag in BLOCK_TAGS:
+            self._text("\n")
+        if self.pending_dt is not None and not self.captures:
+            # Only a <dd> directly after the <dt> counts, like dt.nextElementSibling
+            label, self.pending_dt = self.pending_dt, None
+            if tag == "dd":
+                self.captures.append(["dd", [], label])
+                return
+        if tag == "dt":
+            self.captures.append(["dt", [], None])
+        elif tag == "h1" and self.title is None \
+                and "ms-fontWeight-semibold" in (dict(attrs).get("class") or "").split():
+            self.captures.append(["h1", [], None])
+        elif tag not in VOID_TAGS:
+            for capture in self.captures:
+                capture.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+            return
+        if self.skip:
+            return
+        if tag in BLOCK_TAGS:
+            self._text("\n")
+        if not self.captures:
+            return
+        capture = self.captures[-1]
+        if len(capture) > 3:
+            if capture[-1] == tag:
+                capture.pop()
+            return
+        if capture[0] != tag:
+            return
+        self.captures.pop()
+        kind, parts, label = capture
+        value = "".join(parts)
+        if kind == "h1":
+            self.title = value
+        elif kind == "dt":
+            self.pending_dt = _clean(value).lower()
+        elif label is not None:
+            self.pairs[label] = _clean(value)
+
+    def handle_data(self, data):
+        if not self.skip:
+            self._text(data)
+
+    def _text(self, data):
+        self.text.append(data)
+        for capture in self.captures:
+            capture[1].append(data)
+
+
+def extract_html(html):
+    """``extract_cve_details`` for the HTML of a rendered CVE page, without a browser."""
+    dom = _RenderedText()
+    dom.feed(html)
+    dom.close()
+    raw = {}
+    title = _clean(dom.title.strip("\n").split("\n")[0]) if dom.title else ""
+    raw["title"] = title if title and "loading" not in title.lower() else None
+
+    def pair(*labels):
+        for label in labels:
+            if dom.pairs.get(label):
+                return dom.pairs[label]
+        return None
+
+    text = "".join(dom.text)
+    lines = [line for line in (_clean(line) for line in text.split("\n")) if line]
+
+    def after(label):
+        for i, line in enumerate(lines):
+            if line.lower().startswith(label):
+                rest = _clean(re.sub(r"^:", "", line[len(label):]))
+                return rest or (lines[i + 1] if i + 1 < len(lines) else None)
+        return None
+
+    def match(pattern, flags=0):
+        m = re.search(pattern, text, flags)
+        return _clean(m.group(1)) if m else None
+
+    raw["exploitability"] = pair("exploitability assessment") \
+        or after("exploitability assessment") \
+        or match(r"(Exploitation (?:More Likely|Less Likely|Unlikely|Detected))")
+    raw["cvss"] = match(r"CVSS:\s*3\.\d\s*(\d{1,2}(?:\.\d)?)") or pair("base score")
+    raw["severity"] = pair("max severity", "severity", "max severity rating") \
+        or match(r"Max Severity[:\s]*(Critical|Important|Moderate|Low)", re.I)
+    raw["impact"] = pair("impact") or match(r"\b(Remote Code Execution|Elevation of Privilege|Information Disclosure"
+                                            r"|Denial of Service|Security Feature Bypass|Spoofing|Tampering)\b")
+    raw["release_date"] = match(r"Released:\s*([A-Z][a-z]{2} \d{1,2}, \d{4})") or pair("released", "release date")
+    return _details(raw)
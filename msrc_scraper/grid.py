@@ -0,0 +1,108 @@
+"""Read the Update Guide grid from the JSON API behind it instead of the DOM.
+
+The grid is filled from ``/sug/v2.0/.../affectedProduct`` XHRs. ``GridCapture``
+listens to those responses to learn the query the filters produced, then
+pages through the same endpoint directly with the browser's request context
+(same cookies), so the result doesn't depend on row virtualisation or on
+how far the grid was scrolled.
+"""
+from datetime import datetime
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+from msrc_scraper.snapshots import capture_json
+
+GRID_ENDPOINT = "affectedProduct"
+
+# Same headers as the MSRC "Security Updates" export
+COLUMNS = ["Release date", "Product", "Platform", "Impact", "Max Severity", "Article", "Download",
+           "Build Number", "Details"]
+
+
+def _with_query(url, **params):
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in params]
+    query += [(k, str(v)) for k, v in params.items() if v is not None]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="$,'()/:", quote_via=quote)))
+
+
+def _grid_date(value):
+    try:
+        return datetime.fromisoformat(value[:19]).strftime("%b %d, %Y")
+    except (TypeError, ValueError):
+        return value or ""
+
+
+def grid_rows(item):
+    """Turn one affectedProduct item into export-shaped rows, one per KB article."""
+    base = {
+        "Release date": _grid_date(item.get("releaseDate")),
+        "Product": item.get("product") or "",
+        "Platform": item.get("platform") or "",
+        "Impact": item.get("impact") or "",
+        "Max Severity": item.get("severity") or "",
+        "Details": item.get("cveNumber") or item.get("advisoryNumber") or "",
+    }
+    articles = item.get("kbArticles") or [{}]
+    rows = []
+    for kb in articles:
+        row = dict(base)
+        row["Article"] = kb.get("articleName") or ""
+        row["Download"] = kb.get("downloadName") or ""
+        row["Build Number"] = kb.get("fixedBuildNumber") or ""
+        rows.append(row)
+    return rows
+
+
+class GridCapture:
+    """Remembers the grid API queries a page makes; attach before navigating."""
+
+    def __init__(self, page):
+        self.urls = []
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if GRID_ENDPOINT in response.url and response.request.method == "GET" and response.ok:
+            self.urls.append(response.url)
+
+    @property
+    def query_url(self):
+        """The latest grid query without paging parameters, i.e. the one for the current filters."""
+        if not self.urls:
+            return None
+        return _with_query(self.urls[-1], **{"$skip": None, "$top": None})
+
+    async def fetch_all(self, request, page_size=500, max_pages=1000):
+        """Page through the captured query with ``request`` (a Playwright APIRequestContext)."""
+        url = self.query_url
+        if url is None:
+            return []
+        items = []
+        next_url = _with_query(url, **{"$top": page_size, "$skip": 0})
+        for _ in range(max_pages):
+            resp = await request.get(next_url)
+            if not resp.ok:
+                print(f"Grid API returned {resp.status} for {next_url}")
+                break
+            data = await resp.json()
+            capture_json("grid", next_url, data)
+            batch = data.get("value") or []
+            items.extend(batch)
+            total = data.get("@odata.count")
+            if data.get("@odata.nextLink"):
+                next_url = data["@odata.nextLink"]
+            elif batch and (len(items) < total if total is not None else len(batch) >= page_size):
+                next_url = _with_query(url, **{"$top": page_size, "$skip": len(items)})
+            else:
+                break
+            if not batch:
+                break
+        rows = []
+        seen = set()
+        for item in items:
+            for row in grid_rows(item):
+                key = tuple(row[c] for c in COLUMNS)
+                if key not in seen:
+                    seen.add(key)
+                    rows.append(row)
+        print(f"Grid API: {len(items)} items, {len(rows)} rows")
+        return rows
@@ -0,0 +1,157 @@
+"""Incremental runs against the previous output workbook plus a crash-safe journal.
+
+``Journal`` appends one JSON line per enriched CVE and fsyncs it, so a run
+that dies halfway through the browser phase picks up where it stopped.
+``carry_over`` reads the last output workbook and returns the CVEs whose
+rows didn't change, so only new or revised CVEs are enriched again.
+
+Both work per field: a CVE whose title is known but whose exploitability
+isn't is fetched again, and ``merge`` keeps the title if the new fetch
+doesn't get one.
+"""
+import json
+import os
+import time
+
+from msrc_scraper.dedup import is_cve
+
+# ---- CONFIG ----
+# Fields a record needs before its CVE counts as done
+RECORD_FIELDS = ("title", "exploitability")
+
+
+def is_known(value):
+    return isinstance(value, str) and value not in ("", "Unknown")
+
+
+def resolved(record, fields=RECORD_FIELDS):
+    """Whether every one of ``fields`` is known; a record missing any of them is fetched again."""
+    return record is not None and all(is_known(record.get(field)) for field in fields)
+
+
+def merge(old, new):
+    """``new`` with every field it didn't get filled in from ``old``."""
+    if not old:
+        return new
+    if not new:
+        return old
+    return {**old, **{field: value for field, value in new.items() if is_known(value) or field not in old}}
+
+
+class Journal:
+    """Append-only JSONL checkpoint of {cve: record} results for one output file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.written = 0
+
+    def load(self):
+        """Return every record in the journal, later lines winning field by field. A torn last line is ignored."""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                cve = entry.pop("cve", None)
+                entry.pop("ts", None)
+                if cve:
+                    records[cve] = merge(records.get(cve), entry)
+        if records:
+            print(f"Resuming: {len(records)} CVEs already enriched in {self.path}")
+        return records
+
+    def record(self, cve, record):
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Don't glue the first new entry onto a line torn by a crash
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self.file = open(self.path, "a", encoding="utf-8")
+            if torn:
+                self.file.write("\n")
+        entry = dict(record, cve=cve, ts=time.time())
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.written += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        """Drop the journal once its results made it into the output workbook."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def journal_path_for(output_file):
+    root, _ = os.path.splitext(output_file)
+    return root + ".journal.jsonl"
+
+
+def _text(value):
+    # Blank cells are None from openpyxl and NaN from pandas
+    return "" if value is None or value != value else str(value)
+
+
+def _signatures(rows, cves):
+    """{cve: one sorted tuple of values per compared column} over (details, *compared) rows."""
+    values = {}
+    for details, *compared in rows:
+        if details in cves:
+            for seen, value in zip(values.setdefault(details, [set() for _ in compared]), compared):
+                seen.add(_text(value))
+    return {cve: tuple(tuple(sorted(seen)) for seen in columns) for cve, columns in values.items()}
+
+
+def carry_over(df, previous_file, columns, compare=()):
+    """Records from ``previous_file`` for CVEs that are unchanged in ``df``.
+
+    ``columns`` maps output column -> record field (e.g. "Product" -> "title").
+    A CVE is unchanged when it was in the previous output and every column in
+    ``compare`` (e.g. "Release date") has the same values for it in both.
+    Fields that were "Unknown" last time stay "Unknown" in the record, use
+    ``resolved`` to tell the CVEs that need fetching again.
+    """
+    from msrc_scraper.reader import iter_rows
+
+    if not os.path.exists(previous_file):
+        print(f"Incremental: no previous output at {previous_file}, enriching everything")
+        return {}
+    try:
+        rows = list(iter_rows(previous_file, ["Details", *columns, *compare]))
+    except KeyError:
+        print(f"Incremental: {previous_file} doesn't have the expected columns, enriching everything")
+        return {}
+
+    fields = list(columns.values())
+    previous = {}
+    for details, *values in rows:
+        if is_cve(details) and details not in previous:
+            previous[details] = {field: value if is_known(value) else "Unknown"
+                                 for field, value in zip(fields, values)}
+    if compare:
+        old_sig = _signatures(((row[0], *row[1 + len(columns):]) for row in rows), previous)
+        new_sig = _signatures(zip(df["Details"], *(df[c] for c in compare)), previous)
+        previous = {cve: record for cve, record in previous.items() if new_sig.get(cve) == old_sig[cve]}
+    # A record without a single known field is no head start
+    records = {cve: record for cve, record in previous.items() if any(is_known(v) for v in record.values())}
+    # Advisories (ADV...) and other non-CVE rows are never enriched, so they aren't new work either
+    current = {cve for cve in df["Details"].dropna() if is_cve(cve)}
+    unchanged = current & set(records)
+    done = sum(1 for cve in unchanged if resolved(records[cve], fields))
+    print(f"Incremental: {len(unchanged)} unchanged CVEs carried over from {previous_file}"
+          f" ({len(unchanged) - done} of them to retry for missing fields), {len(current) - len(unchanged)} new"
+          f" or changed")
+    return records
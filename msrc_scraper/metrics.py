@@ -0,0 +1,169 @@
+"""Run instrumentation: wall time per phase, per-CVE fetch steps and event counters.
+
+Scripts wrap their phases in ``metrics.phase("enrich")`` and their page
+fetches in ``metrics.step(cve, "goto")`` / ``"ready"`` / ``"extract"``;
+the pool, backends and caches count retries, failures by kind and hits.
+``write_report`` turns it into a JSON report and, optionally, Prometheus
+text format for the node_exporter textfile collector.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+STEPS = ("goto", "ready", "extract")
+
+
+def failure_kind(exc):
+    """Short label for an exception: "timeout", "net_err_connection_refused", "valueerror", ..."""
+    message = str(exc)
+    if "Timeout" in type(exc).__name__ or "Timeout" in message.split("\n")[0]:
+        return "timeout"
+    if "net::ERR_" in message:
+        code = message.split("net::ERR_", 1)[1].split()[0]
+        return "net_err_" + code.lower()
+    return type(exc).__name__.lower()
+
+
+def _summary(values):
+    values = sorted(values)
+    n = len(values)
+    return {
+        "count": n,
+        "total": round(sum(values), 3),
+        "p50": round(values[n // 2], 3),
+        "p95": round(values[min(n - 1, int(n * 0.95))], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}
+        self.steps = {}
+        self.cves = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - start
+
+    @contextmanager
+    def step(self, cve, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.steps.setdefault(name, []).append(elapsed)
+            timings = self.cves.setdefault(cve, {})
+            timings[name] = timings.get(name, 0) + elapsed
+
+    def count(self, event, kind="", n=1):
+        key = (event, kind)
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def failure(self, kind):
+        self.count("failures", kind)
+
+    def retry(self, kind):
+        self.count("retries", kind)
+
+    def cache(self, name, hits, misses):
+        self.count("cache_hits", name, hits)
+        self.count("cache_misses", name, misses)
+
+    def state(self):
+        """Raw samples and counters, picklable, for merging a worker process into the parent."""
+        return {"steps": self.steps, "cves": self.cves, "counters": list(self.counters.items())}
+
+    def merge(self, state):
+        for name, values in state["steps"].items():
+            self.steps.setdefault(name, []).extend(values)
+        for cve, timings in state["cves"].items():
+            mine = self.cves.setdefault(cve, {})
+            for name, seconds in timings.items():
+                mine[name] = mine.get(name, 0) + seconds
+        for (event, kind), n in state["counters"]:
+            self.count(event, kind, n)
+
+    def report(self):
+        from msrc_scraper import readiness
+
+        counters = {}
+        for (event, kind), n in sorted(self.counters.items()):
+            counters.setdefault(event, {})[kind or "all"] = n
+        for kind, n in readiness.stats.timeouts.items():
+            counters.setdefault("ready_timeouts", {})[kind] = n
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "wall_seconds": round(time.time() - self.started, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "steps": {name: _summary(values) for name, values in self.steps.items()},
+            "counters": counters,
+            "cves": {cve: {name: round(seconds, 3) for name, seconds in timings.items()}
+                     for cve, timings in self.cves.items()},
+        }
+
+    def prometheus(self):
+        report = self.report()
+        lines = ["# HELP msrc_phase_seconds Wall time per phase of the last run.",
+                 "# TYPE msrc_phase_seconds gauge"]
+        for name, seconds in report["phases"].items():
+            lines.append(f'msrc_phase_seconds{{phase="{_label(name)}"}} {seconds}')
+        lines += ["# HELP msrc_fetch_step_seconds Per-CVE page fetch time by step.",
+                  "# TYPE msrc_fetch_step_seconds summary"]
+        for name, summary in report["steps"].items():
+            for key, quantile in (("p50", "0.5"), ("p95", "0.95")):
+                lines.append(f'msrc_fetch_step_seconds{{step="{_label(name)}",quantile="{quantile}"}} {summary[key]}')
+            lines.append(f'msrc_fetch_step_seconds_sum{{step="{_label(name)}"}} {summary["total"]}')
+            lines.append(f'msrc_fetch_step_seconds_count{{step="{_label(name)}"}} {summary["count"]}')
+        lines += ["# HELP msrc_events_total Retries, failures and cache lookups by kind.",
+                  "# TYPE msrc_events_total counter"]
+        for event, kinds in report["counters"].items():
+            for kind, n in kinds.items():
+                lines.append(f'msrc_events_total{{event="{_label(event)}",kind="{_label(kind)}"}} {n}')
+        lines.append(f"msrc_run_wall_seconds {report['wall_seconds']}")
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in self.phases.items())
+        if phases:
+            print(f"Phases: {phases}")
+        for name in STEPS:
+            if name in self.steps:
+                s = _summary(self.steps[name])
+                print(f"  {name}: {s['count']} pages, p50 {s['p50']:.2f}s, p95 {s['p95']:.2f}s, max {s['max']:.2f}s")
+        failures = {kind: n for (event, kind), n in self.counters.items() if event == "failures"}
+        if failures:
+            print("Failures: " + ", ".join(f"{kind} {n}" for kind, n in sorted(failures.items())))
+
+    def write_report(self, path=None, prometheus_path=None):
+        self.print_summary()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            print(f"Run report written to {path}")
+        if prometheus_path:
+            # Write-then-rename so the textfile collector never reads half a file
+            tmp = prometheus_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+            os.replace(tmp, prometheus_path)
+
+
+metrics = RunMetrics()
+
+
+def report_path_for(output_file):
+    root, _ = os.path.splitext(output_file)
+    return root + ".metrics.json"
@@ -0,0 +1,470 @@
+"""Local stand-in for msrc.microsoft.com built from recorded CVRF documents.
+
+Record documents with ``msrc-scraper record 2026-Feb --out recordings``
+(or generate a synthetic month with ``--synthetic 300``), then run
+``python -m msrc_scraper.mock_msrc --root recordings`` and point the
+scrapers at it::
+
+    MSRC_API_BASE=http://127.0.0.1:8765
+    MSRC_SITE_BASE=http://127.0.0.1:8765
+    MSRC_RSS_URL=http://127.0.0.1:8765/update-guide/rss
+
+Everything is derived from the CVRF documents: the API endpoints, CVE
+detail pages (rendered client-side after ``--render-delay`` like the real
+SPA), the Update Guide grid with its ``affectedProduct`` API, and the RSS
+feed. ``--latency``, ``--jitter`` and ``--error-rate`` inject delays and 503s.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from msrc_scraper.api import parse_cvrf
+
+CVRF_PATH = re.compile(r"^/cvrf/v3\.0/cvrf/([\w-]+)$")
+UPDATES_PATH = re.compile(r"^/cvrf/v3\.0/updates\('([\w-]+)'\)$")
+CVE_PAGE_PATH = re.compile(r"^/update-guide/vulnerability/(CVE-\d{4}-\d+)/?$")
+GRID_PATH = re.compile(r"^/sug/v2\.0/[\w-]+/affectedProduct$")
+GRID_PAGE_PATH = re.compile(r"^/update-guide/?$")
+RSS_PATH = re.compile(r"^/update-guide/rss/?$")
+FILTER_PRODUCTS = re.compile(r"product in \(([^)]*)\)")
+
+# CVRF remediation type for a security update (KB article)
+REMEDIATION_VENDOR_FIX = 2
+
+SYNTHETIC_PRODUCTS = [
+    ("10816", "Windows Server 2016"),
+    ("10855", "Windows Server 2016 (Server Core installation)"),
+    ("11571", "Windows Server 2019"),
+    ("11923", "Windows Server 2022"),
+    ("12390", "Windows 11 Version 24H2 for x64-based Systems"),
+    ("11568", "Microsoft .NET Framework 4.8"),
+    ("11926", "Microsoft .NET Framework 4.6.2"),
+]
+SYNTHETIC_COMPONENTS = ["Windows Kernel", "Win32k", "Windows SMB", "Windows Hyper-V", "Windows NTLM",
+                        "Windows Common Log File System Driver", "Remote Desktop Client", ".NET"]
+SYNTHETIC_IMPACTS = ["Elevation of Privilege", "Remote Code Execution", "Information Disclosure",
+                     "Denial of Service", "Security Feature Bypass", "Spoofing"]
+SYNTHETIC_EXPLOITABILITY = ["Exploitation Less Likely"] * 6 + ["Exploitation More Likely"] * 3 \
+    + ["Exploitation Unlikely", "Exploited"]
+
+
+def synthesize(root, count=300, doc_id="2026-Feb", release="2026-02-10T08:00:00", seed=0):
+    """Write a CVRF-shaped document with ``count`` made-up CVEs to ``root/cvrf``. Returns its path."""
+    rng = random.Random(seed)
+    year = release[:4]
+    vulns = []
+    for i in range(count):
+        component = rng.choice(SYNTHETIC_COMPONENTS)
+        impact = rng.choice(SYNTHETIC_IMPACTS)
+        dotnet = component == ".NET"
+        pool = [p for p in SYNTHETIC_PRODUCTS if ("NET" in p[1]) == dotnet]
+        products = rng.sample(pool, rng.randint(1, len(pool)))
+        ids = [pid for pid, _ in products]
+        exploit = rng.choice(SYNTHETIC_EXPLOITABILITY)
+        status = ("Publicly Disclosed:No;Exploited:Yes;Latest Software Release:Exploitation Detected"
+                  if exploit == "Exploited" else
+                  f"Publicly Disclosed:No;Exploited:No;Latest Software Release:{exploit}")
+        vulns.append({
+            "CVE": f"CVE-{year}-{21000 + i}",
+            "Title": {"Value": f"{component} {impact} Vulnerability"},
+            "Threats": [
+                {"Type": 0, "Description": {"Value": impact}, "ProductID": ids},
+                {"Type": 1, "Description": {"Value": status}},
+                {"Type": 3, "Description": {"Value": rng.choice(["Important"] * 4 + ["Critical"])}, "ProductID": ids},
+            ],
+            "CVSSScoreSets": [{"BaseScore": round(rng.uniform(4.0, 9.8), 1), "ProductID": ids}],
+            "RevisionHistory": [{"Date": release}],
+            "Remediations": [
+                {"Type": REMEDIATION_VENDOR_FIX, "Description": {"Value": str(5075000 + rng.randint(0, 80))},
+                 "SubType": "Security Update", "FixedBuild": f"10.0.{rng.randint(14393, 26100)}.{rng.randint(1, 9000)}",
+                 "ProductID": [pid]}
+                for pid in ids
+            ],
+        })
+    doc = {
+        "DocumentTracking": {"InitialReleaseDate": release},
+        "ProductTree": {"FullProductName": [{"ProductID": pid, "Value": name} for pid, name in SYNTHETIC_PRODUCTS]},
+        "Vulnerability": vulns,
+    }
+    os.makedirs(os.path.join(root, "cvrf"), exist_ok=True)
+    path = os.path.join(root, "cvrf", f"{doc_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+    return path
+
+
+def grid_items(doc):
+    """affectedProduct items (one per CVE x product) derived from a CVRF document."""
+    products = {p.get("ProductID"): p.get("Value") for p in (doc.get("ProductTree") or {}).get("FullProductName") or []}
+    doc_date = (doc.get("DocumentTracking") or {}).get("InitialReleaseDate") or ""
+    items = []
+    for vuln in doc.get("Vulnerability") or []:
+        cve = vuln.get("CVE")
+        if not cve:
+            continue
+        per_product = {}
+        for threat in vuln.get("Threats") or []:
+            value = (threat.get("Description") or {}).get("Value")
+            key = {0: "impact", 3: "severity"}.get(threat.get("Type"))
+            if key and value:
+                for pid in threat.get("ProductID") or []:
+                    per_product.setdefault(pid, {}).setdefault(key, value)
+        kbs = {}
+        for rem in vuln.get("Remediations") or []:
+            if rem.get("Type") != REMEDIATION_VENDOR_FIX:
+                continue
+            for pid in rem.get("ProductID") or []:
+                kbs.setdefault(pid, []).append({
+                    "articleName": (rem.get("Description") or {}).get("Value") or "",
+                    "downloadName": rem.get("SubType") or "",
+                    "fixedBuildNumber": rem.get("FixedBuild") or "",
+                })
+        revisions = vuln.get("RevisionHistory") or []
+        release = revisions[0].get("Date") if revisions else doc_date
+        for pid in kbs:
+            name = products.get(pid)
+            if not name:
+                continue
+            items.append({
+                "releaseDate": release,
+                "product": name,
+                "productFamily": "Developer Tools" if ".NET" in name else "Windows",
+                "platform": "",
+                "impact": per_product.get(pid, {}).get("impact", ""),
+                "severity": per_product.get(pid, {}).get("severity", ""),
+                "cveNumber": cve,
+                "kbArticles": kbs[pid],
+            })
+    return items
+
+
+class Recordings:
+    """Recorded CVRF documents plus everything the mock site derives from them."""
+
+    def __init__(self, root):
+        self.root = root
+        self.documents = {}
+        self.cve_index = {}
+        self.records = {}
+        self.items = []
+        cvrf_dir = os.path.join(root, "cvrf")
+        if os.path.isdir(cvrf_dir):
+            for name in sorted(os.listdir(cvrf_dir)):
+                if name.endswith(".json"):
+                    self.add_document(name[:-5], os.path.join(cvrf_dir, name))
+        self.items.sort(key=lambda item: item["releaseDate"], reverse=True)
+        self.products = sorted({item["product"] for item in self.items})
+        self.rss = self._build_rss()
+        self.rss_etag = '"%s"' % hashlib.sha1(self.rss).hexdigest()
+
+    def add_document(self, doc_id, path):
+        with open(path, "rb") as f:
+            body = f.read()
+        self.documents[doc_id] = body
+        doc = json.loads(body)
+        for vuln in doc.get("Vulnerability") or []:
+            if vuln.get("CVE"):
+                self.cve_index.setdefault(vuln["CVE"], doc_id)
+        for cve, record in parse_cvrf(doc).items():
+            self.records.setdefault(cve, record)
+        self.items.extend(grid_items(doc))
+
+    def _build_rss(self):
+        items = []
+        for cve, record in self.records.items():
+            try:
+                published = format_datetime(datetime.fromisoformat(record["release_date"]))
+            except ValueError:
+                published = ""
+            items.append(f"<item><title>{escape(cve)} {escape(record['title'])}</title><guid>{escape(cve)}</guid>"
+                         f"<link>/update-guide/vulnerability/{escape(cve)}</link><pubDate>{published}</pubDate></item>")
+        return ('<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                "<title>Security Update Guide</title>" + "".join(items) + "</channel></rss>").encode()
+
+
+CVE_PAGE = """<!DOCTYPE html>
+<html><head><title>{cve} - Security Update Guide</title></head>
+<body>
+<div class="ms-Spinner">Loading...</div>
+<h1 class="ms-fontWeight-semibold">Loading...</h1>
+<div id="content"></div>
+<script>
+const record = {record};
+setTimeout(() => {{
+    document.querySelector(".ms-Spinner").remove();
+    document.querySelector("h1").innerText = record.title;
+    const dl = (pairs) => '<dl class="css-354">' + pairs.map(([k, v]) => `<dt>${{k}}</dt><dd>${{v}}</dd>`).join("") + "</dl>";
+    document.getElementById("content").innerHTML =
+        `<p>Released: ${{record.released}}</p><p>CVSS:3.1 ${{record.cvss}} / ${{record.cvss}}</p>`
+        + dl([["Max Severity", record.severity], ["Impact", record.impact]])
+        + dl([["Exploitability assessment", record.exploitability]]);
+}}, {delay});
+</script>
+</body></html>
+"""
+
+# Fluent-ish filter menus and a paged grid filled from the affectedProduct API.
+# The Product button comes before Product Family so "text=Product" selects it.
+GRID_PAGE = """<!DOCTYPE html>
+<html><head><title>Security Update Guide</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; }}
+#toolbar {{ position: absolute; top: 220px; left: 20px; }}
+.menu {{ position: absolute; top: 260px; left: 300px; background: #eee; padding: 4px; }}
+.menu span {{ display: block; padding: 4px; cursor: pointer; }}
+.ms-DetailsList-contentWrapper {{ position: absolute; top: 320px; left: 20px; width: 900px; height: 400px; overflow: auto; }}
+div[role="row"] {{ display: flex; height: 24px; }}
+div[role="gridcell"] {{ flex: 1; overflow: hidden; white-space: nowrap; }}
+#consent {{ position: absolute; top: 10px; left: 400px; }}
+</style></head>
+<body>
+<div id="consent"><button id="accept">Accept</button></div>
+<div id="toolbar"><button id="product">Product</button> <button id="family">Product Family</button></div>
+<div id="menus"></div>
+<div class="ms-DetailsList-contentWrapper"><div role="rowgroup"></div></div>
+<script>
+const PRODUCTS = {products};
+const FAMILIES = ["Windows", "Developer Tools", "Browser"];
+const PAGE = 50;
+const selected = new Set();
+let family = null, loaded = 0, total = null, loading = false;
+const menus = document.getElementById("menus");
+const rowgroup = document.querySelector('div[role="rowgroup"]');
+const wrapper = document.querySelector(".ms-DetailsList-contentWrapper");
+
+document.getElementById("accept").onclick = () => document.getElementById("consent").remove();
+
+function openMenu(items, onPick, multi) {{
+    menus.innerHTML = "";
+    const menu = document.createElement("div");
+    menu.className = "menu";
+    for (const text of items) {{
+        const span = document.createElement("span");
+        span.className = "ms-ContextualMenu-itemText";
+        span.innerText = text;
+        span.onclick = (e) => {{ e.stopPropagation(); onPick(text); if (!multi) menus.innerHTML = ""; }};
+        menu.appendChild(span);
+    }}
+    menus.appendChild(menu);
+}}
+document.getElementById("family").onclick = (e) => {{
+    e.stopPropagation();
+    openMenu(FAMILIES, (f) => {{ family = f; reload(); }}, false);
+}};
+document.getElementById("product").onclick = (e) => {{
+    e.stopPropagation();
+    openMenu(PRODUCTS, (p) => {{ selected.has(p) ? selected.delete(p) : selected.add(p); reload(); }}, true);
+}};
+document.addEventListener("click", () => {{ menus.innerHTML = ""; }});
+
+function query(skip) {{
+    const filters = [];
+    if (family) filters.push(`productFamily in ('${{family}}')`);
+    if (selected.size) filters.push("product in (" + [...selected].map((p) => `'${{p}}'`).join(",") + ")");
+    const params = ["$orderBy=" + encodeURIComponent("releaseDate desc"), "$count=true"];
+    if (filters.length) params.push("$filter=" + encodeURIComponent(filters.join(" and ")));
+    params.push("$top=" + PAGE, "$skip=" + skip);
+    return "/sug/v2.0/en-US/affectedProduct?" + params.join("&");
+}}
+function fmt(iso) {{
+    return new Date(iso.slice(0, 10) + "T00:00:00").toLocaleDateString("en-US", {{month: "short", day: "numeric", year: "numeric"}});
+}}
+async function loadMore() {{
+    if (loading || (total !== null && loaded >= total)) return;
+    loading = true;
+    const generation = reload.generation;
+    const data = await (await fetch(query(loaded))).json();
+    if (generation !== reload.generation) return;
+    loading = false;
+    total = data["@odata.count"];
+    for (const item of data.value) {{
+        const kb = (item.kbArticles || [{{}}])[0];
+        const cells = [fmt(item.releaseDate), item.product, item.platform, item.impact, item.severity,
+                       kb.articleName || "", kb.downloadName || "", kb.fixedBuildNumber || "", item.cveNumber];
+        const row = document.createElement("div");
+        row.setAttribute("role", "row");
+        row.innerHTML = cells.map((c) => `<div role="gridcell">${{c}}</div>`).join("");
+        rowgroup.appendChild(row);
+    }}
+    loaded += data.value.length;
+}}
+function reload() {{
+    reload.generation = (reload.generation || 0) + 1;
+    rowgroup.innerHTML = "";
+    loaded = 0; total = null; loading = false;
+    loadMore();
+}}
+wrapper.addEventListener("scroll", () => {{
+    if (wrapper.scrollTop + wrapper.clientHeight >= wrapper.scrollHeight - 100) loadMore();
+}});
+</script>
+</body></html>
+"""
+
+
+class MockStats:
+    """Requests served and errors injected, per kind of endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.errors = {}
+
+    def count(self, kind, error=False):
+        with self.lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            if error:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def as_dict(self):
+        with self.lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    recordings = None
+    stats = None
+    rng = None
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    render_delay = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, body, content_type="application/json", status=200, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def not_found(self):
+        self.send_body(b'{"error": "not found"}', status=404)
+
+    def kind_of(self, path):
+        for kind, pattern in (("cvrf", CVRF_PATH), ("updates", UPDATES_PATH), ("page", CVE_PAGE_PATH),
+                              ("grid_api", GRID_PATH), ("grid_page", GRID_PAGE_PATH), ("rss", RSS_PATH)):
+            match = pattern.match(path)
+            if match:
+                return kind, match
+        return "other", None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        kind, match = self.kind_of(path)
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        failed = kind != "other" and self.error_rate and self.rng.random() < self.error_rate
+        self.stats.count(kind, error=bool(failed))
+        if failed:
+            return self.send_body(b'{"error": "injected"}', status=503)
+
+        if kind == "cvrf":
+            body = self.recordings.documents.get(match.group(1))
+            return self.send_body(body) if body else self.not_found()
+        if kind == "updates":
+            doc_id = self.recordings.cve_index.get(match.group(1))
+            value = [{"ID": doc_id, "Alias": doc_id, "CvrfUrl": f"/cvrf/v3.0/cvrf/{doc_id}"}] if doc_id else []
+            return self.send_body(json.dumps({"value": value}).encode())
+        if kind == "page":
+            return self.cve_page(match.group(1))
+        if kind == "grid_page":
+            page = GRID_PAGE.format(products=json.dumps(self.recordings.products))
+            return self.send_body(page.encode(), "text/html; charset=utf-8")
+        if kind == "grid_api":
+            return self.grid_api(parse_qs(url.query))
+        if kind == "rss":
+            if self.headers.get("If-None-Match") == self.recordings.rss_etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            return self.send_body(self.recordings.rss, "application/rss+xml", headers={"ETag": self.recordings.rss_etag})
+        self.not_found()
+
+    def cve_page(self, cve):
+        record = self.recordings.records.get(cve)
+        if record is None:
+            return self.send_body(b"<html><body><h1>Not found</h1></body></html>", "text/html", status=404)
+        try:
+            released = datetime.fromisoformat(record["release_date"]).strftime("%b %d, %Y")
+        except ValueError:
+            released = ""
+        data = {**record, "released": released}
+        page = CVE_PAGE.format(cve=escape(cve), record=json.dumps(data), delay=int(self.render_delay * 1000))
+        self.send_body(page.encode(), "text/html; charset=utf-8")
+
+    def grid_api(self, query):
+        items = self.recordings.items
+        match = FILTER_PRODUCTS.search((query.get("$filter") or [""])[0])
+        if match:
+            wanted = {p.strip().strip("'") for p in match.group(1).split(",")}
+            items = [item for item in items if item["product"] in wanted]
+        skip = int((query.get("$skip") or ["0"])[0])
+        top = int((query.get("$top") or ["50"])[0])
+        body = {"@odata.count": len(items), "value": items[skip:skip + top]}
+        self.send_body(json.dumps(body).encode())
+
+
+def serve(root, host="127.0.0.1", port=8765, latency=0.0, jitter=0.0, error_rate=0.0, render_delay=0.0, seed=None):
+    """Start the stand-in server on a background thread and return it.
+
+    ``latency``/``jitter`` (seconds) delay every response, ``error_rate`` is
+    the fraction of requests answered with a 503 and ``render_delay`` is how
+    long CVE pages take to render their content. ``server.stats`` counts
+    requests and injected errors.
+    """
+    stats = MockStats()
+    handler = type("Handler", (MockHandler,), {
+        "recordings": Recordings(root),
+        "stats": stats,
+        "rng": random.Random(seed),
+        "latency": latency,
+        "jitter": jitter,
+        "error_rate": error_rate,
+        "render_delay": render_delay,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the MSRC site and API")
+    parser.add_argument("--root", default="recordings", help="directory written by msrc-scraper record --out")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="generate a month of N made-up CVEs into --root first")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--render-delay", type=float, default=0.3, help="seconds before CVE pages show content")
+    args = parser.parse_args()
+    if args.synthetic:
+        print(f"Wrote {synthesize(args.root, args.synthetic)}")
+    server = serve(args.root, args.host, args.port, latency=args.latency, jitter=args.jitter,
+                   error_rate=args.error_rate, render_delay=args.render_delay)
+    print(f"Serving {args.root} on http://{args.host}:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,360 @@
+"""Streaming reader -> enrichment -> writer pipeline over bounded asyncio queues.
+
+The export is read in chunks on a worker thread, each chunk's new CVEs are
+enriched (title and exploitability together: cache, then the CVRF API,
+then the browser) and the chunk goes straight out to the output files, so
+the first rows land on disk seconds after start. At most ``buffer`` chunks
+wait between two stages, so memory stays flat however large the input is;
+only the per-CVE results are kept for the whole run.
+
+Chunks the cache already covers are written straight away without an
+event loop; the loop, the API client and the browser only start at the
+first chunk that needs them, so a run served from the cache skips them.
+"""
+import asyncio
+import concurrent.futures
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import AsyncExitStack
+from datetime import date
+
+from msrc_scraper.api import ApiBackend, is_useful
+from msrc_scraper.dedup import is_cve
+from msrc_scraper.extract import FIELDS
+from msrc_scraper.incremental import merge, resolved
+from msrc_scraper.metrics import metrics
+from msrc_scraper.store import iso_date
+
+OUTPUT_COLUMNS = ["Details", "Release date", "Today's Date", "Exploitability assessment", "Product"]
+STREAM_FORMATS = ("xlsx", "csv", "jsonl", "parquet")
+
+_DONE = object()
+
+
+class _XlsxSink:
+    def __init__(self, path):
+        from msrc_scraper.writer import LinkedSheetWriter
+
+        self.writer = LinkedSheetWriter(path, OUTPUT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.write_rows(rows)
+
+    def close(self):
+        self.writer.close()
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(OUTPUT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class _JsonlSink:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(dict(zip(OUTPUT_COLUMNS, row)), ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetSink:
+    """One row group per chunk."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(column, pa.string()) for column in OUTPUT_COLUMNS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows)) or [[] for _ in OUTPUT_COLUMNS]
+        columns = [[None if v is None else str(v) for v in column] for column in columns]
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+SINKS = {"xlsx": _XlsxSink, "csv": _CsvSink, "jsonl": _JsonlSink, "parquet": _ParquetSink}
+
+
+class Pipeline:
+    """Enrich an MSRC export into OUTPUT_COLUMNS while streaming it.
+
+    ``fetch(page, cve)`` is the per-CVE browser fetch returning a
+    {title, exploitability, ...} record. ``known`` holds records resolved
+    by an earlier, interrupted run; ``journal`` checkpoints new ones. CVEs
+    ``known`` lacks a field of are fetched again.
+    With a ``store`` (msrc_scraper.store) every chunk is also recorded there,
+    with the export's Product and Article columns.
+    """
+
+    def __init__(self, fetch, cache=None, journal=None, known=None, blocker=None, concurrency=8, contexts=1,
+                 use_api=True, chunksize=500, buffer=4, store=None):
+        self.fetch = fetch
+        self.cache = cache
+        self.store = store
+        self.journal = journal
+        self.known = dict(known or {})
+        self.blocker = blocker
+        self.concurrency = concurrency
+        self.contexts = contexts
+        self.chunksize = chunksize
+        self.buffer = buffer
+        self.api = None
+        if use_api:
+            self.api = ApiBackend()
+        self.results = {}
+        # CVE -> task of a page still loading
+        self.browsing = {}
+        # CVEs neither ``known`` nor the cache had
+        self.missed = set()
+        self.pool = None
+        self.browser_ok = True
+        self.stack = None
+        self.stop = threading.Event()
+        self.started = None
+        self.rows_read = 0
+        self.rows_written = 0
+
+    def run(self, input_file, output_file, formats=("xlsx",)):
+        """Returns the paths written."""
+        root, _ = os.path.splitext(output_file)
+        paths = [f"{root}.{fmt}" for fmt in formats]
+        self.started = time.perf_counter()
+        chunks = self._chunks(input_file)
+        sinks = []
+        try:
+            for fmt, path in zip(formats, paths):
+                sinks.append(SINKS[fmt](path))
+            for chunk in chunks:
+                if not self._from_cache(chunk):
+                    # This chunk and everything after it go through the concurrent stages
+                    asyncio.run(self._run_async(itertools.chain([chunk], chunks), sinks))
+                    break
+                self._write_chunk(chunk, sinks)
+        finally:
+            for sink in sinks:
+                sink.close()
+        if self.blocker and self.pool is not None:
+            self.blocker.report()
+        resolved = sum(1 for record in self.results.values() if is_useful(record))
+        print(f"Pipeline: {self.rows_written} rows, {resolved}/{len(self.results)} CVEs resolved"
+              f" in {time.perf_counter() - self.started:.1f}s")
+        return paths
+
+    async def _run_async(self, chunks, sinks):
+        rows = asyncio.Queue(self.buffer)
+        out = asyncio.Queue(self.buffer)
+        async with AsyncExitStack() as self.stack:
+            tasks = [asyncio.ensure_future(self._read(chunks, rows)),
+                     asyncio.ensure_future(self._enrich(rows, out)),
+                     asyncio.ensure_future(self._write(out, sinks))]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                self.stop.set()
+                for task in tasks + list(self.browsing.values()):
+                    task.cancel()
+                raise
+
+    # ---- stage 1: read ----
+    def _chunks(self, path):
+        from msrc_scraper.reader import iter_rows
+
+        columns = ["Details", "Release date"] + (["Product", "Article"] if self.store is not None else [])
+        chunk = []
+        for details, released, *extra in iter_rows(path, columns):
+            if self.stop.is_set():
+                return
+            chunk.append((details, iso_date(released), *extra))
+            self.rows_read += 1
+            if len(chunk) >= self.chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def _read(self, chunks, queue):
+        loop = asyncio.get_running_loop()
+
+        def put(chunk):
+            future = asyncio.run_coroutine_threadsafe(queue.put(chunk), loop)
+            # Blocks while the queue is full; gives up if another stage failed
+            while not self.stop.is_set():
+                try:
+                    return future.result(timeout=0.5)
+                except concurrent.futures.TimeoutError:
+                    continue
+            future.cancel()
+
+        def produce():
+            for chunk in chunks:
+                if self.stop.is_set():
+                    return
+                put(chunk)
+
+        try:
+            await loop.run_in_executor(None, produce)
+        finally:
+            await queue.put(_DONE)
+
+    # ---- stage 2: enrich ----
+    async def _enrich(self, rows, out):
+        try:
+            while True:
+                chunk = await rows.get()
+                if chunk is _DONE:
+                    break
+                release_dates = {}
+                for details, released, *_ in chunk:
+                    if is_cve(details) and details not in self.results and details not in self.browsing:
+                        release_dates.setdefault(details, released)
+                if release_dates:
+                    await self._resolve(list(release_dates), release_dates)
+                # CVEs still in the browser (this chunk's or an earlier one's) hold the chunk back at the
+                # writer, not here, so the next chunk's pages are queued while these load
+                waits = {self.browsing[details] for details, *_ in chunk if details in self.browsing}
+                await out.put((chunk, waits))
+        finally:
+            await out.put(_DONE)
+
+    def _lookup(self, cve):
+        """Record from ``known`` or the cache, or None; each CVE is looked up once."""
+        if cve in self.missed:
+            return None
+        record = self.known.get(cve)
+        if not resolved(record):
+            record = None
+        if record is None and self.cache:
+            record = self.cache.get_all(cve, ("title", "exploitability"))
+        if not record:
+            self.missed.add(cve)
+            return None
+        self.results[cve] = record
+        return record
+
+    def _from_cache(self, chunk):
+        """Resolve the chunk's new CVEs from ``known`` and the cache; False when some need fetching."""
+        cves = dict.fromkeys(details for details, *_ in chunk if is_cve(details) and details not in self.results)
+        return all([self._lookup(cve) is not None for cve in cves])
+
+    async def _resolve(self, cves, release_dates):
+        pending = [cve for cve in cves if self._lookup(cve) is None]
+
+        if pending and self.api is not None:
+            fetched = {}
+            try:
+                fetched = await self.api.enrich(pending, release_dates=release_dates, checkpoint=self._checkpoint)
+            except ImportError as e:
+                print(f"Skipping api backend: {e}")
+                self.api = None
+            except Exception as e:
+                metrics.failure("api_backend")
+                print(f"api backend failed: {e}")
+            for cve, record in fetched.items():
+                self._found(cve, record)
+            pending = [cve for cve in pending if cve not in fetched]
+
+        if pending and self.browser_ok:
+            pool = await self._browser_pool()
+            if pool is not None:
+                for cve in pending:
+                    self.browsing[cve] = asyncio.ensure_future(self._browse(pool, cve))
+                return
+        for cve in pending:
+            self._unresolved(cve)
+
+    async def _browse(self, pool, cve):
+        record = await pool.submit(cve)
+        if is_useful(record):
+            self._found(cve, record)
+        else:
+            self._unresolved(cve)
+        del self.browsing[cve]
+
+    def _unresolved(self, cve):
+        # Whatever ``known`` had is still better than nothing
+        self.results.setdefault(cve, self.known.get(cve) or dict.fromkeys(FIELDS, "Unknown"))
+
+    def _found(self, cve, record):
+        record = merge(self.known.get(cve), record)
+        self.results[cve] = record
+        if self.cache:
+            self.cache.put(cve, title=record["title"], exploitability=record["exploitability"])
+
+    async def _browser_pool(self):
+        """Browser and page pool, started on first use and kept for the rest of the run."""
+        if self.pool is None:
+            try:
+                from playwright.async_api import async_playwright
+
+                from msrc_scraper.browser import open_browser
+                from msrc_scraper.pool import PagePool
+
+                playwright = await self.stack.enter_async_context(async_playwright())
+                browser = await self.stack.enter_async_context(open_browser(playwright))
+                self.pool = await self.stack.enter_async_context(
+                    PagePool(browser, max_concurrency=self.concurrency, contexts=self.contexts, blocker=self.blocker))
+                # One set of workers for the whole run, so the limiter keeps what it has learnt between chunks
+                self.pool.start(self.fetch, on_result=self._browser_checkpoint)
+            except Exception as e:
+                print(f"Skipping browser backend: {e}")
+                self.browser_ok = False
+        return self.pool
+
+    def _checkpoint(self, cve, record):
+        if self.journal is not None:
+            self.journal.record(cve, record)
+
+    def _browser_checkpoint(self, cve, record):
+        if is_useful(record):
+            self._checkpoint(cve, record)
+
+    # ---- stage 3: write ----
+    async def _write(self, out, sinks):
+        while True:
+            item = await out.get()
+            if item is _DONE:
+                break
+            chunk, waits = item
+            if waits:
+                await asyncio.gather(*waits)
+            self._write_chunk(chunk, sinks)
+
+    def _write_chunk(self, chunk, sinks):
+        today = date.today().isoformat()
+        rows = []
+        for details, released, *_ in chunk:
+            record = self.results.get(details) or {}
+            rows.append((details, released, today, record.get("exploitability", "Unknown"),
+                         record.get("title", "Unknown")))
+        for sink in sinks:
+            sink.write(rows)
+        if self.store is not None:
+            self.store.add(({**self.results.get(details, {}), "cve": details, "release_date": released,
+                             "product": product, "kb": kb} for details, released, product, kb in chunk),
+                           source="stream")
+        if not self.rows_written:
+            print(f"First {len(rows)} rows written after {time.perf_counter() - self.started:.1f}s")
+        self.rows_written += len(rows)
@@ -0,0 +1,178 @@
+"""Reusable page pool with adaptive concurrency for the CVE page fetchers.
+
+Workers each keep one page open and reuse it for every CVE they pick up,
+spread round-robin over one or more browser contexts. How many workers
+may be busy at once is decided by ``AdaptiveLimiter``: it grows while pages
+come back quickly and backs off on slow pages or errors.
+"""
+import asyncio
+import time
+
+from msrc_scraper.browser import new_context
+from msrc_scraper.metrics import failure_kind, metrics
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on concurrent page loads."""
+
+    def __init__(self, ceiling=8, initial=2, floor=1, slow_factor=2.0):
+        self.ceiling = max(1, ceiling)
+        self.floor = min(floor, self.ceiling)
+        self.limit = max(self.floor, min(initial, self.ceiling))
+        self.slow_factor = slow_factor
+        self.active = 0
+        self.successes = 0
+        self.latency = None
+        self.baseline = None
+        self.peak = self.limit
+        self.cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, latency, failed=False):
+        async with self.cond:
+            self.active -= 1
+            if failed:
+                self.limit = max(self.floor, self.limit // 2)
+                self.successes = 0
+            else:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+                if self.latency > self.baseline * self.slow_factor:
+                    self.limit = max(self.floor, self.limit - 1)
+                    self.successes = 0
+                else:
+                    # One step up per "full round" of successful pages at the current limit
+                    self.successes += 1
+                    if self.successes >= self.limit and self.limit < self.ceiling:
+                        self.limit += 1
+                        self.successes = 0
+            self.peak = max(self.peak, self.limit)
+            self.cond.notify_all()
+
+
+class PagePool:
+    """Pool of reusable pages over ``contexts`` browser contexts.
+
+    ``map(fn, items)`` calls ``await fn(page, item)`` for every item and
+    returns the results in item order. An exception counts as a failure for
+    the limiter and replaces the page; the item is retried up to ``retries``
+    times on a fresh page before it yields ``default``.
+    ``on_result(item, result)`` is called as each successful item completes.
+
+    For work that arrives over time, ``start(fn)`` keeps the workers (and one
+    limiter) running and ``submit(item)`` returns a future of the item's
+    result, until ``stop()`` or the end of the ``async with``.
+    """
+
+    def __init__(self, browser, max_concurrency=8, initial_concurrency=2, contexts=1, blocker=None, retries=1):
+        self.browser = browser
+        self.retries = retries
+        self.max_concurrency = max(1, max_concurrency)
+        self.initial_concurrency = initial_concurrency
+        self.num_contexts = max(1, contexts)
+        self.blocker = blocker
+        self.contexts = []
+        self.errors = 0
+        self.pages = 0
+        self.queue = None
+        self.workers = []
+        self.limiter = None
+
+    async def __aenter__(self):
+        for _ in range(self.num_contexts):
+            context = await new_context(self.browser)
+            if self.blocker:
+                await self.blocker.install(context)
+            self.contexts.append(context)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+        for context in self.contexts:
+            await context.close()
+        self.contexts = []
+
+    async def map(self, fn, items, default=None, on_result=None):
+        items = list(items)
+        if not items:
+            return []
+        self.start(fn, default=default, on_result=on_result, workers=min(self.max_concurrency, len(items)))
+        try:
+            return list(await asyncio.gather(*(self.submit(item) for item in items)))
+        finally:
+            await self.stop()
+
+    def start(self, fn, default=None, on_result=None, workers=None):
+        self.queue = asyncio.Queue()
+        self.limiter = AdaptiveLimiter(ceiling=self.max_concurrency, initial=self.initial_concurrency)
+        self.errors = self.pages = 0
+        self.workers = [asyncio.ensure_future(self._worker(n, fn, default, on_result))
+                        for n in range(workers or self.max_concurrency)]
+
+    def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((item, future, 0))
+        return future
+
+    async def stop(self):
+        if not self.workers:
+            return
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        if self.pages:
+            print(f"Page pool: {self.pages} pages, {self.errors} errors, concurrency peaked at"
+                  f" {self.limiter.peak}/{self.max_concurrency} over {len(self.contexts)} context(s)")
+
+    async def _worker(self, n, fn, default, on_result):
+        context = self.contexts[n % len(self.contexts)]
+        limiter = self.limiter
+        page = None
+        try:
+            while True:
+                item, future, attempts = await self.queue.get()
+                await limiter.acquire()
+                start = time.monotonic()
+                failed = False
+                try:
+                    if page is None or page.is_closed():
+                        page = await context.new_page()
+                    result = await fn(page, item)
+                    if on_result is not None:
+                        on_result(item, result)
+                    self._resolve(future, result)
+                except Exception as e:
+                    failed = True
+                    kind = failure_kind(e)
+                    if attempts < self.retries:
+                        metrics.retry(kind)
+                        self.queue.put_nowait((item, future, attempts + 1))
+                    else:
+                        self.errors += 1
+                        metrics.failure(kind)
+                        print(f"Error fetching {item}: {e}")
+                        self._resolve(future, default)
+                    if page is not None:
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+                    page = None
+                finally:
+                    await limiter.release(time.monotonic() - start, failed)
+        finally:
+            if page is not None and not page.is_closed():
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    def _resolve(self, future, result):
+        self.pages += 1
+        if not future.done():
+            future.set_result(result)
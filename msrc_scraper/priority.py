@@ -0,0 +1,167 @@
+"""Enrich the most urgent CVEs first and show partial results while the rest load.
+
+``PrioritySignals`` orders CVEs for enrichment: anything already known to be
+exploited in the wild first, then newest release, then severity, the
+exploitability assessment and the impact in the title (Remote Code
+Execution before Denial of Service). Signals come from the export (release
+date), the result store (what earlier runs found) and the persisted RSS
+title map, so ordering costs no requests.
+
+``PartialOutput`` rewrites ``<output>.partial.xlsx`` every few seconds with
+the rows resolved so far, most urgent first, so triage can start long
+before the last page has loaded. It is removed once the run finishes.
+"""
+import os
+import time
+
+from msrc_scraper.extract import EXPLOITABILITY_LEVELS
+from msrc_scraper.store import iso_date
+
+SEVERITY_LEVELS = ("Low", "Moderate", "Important", "Critical")
+# Impact named at the end of a CVE title, least to most urgent
+IMPACT_LEVELS = ("Denial of Service", "Spoofing", "Tampering", "Information Disclosure", "Security Feature Bypass",
+                 "Elevation of Privilege", "Remote Code Execution")
+
+
+def _rank(levels, value):
+    if not value:
+        return -1
+    value = str(value).lower()
+    for rank in range(len(levels) - 1, -1, -1):
+        if levels[rank].lower() in value:
+            return rank
+    return -1
+
+
+class PrioritySignals:
+    def __init__(self, release_dates=None, store=None, rss=None):
+        self.release_dates = {cve: iso_date(value) for cve, value in (release_dates or {}).items()}
+        self.store = store
+        self.titles = rss.titles if rss is not None else {}
+        self.known = {}
+
+    def _load(self, cves):
+        missing = [cve for cve in cves if cve not in self.known]
+        if missing and self.store is not None:
+            self.known.update(self.store.signals(missing))
+
+    def key(self, cve):
+        known = self.known.get(cve) or {}
+        exploitability = _rank(EXPLOITABILITY_LEVELS, known.get("exploitability"))
+        return (
+            exploitability == len(EXPLOITABILITY_LEVELS) - 1,
+            self.release_dates.get(cve) or known.get("release_date") or "",
+            _rank(SEVERITY_LEVELS, known.get("severity")),
+            exploitability,
+            _rank(IMPACT_LEVELS, known.get("title") or self.titles.get(cve)),
+        )
+
+    def order(self, cves, release_dates=None):
+        """``cves`` most urgent first; ties keep their input order. ``release_dates`` maps CVE -> release date."""
+        cves = list(cves)
+        for cve, value in (release_dates or {}).items():
+            self.release_dates[cve] = iso_date(value)
+        self._load(cves)
+        return sorted(cves, key=self.key, reverse=True) if cves else cves
+
+    def summary(self, cves, release_dates=None):
+        ordered = self.order(cves, release_dates)
+        informed = sum(1 for cve in ordered if cve in self.known or cve in self.titles)
+        print(f"Priority: {len(ordered)} CVEs ordered, {informed} with signals from earlier runs or the RSS feed"
+              + (f", first up {', '.join(ordered[:3])}" if ordered else ""))
+        return ordered
+
+
+def partial_path_for(output_file):
+    root, _ = os.path.splitext(output_file)
+    return root + ".partial.xlsx"
+
+
+class PartialOutput:
+    """Periodic snapshot workbook of the results so far.
+
+    ``make_rows(results)`` turns the {cve: record} resolved so far into row
+    tuples in ``columns`` order, most urgent first. ``record`` is a
+    checkpoint callback (same signature as Journal.record); ``flush`` writes
+    whatever it has held back, call it when a backend is done so a burst
+    of results doesn't wait for the next interval.
+    """
+
+    def __init__(self, path, columns, make_rows, interval=30):
+        self.path = path
+        self.columns = columns
+        self.make_rows = make_rows
+        self.interval = interval
+        self.results = {}
+        self.written_at = None
+        self.unwritten = 0
+        self.writes = 0
+        self.failed = False
+
+    def record(self, cve, record):
+        self.results[cve] = record
+        self.unwritten += 1
+        if self.written_at is None or time.monotonic() - self.written_at >= self.interval:
+            self.write()
+
+    def update(self, results):
+        self.results.update(results)
+        if self.results:
+            self.write()
+
+    def flush(self):
+        if self.unwritten:
+            self.write()
+            if self.writes > 1:
+                print(f"Partial results: {len(self.results)} CVEs so far in {self.path}")
+
+    def write(self):
+        from msrc_scraper.writer import LinkedSheetWriter
+
+        self.written_at = time.monotonic()
+        self.unwritten = 0
+        # Write-then-rename so a reader never opens half a workbook
+        tmp = self.path + ".tmp"
+        try:
+            with LinkedSheetWriter(tmp, self.columns) as writer:
+                writer.write_rows(self.make_rows(self.results))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # e.g. the previous partial workbook is open in Excel on Windows
+            if not self.failed:
+                print(f"Could not update {self.path}: {e}")
+            self.failed = True
+            return
+        self.writes += 1
+        if self.writes == 1:
+            print(f"Partial results ({len(self.results)} CVEs so far) in {self.path}, refreshed every {self.interval}s")
+
+    def close(self):
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def checkpoints(*callbacks):
+    """One checkpoint callback calling every non-None one of ``callbacks``."""
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def record(cve, value):
+        for callback in callbacks:
+            callback(cve, value)
+    return record
+
+
+def priority_from_args(args, release_dates=None, store=None):
+    if args.no_priority:
+        return None
+    from msrc_scraper.titles import RssTitleMap
+
+    return PrioritySignals(release_dates, store=store, rss=RssTitleMap())
@@ -0,0 +1,72 @@
+"""Streaming, column-projected reader for MSRC Excel exports.
+
+openpyxl's read-only mode parses the sheet XML row by row, so only the
+requested columns of the current row are ever held in memory, however
+big the export is.
+"""
+
+
+def _open_sheet(path, sheet=None):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+    return workbook, worksheet
+
+
+def _header_positions(header, columns, path):
+    names = [str(h).strip() if h is not None else "" for h in header]
+    positions = []
+    for column in columns:
+        if column not in names:
+            raise KeyError(f"Column {column!r} not found in {path}; header is {names}")
+        positions.append(names.index(column))
+    return positions
+
+
+def read_header(path, sheet=None):
+    """Column names of the sheet, blanks dropped."""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), None) or ()
+    finally:
+        workbook.close()
+    return [str(h).strip() for h in header if h is not None and str(h).strip()]
+
+
+def iter_rows(path, columns, sheet=None):
+    """Yield one tuple per data row with the values of ``columns`` (header names), in that order."""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions = _header_positions(header, columns, path)
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            yield tuple(row[p] if p < len(row) else None for p in positions)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(path, columns, chunksize=10000, sheet=None):
+    """Yield DataFrames of at most ``chunksize`` rows with just ``columns``."""
+    import pandas as pd
+
+    chunk = []
+    for row in iter_rows(path, columns, sheet):
+        chunk.append(row)
+        if len(chunk) >= chunksize:
+            yield pd.DataFrame.from_records(chunk, columns=columns)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame.from_records(chunk, columns=columns)
+
+
+def read_columns(path, columns, sheet=None):
+    """Drop-in for ``pd.read_excel(path)[columns]`` that never materialises the other columns."""
+    import pandas as pd
+
+    return pd.DataFrame.from_records(list(iter_rows(path, columns, sheet)), columns=columns)
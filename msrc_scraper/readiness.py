@@ -0,0 +1,99 @@
+"""Event-driven readiness waits for MSRC pages.
+
+Instead of sleeping and re-checking from Python, each wait hands a
+predicate to ``page.wait_for_function``. It is re-evaluated inside the page
+on every animation frame, so the wait resolves on the first frame where the
+content is usable. Time-to-ready is recorded per page so runs can report
+how long pages actually took.
+"""
+import time
+
+TITLE_SELECTOR = "h1.ms-fontWeight-semibold"
+
+# Title present and no longer the "Loading..." placeholder
+TITLE_READY_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    const text = (el.innerText || "").trim();
+    return text.length > 0 && !/loading/i.test(text);
+}
+"""
+
+# The "Exploitability assessment" entry has rendered with a value next to it, or the
+# details have rendered (spinner gone) without one, e.g. CVEs from third-party CNAs
+EXPLOITABILITY_READY_JS = """
+() => {
+    const terms = document.querySelectorAll("dl dt");
+    for (const dt of terms) {
+        if (/exploitability assessment/i.test(dt.innerText || "")) {
+            const dd = dt.nextElementSibling;
+            return !!(dd && (dd.innerText || "").trim());
+        }
+    }
+    return terms.length > 0 && !document.querySelector(".ms-Spinner");
+}
+"""
+
+
+class ReadinessStats:
+    """Time-to-ready samples per wait kind."""
+
+    def __init__(self):
+        self.samples = {}
+        self.timeouts = {}
+
+    def record(self, kind, seconds):
+        self.samples.setdefault(kind, []).append(seconds)
+
+    def timeout(self, kind):
+        self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+
+    def state(self):
+        """Samples and timeouts, picklable, for merging a worker process into the parent."""
+        return {"samples": self.samples, "timeouts": self.timeouts}
+
+    def merge(self, state):
+        for kind, values in state["samples"].items():
+            self.samples.setdefault(kind, []).extend(values)
+        for kind, n in state["timeouts"].items():
+            self.timeouts[kind] = self.timeouts.get(kind, 0) + n
+
+    def report(self):
+        for kind in sorted(set(self.samples) | set(self.timeouts)):
+            values = sorted(self.samples.get(kind, []))
+            misses = self.timeouts.get(kind, 0)
+            if values:
+                p50 = values[len(values) // 2]
+                p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+                print(f"Ready ({kind}): {len(values)} pages, p50 {p50:.2f}s, p95 {p95:.2f}s,"
+                      f" mean {sum(values) / len(values):.2f}s, {misses} timeouts")
+            else:
+                print(f"Ready ({kind}): {misses} timeouts")
+
+
+stats = ReadinessStats()
+
+
+async def wait_ready(page, kind, expression, arg=None, timeout=15000):
+    """Wait until ``expression`` is truthy in the page. Returns seconds taken, or None on timeout."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    start = time.monotonic()
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=timeout)
+    except PlaywrightTimeoutError:
+        # Navigation errors and closed pages are the caller's to handle
+        stats.timeout(kind)
+        return None
+    elapsed = time.monotonic() - start
+    stats.record(kind, elapsed)
+    return elapsed
+
+
+async def wait_for_title(page, timeout=15000):
+    return await wait_ready(page, "title", TITLE_READY_JS, TITLE_SELECTOR, timeout)
+
+
+async def wait_for_exploitability(page, timeout=5000):
+    return await wait_ready(page, "exploitability", EXPLOITABILITY_READY_JS, timeout=timeout)
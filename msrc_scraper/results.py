@@ -0,0 +1,88 @@
+"""Compact in-memory model for enriched result frames.
+
+An enriched export is a handful of distinct values repeated over every row:
+each CVE id shows up once per product x KB, there are a few hundred titles
+and five exploitability values, and "Today's Date" is the same everywhere.
+Held as strings that is one Python object per cell. ``compact`` turns the
+repeating columns into categoricals, exploitability into an ordered enum
+(least to most severe, so ``sort_values(ascending=False)`` puts detected
+exploitation first), release dates into datetime64 and constant columns
+into metadata in ``df.attrs``. ``expand`` gives back the plain frame the
+writers expect; ``write_outputs`` calls it, so compact frames can be
+written as they are.
+"""
+import pandas as pd
+
+from msrc_scraper.extract import EXPLOITABILITY_LEVELS
+
+EXPLOITABILITY_COLUMNS = ("Exploitability assessment", "Exploitability")
+DATE_COLUMNS = ("Release date",)
+CONSTANT_COLUMNS = ("Today's Date",)
+
+_META = "msrc_compact"
+
+
+def exploitability_dtype(values=()):
+    """Ordered categorical of the known assessments; anything else MSRC prints ranks just above Unknown."""
+    extras = sorted({v for v in values if isinstance(v, str)} - set(EXPLOITABILITY_LEVELS))
+    return pd.CategoricalDtype([EXPLOITABILITY_LEVELS[0], *extras, *EXPLOITABILITY_LEVELS[1:]], ordered=True)
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _iso_dates(series):
+    """datetime64 version of a column of YYYY-MM-DD strings, None if anything else is in it (e.g. "Feb 10, 2026")."""
+    dates = pd.to_datetime(series, errors="coerce", format="%Y-%m-%d")
+    if (dates.isna() & series.notna()).any():
+        return None
+    return dates
+
+
+def compact(df, max_ratio=0.5):
+    """Compact copy of ``df``. Text columns with at most ``max_ratio`` distinct values per row become categoricals."""
+    if df.attrs.get(_META):
+        return df
+    meta = {"columns": list(df.columns), "constants": {}, "dates": []}
+    out = {}
+    for column in df.columns:
+        series = df[column]
+        dates = _iso_dates(series) if column in DATE_COLUMNS and _is_text(series) else None
+        if column in CONSTANT_COLUMNS and len(series) and series.nunique(dropna=False) == 1:
+            meta["constants"][column] = series.iloc[0]
+        elif dates is not None:
+            out[column] = dates
+            meta["dates"].append(column)
+        elif column in EXPLOITABILITY_COLUMNS and _is_text(series):
+            out[column] = series.astype(exploitability_dtype(series.unique()))
+        elif _is_text(series) and series.nunique() <= max_ratio * len(series):
+            out[column] = series.astype("category")
+        else:
+            out[column] = series
+    compacted = pd.DataFrame(out, index=df.index)
+    compacted.attrs[_META] = meta
+    return compacted
+
+
+def expand(df):
+    """Plain frame with the original columns, ISO date strings and constants filled back in."""
+    meta = df.attrs.get(_META)
+    if not meta:
+        return df
+    out = {}
+    for column in meta["columns"]:
+        if column in meta["constants"]:
+            out[column] = pd.Series(meta["constants"][column], index=df.index, dtype=object)
+        elif column in meta["dates"]:
+            out[column] = df[column].dt.strftime("%Y-%m-%d")
+        elif isinstance(df[column].dtype, pd.CategoricalDtype):
+            out[column] = df[column].astype(object)
+        else:
+            out[column] = df[column]
+    return pd.DataFrame(out, index=df.index)
+
+
+def memory_mb(df):
+    """Deep memory usage of ``df`` in MB."""
+    return df.memory_usage(deep=True).sum() / 1e6
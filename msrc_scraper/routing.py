@@ -0,0 +1,127 @@
+"""Context-level request interception that keeps CVE pages down to what the extractors read.
+
+The MSRC Update Guide is a React SPA: the document, its scripts and the
+api.msrc.microsoft.com XHRs are needed, while images, fonts, stylesheets
+and the analytics/telemetry beacons are not.
+"""
+import json
+import os
+from fnmatch import fnmatch
+
+from msrc_scraper.cache import default_cache_dir
+
+default_block_types = ("image", "media", "font", "stylesheet")
+
+default_block_urls = (
+    "*://*.clarity.ms/*",
+    "*://js.monitor.azure.com/*",
+    "*://*.events.data.microsoft.com/*",
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.doubleclick.net/*",
+    "*://mem.gfx.ms/*",
+    "*://wcpstatic.microsoft.com/*",
+    "*/telemetry*",
+    "*/analytics*",
+)
+
+# Never block these, whatever the rules above say
+default_allow_urls = (
+    "*://api.msrc.microsoft.com/*",
+)
+
+# Rough transfer sizes used when a blocked URL has never been seen unblocked
+default_type_sizes = {
+    "image": 20000,
+    "media": 200000,
+    "font": 60000,
+    "stylesheet": 30000,
+    "script": 80000,
+}
+
+
+class RoutePolicy:
+    """Allow/deny rules by resource type and URL glob. Allow rules win."""
+
+    def __init__(self, block_types=default_block_types, block_urls=default_block_urls,
+                 allow_urls=default_allow_urls):
+        self.block_types = set(block_types)
+        self.block_urls = list(block_urls)
+        self.allow_urls = list(allow_urls)
+
+    def should_block(self, url, resource_type):
+        if any(fnmatch(url, pattern) for pattern in self.allow_urls):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return any(fnmatch(url, pattern) for pattern in self.block_urls)
+
+
+class ResourceBlocker:
+    """Installs a RoutePolicy on a browser context and counts what it avoided.
+
+    Blocked requests are never downloaded, so their size comes from a table
+    of sizes learned on unblocked runs (``--no-block``), falling back to a
+    per-type estimate.
+    """
+
+    def __init__(self, policy=None, sizes_file=None):
+        self.policy = policy
+        self.sizes_file = sizes_file or os.path.join(default_cache_dir, "resource_sizes.json")
+        self.sizes = {}
+        if os.path.exists(self.sizes_file):
+            try:
+                with open(self.sizes_file, encoding="utf-8") as f:
+                    self.sizes = json.load(f)
+            except (OSError, ValueError):
+                self.sizes = {}
+        self.blocked_requests = 0
+        self.blocked_bytes = 0
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    async def install(self, context):
+        if self.policy is not None:
+            await context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+
+    async def _handle(self, route):
+        request = route.request
+        if self.policy.should_block(request.url, request.resource_type):
+            self.blocked_requests += 1
+            self.blocked_bytes += self.sizes.get(
+                request.url, default_type_sizes.get(request.resource_type, 0)
+            )
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    def _on_response(self, response):
+        self.allowed_requests += 1
+        size = response.headers.get("content-length")
+        if size and size.isdigit():
+            self.allowed_bytes += int(size)
+            if self.policy is None:
+                self.sizes[response.url] = int(size)
+
+    def report(self):
+        if self.policy is None:
+            os.makedirs(os.path.dirname(self.sizes_file), exist_ok=True)
+            with open(self.sizes_file, "w", encoding="utf-8") as f:
+                json.dump(self.sizes, f)
+            print(f"Routing: blocking off, {self.allowed_requests} requests,"
+                  f" {self.allowed_bytes / 1e6:.1f} MB (sizes saved for estimates)")
+            return
+        print(f"Routing: blocked {self.blocked_requests} requests, ~{self.blocked_bytes / 1e6:.1f} MB avoided;"
+              f" allowed {self.allowed_requests} requests, {self.allowed_bytes / 1e6:.1f} MB")
+
+
+def policy_from_args(args):
+    if args.no_block:
+        return None
+    block_types = [t.strip() for t in args.block_types.split(",") if t.strip()]
+    return RoutePolicy(
+        block_types=block_types,
+        block_urls=list(default_block_urls) + args.block_url,
+        allow_urls=list(default_allow_urls) + args.allow_url,
+    )
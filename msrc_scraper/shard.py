@@ -0,0 +1,135 @@
+"""Sharded browser enrichment over several worker processes.
+
+One event loop driving one Chromium leaves most cores idle. ``ShardedBackend``
+stripes the CVE list over N spawned worker processes; each launches its own
+browser and runs a PagePool over its shard. Results stream back to the parent
+over a queue as they complete (so the parent can journal them) and are merged
+back into input order at the end. A shard that crashes is restarted once with
+whatever it hadn't finished; the other shards carry on regardless.
+"""
+import asyncio
+import multiprocessing
+import queue as queue_module
+
+from msrc_scraper.api import is_useful
+from msrc_scraper.metrics import metrics
+from msrc_scraper import readiness, snapshots
+
+
+async def _shard_main(shard, fetch, cves, concurrency, contexts, blocker, results):
+    from playwright.async_api import async_playwright
+
+    from msrc_scraper.pool import PagePool
+
+    def on_result(cve, result):
+        results.put(("result", shard, cve, result))
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        async with PagePool(browser, max_concurrency=concurrency, contexts=contexts, blocker=blocker) as pool:
+            await pool.map(fetch, cves, on_result=on_result)
+        await browser.close()
+    if blocker:
+        blocker.report()
+
+
+def _run_shard(shard, fetch, cves, concurrency, contexts, blocker, results):
+    """Worker process entry point."""
+    try:
+        asyncio.run(_shard_main(shard, fetch, cves, concurrency, contexts, blocker, results))
+    except BaseException as e:
+        results.put(("error", shard, f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}"))
+        raise
+    finally:
+        snapshots.close(prune=False)
+    results.put(("done", shard, metrics.state(), readiness.stats.state()))
+
+
+class ShardedBackend:
+    """Enrichment backend that runs ``fetch(page, cve)`` in ``shards`` browser processes.
+
+    ``fetch`` must be importable by the workers, i.e. a module-level function.
+    ``concurrency`` and ``contexts`` apply per shard.
+    """
+
+    name = "sharded"
+
+    def __init__(self, fetch, shards=2, concurrency=8, contexts=1, blocker=None, restarts=1):
+        self.fetch = fetch
+        self.shards = max(1, shards)
+        self.concurrency = concurrency
+        self.contexts = contexts
+        self.blocker = blocker
+        self.restarts = restarts
+
+    def _start(self, context, results, shard, cves):
+        process = context.Process(target=_run_shard, name=f"msrc-shard-{shard}", daemon=True,
+                                  args=(shard, self.fetch, cves, self.concurrency, self.contexts, self.blocker,
+                                        results))
+        process.start()
+        return process
+
+    async def enrich(self, cves, release_dates=None, checkpoint=None):
+        # spawn, not fork: forking from inside a running event loop leaves the child unusable
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        cves = list(dict.fromkeys(cves))
+        assigned = {shard: cves[shard::self.shards] for shard in range(self.shards) if cves[shard::self.shards]}
+        processes = {shard: self._start(context, results, shard, chunk) for shard, chunk in assigned.items()}
+        restarts = dict.fromkeys(assigned, 0)
+        found = {}
+        print(f"Sharded: {len(cves)} CVEs over {len(processes)} worker processes")
+
+        def handle(message):
+            kind, shard = message[0], message[1]
+            if kind == "result":
+                cve, result = message[2], message[3]
+                found[cve] = result
+                if checkpoint is not None and is_useful(result):
+                    checkpoint(cve, result)
+            elif kind == "done":
+                metrics.merge(message[2])
+                readiness.stats.merge(message[3])
+                process = processes.pop(shard, None)
+                if process is not None:
+                    process.join()
+            elif kind == "error":
+                print(f"Shard {shard} failed: {message[2]}")
+
+        loop = asyncio.get_running_loop()
+        while processes:
+            try:
+                message = await loop.run_in_executor(None, results.get, True, 0.5)
+            except queue_module.Empty:
+                message = None
+            if message is not None:
+                handle(message)
+                continue
+
+            for shard, process in list(processes.items()):
+                if process.is_alive() or process.exitcode == 0:
+                    continue
+                # Crashed (or killed) without reporting back. Results it sent just before dying can still be in
+                # the queue, take them first so they aren't fetched again
+                while True:
+                    try:
+                        handle(results.get_nowait())
+                    except queue_module.Empty:
+                        break
+                if shard not in processes:
+                    continue
+                processes.pop(shard)
+                metrics.failure("shard_crash")
+                remaining = [cve for cve in assigned[shard] if cve not in found]
+                if remaining and restarts[shard] < self.restarts:
+                    restarts[shard] += 1
+                    metrics.retry("shard_crash")
+                    print(f"Shard {shard} exited with {process.exitcode}, restarting it for {len(remaining)} CVEs")
+                    assigned[shard] = remaining
+                    processes[shard] = self._start(context, results, shard, remaining)
+                elif remaining:
+                    print(f"Shard {shard} exited with {process.exitcode}, giving up on {len(remaining)} CVEs")
+
+        print(f"Sharded: {sum(1 for r in found.values() if is_useful(r))}/{len(cves)} CVEs resolved")
+        # Ordered merge: input order, whichever shard produced each result
+        return {cve: found[cve] for cve in cves if cve in found and is_useful(found[cve])}
@@ -0,0 +1,136 @@
+"""Parquet sidecar cache for parsed inputs, plus non-Excel output targets.
+
+Parsing xlsx is the slowest way to move a table between two scripts. The
+first read of a workbook stores the projected columns as Parquet in the
+cache directory, keyed on the file's content hash; later reads of the same
+file (same size and mtime, or same hash after a touch) load the Parquet
+file instead.
+"""
+import hashlib
+import json
+import os
+
+from msrc_scraper.cache import default_cache_dir
+
+OUTPUT_FORMATS = ("xlsx", "parquet", "csv", "jsonl")
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SidecarCache:
+    def __init__(self, cache_dir=None):
+        self.dir = os.path.join(cache_dir or default_cache_dir, "sidecars")
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {}
+
+    def _key(self, path, columns):
+        stat = os.stat(path)
+        entry = self.manifest.get(os.path.abspath(path))
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            digest = entry["sha256"]
+        else:
+            digest = _file_hash(path)
+            self.manifest[os.path.abspath(path)] = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest}
+            self._save_manifest()
+        cols = hashlib.sha256("\0".join(columns).encode()).hexdigest()[:12]
+        return f"{digest}-{cols}"
+
+    def _save_manifest(self):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def read(self, path, columns, reader):
+        """Return ``reader(path, columns)``, served from the Parquet sidecar when it is current."""
+        import pandas as pd
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return reader(path, columns)
+
+        sidecar = os.path.join(self.dir, self._key(path, columns) + ".parquet")
+        if os.path.exists(sidecar):
+            print(f"Reading {os.path.basename(path)} from sidecar cache")
+            return pd.read_parquet(sidecar)
+        df = reader(path, columns)
+        os.makedirs(self.dir, exist_ok=True)
+        # Mixed-type object columns (e.g. a stray number in Details) don't round-trip through Arrow
+        df.astype({c: "string" for c in df.columns if df[c].dtype == object}).to_parquet(sidecar + ".tmp", index=False)
+        os.replace(sidecar + ".tmp", sidecar)
+        return df
+
+
+def read_columns_cached(path, columns, cache_dir=None, prefer_parquet=False):
+    """Columns of a workbook, or of a Parquet/CSV/JSONL file written by write_outputs.
+
+    With ``prefer_parquet`` an .xlsx path is swapped for a sibling .parquet
+    file written at the same time or later (``--formats xlsx,parquet``).
+    """
+    import pandas as pd
+
+    from msrc_scraper.reader import read_columns
+
+    root, ext = os.path.splitext(path)
+    ext = ext.lower()
+    sibling = root + ".parquet"
+    if prefer_parquet and ext == ".xlsx" and os.path.exists(sibling) \
+            and os.path.getmtime(sibling) >= os.path.getmtime(path):
+        print(f"Reading {os.path.basename(sibling)} instead of {os.path.basename(path)}")
+        path, ext = sibling, ".parquet"
+    if ext == ".parquet":
+        df = pd.read_parquet(path, columns=columns)
+        return df.astype(object).where(df.notna(), None)
+    if ext == ".csv":
+        return pd.read_csv(path, usecols=columns, dtype=str)
+    if ext == ".jsonl":
+        return pd.read_json(path, lines=True, dtype=False)[columns]
+    df = SidecarCache(cache_dir).read(path, columns, read_columns)
+    # Back to plain object columns with None for blanks, like read_columns gives
+    return df.astype(object).where(df.notna(), None)
+
+
+def write_outputs(df, output_file, formats=("xlsx",)):
+    """Write ``df`` next to ``output_file`` in every requested format; returns the paths."""
+    from msrc_scraper.results import expand
+    from msrc_scraper.writer import write_with_links
+
+    df = expand(df)
+    root, _ = os.path.splitext(output_file)
+    paths = []
+    for fmt in formats:
+        path = f"{root}.{fmt}"
+        if fmt == "xlsx":
+            write_with_links(df, path)
+        elif fmt == "parquet":
+            df.astype({c: "string" for c in df.columns if df[c].dtype == object}).to_parquet(path, index=False)
+        elif fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "jsonl":
+            df.to_json(path, orient="records", lines=True, force_ascii=False)
+        else:
+            raise ValueError(f"Unknown output format {fmt!r}, expected one of {OUTPUT_FORMATS}")
+        paths.append(path)
+    return paths
+
+
+def formats_from_args(args):
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        raise SystemExit(f"Unknown output format(s): {', '.join(unknown)}")
+    return formats
@@ -0,0 +1,350 @@
+"""Content-addressed store of rendered CVE pages and MSRC API responses.
+
+Every CVE page the scrapers read is saved as the rendered HTML, and every
+CVRF document the API backend loads as its JSON. Blobs are compressed
+(zstd when the ``zstandard`` package is installed, gzip otherwise) and
+named by the SHA-256 of their content, so a page that hasn't changed since
+the last run costs nothing. An SQLite index maps (kind, key) to the blobs
+with the time they were seen.
+
+When MSRC changes its markup, fix ``extract.extract_html`` and run
+
+    msrc-scraper snapshots reextract --update-cache
+
+to re-extract every stored page without a browser and refresh the CVE
+cache from it. ``show CVE-2026-21001`` prints a stored page, ``stats``
+summarises the store, ``prune`` applies the retention below right away.
+``--no-snapshots`` (or MSRC_SNAPSHOTS=0) turns saving off.
+
+Rendered pages rarely repeat byte for byte, so at the end of every run the
+store keeps the newest ``--snapshot-keep`` snapshots of each page or
+document and drops anything older than ``--snapshot-days``, like the CVE
+cache evicts old entries.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from msrc_scraper.cache import DAY, default_cache_dir
+
+# ---- CONFIG ----
+default_snapshot_dir = os.path.join(default_cache_dir, "snapshots")
+default_keep = 3
+default_max_age = 90 * DAY
+
+# Environment, not a module flag, so spawned shard workers see --no-snapshots too
+enabled = os.environ.get("MSRC_SNAPSHOTS", "1") != "0"
+keep = default_keep
+max_age = default_max_age
+
+
+def _compress(data):
+    try:
+        import zstandard
+    except ImportError:
+        return gzip.compress(data, compresslevel=6), ".gz"
+    return zstandard.ZstdCompressor(level=10).compress(data), ".zst"
+
+
+def _decompress(data, ext):
+    if ext == ".gz":
+        return gzip.decompress(data)
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("this snapshot is zstd compressed, pip install zstandard to read it")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class SnapshotStore:
+    def __init__(self, root=None):
+        self.root = root or default_snapshot_dir
+        self.objects = os.path.join(self.root, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        # Shard workers write to the same index. Pages are stored from a writer thread (capture_page),
+        # everything else from the caller's, one at a time
+        self.conn = sqlite3.connect(os.path.join(self.root, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot ("
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " ext TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (kind, key, sha256))"
+        )
+        self.conn.commit()
+        self.written = 0
+        self.deduplicated = 0
+
+    def _path(self, digest, ext):
+        return os.path.join(self.objects, digest[:2], digest + ext)
+
+    def put(self, kind, key, data):
+        """Store ``data`` (str or bytes) as the latest ``kind`` snapshot of ``key``. Returns its hash."""
+        with self.lock:
+            return self._put(kind, key, data)
+
+    def _put(self, kind, key, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        row = self.conn.execute("SELECT ext, stored FROM snapshot WHERE sha256 = ? LIMIT 1", (digest,)).fetchone()
+        if row and os.path.exists(self._path(digest, row[0])):
+            ext, stored = row
+            self.deduplicated += 1
+        else:
+            blob, ext = _compress(data)
+            stored = len(blob)
+            path = self._path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            self.written += 1
+        self.conn.execute(
+            "INSERT INTO snapshot (kind, key, sha256, ext, size, stored, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(kind, key, sha256) DO UPDATE SET fetched_at = excluded.fetched_at",
+            (kind, key, digest, ext, len(data), stored, time.time()),
+        )
+        self.conn.commit()
+        return digest
+
+    def put_json(self, kind, key, value):
+        return self.put(kind, key, json.dumps(value, ensure_ascii=False))
+
+    def read(self, digest, ext):
+        with open(self._path(digest, ext), "rb") as f:
+            return _decompress(f.read(), ext)
+
+    def latest(self, kind, keys=None):
+        """Yield (key, sha256, ext, fetched_at) of the newest snapshot of every ``kind`` key, or of ``keys``."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, sha256, ext, MAX(fetched_at) FROM snapshot WHERE kind = ? GROUP BY key ORDER BY key",
+                (kind,)).fetchall()
+        wanted = set(keys) if keys else None
+        for key, digest, ext, fetched_at in rows:
+            if wanted is None or key in wanted:
+                yield key, digest, ext, fetched_at
+
+    def get(self, kind, key):
+        """Content of the newest ``kind`` snapshot of ``key`` as bytes, or None."""
+        for _, digest, ext, _ in self.latest(kind, [key]):
+            return self.read(digest, ext)
+        return None
+
+    def prune(self, keep=default_keep, max_age=default_max_age):
+        """Keep the newest ``keep`` snapshots of every (kind, key) and none older than ``max_age`` seconds,
+        then delete the blobs nothing refers to any more. Returns the number of snapshots dropped."""
+        with self.lock:
+            doomed = self.conn.execute(
+                "SELECT rowid, sha256, ext FROM (SELECT rowid, sha256, ext, fetched_at, ROW_NUMBER() OVER"
+                " (PARTITION BY kind, key ORDER BY fetched_at DESC) AS n FROM snapshot)"
+                " WHERE n > ? OR fetched_at < ?", (max(1, keep), time.time() - max_age)).fetchall()
+            if not doomed:
+                return 0
+            self.conn.executemany("DELETE FROM snapshot WHERE rowid = ?", [(rowid,) for rowid, _, _ in doomed])
+            self.conn.commit()
+            for digest, ext in {(digest, ext) for _, digest, ext in doomed}:
+                if self.conn.execute("SELECT 1 FROM snapshot WHERE sha256 = ? LIMIT 1", (digest,)).fetchone():
+                    continue
+                try:
+                    os.remove(self._path(digest, ext))
+                except OSError:
+                    pass
+        return len(doomed)
+
+    def stats(self):
+        with self.lock:
+            return self._stats()
+
+    def _stats(self):
+        kinds = self.conn.execute(
+            "SELECT kind, COUNT(DISTINCT key), COUNT(*) FROM snapshot GROUP BY kind ORDER BY kind").fetchall()
+        blobs, raw, stored = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored), 0)"
+            " FROM (SELECT DISTINCT sha256, size, stored FROM snapshot)").fetchone()
+        referenced = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM snapshot").fetchone()[0]
+        return {"kinds": {kind: {"keys": keys, "snapshots": n} for kind, keys, n in kinds},
+                "blobs": blobs, "raw_bytes": raw, "stored_bytes": stored, "referenced_bytes": referenced}
+
+    def close(self):
+        self.conn.close()
+
+
+_store = None
+# Compressing and committing a page takes a few milliseconds, too long for the event loop
+_writer = None
+
+
+def store():
+    """Process-wide store, opened on first use."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore()
+    return _store
+
+
+def close(prune=True):
+    """Wait for queued pages, prune the store (see the module docstring) and close it. Call once at the end of a run;
+    shard workers pass ``prune=False`` and leave pruning to the parent."""
+    global _store, _writer
+    if _writer is not None:
+        _writer.shutdown()
+        _writer = None
+    index = os.path.join(default_snapshot_dir, "index.sqlite3")
+    if prune and enabled and (_store is not None or os.path.exists(index)):
+        dropped = store().prune(keep, max_age)
+        if dropped:
+            print(f"Snapshots: dropped {dropped} old snapshots")
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def _put_page(cve, html):
+    try:
+        store().put("page", cve, html)
+    except Exception as e:
+        print(f"Could not snapshot {cve}: {e}")
+
+
+async def capture_page(page, cve):
+    """Queue the rendered HTML of ``page`` to be saved as the page snapshot of ``cve``.
+
+    Returns whether it was queued; ``close`` waits for the queued pages.
+    """
+    global _writer
+    if not enabled:
+        return False
+    try:
+        html = await page.content()
+    except Exception as e:
+        print(f"Could not snapshot {cve}: {e}")
+        return False
+    if _writer is None:
+        _writer = ThreadPoolExecutor(1)
+    _writer.submit(_put_page, cve, html)
+    return True
+
+
+def capture_json(kind, key, value):
+    if not enabled:
+        return None
+    try:
+        return store().put_json(kind, key, value)
+    except Exception as e:
+        print(f"Could not snapshot {kind} {key}: {e}")
+        return None
+
+
+def snapshots_from_args(args):
+    global enabled, keep, max_age
+    keep = args.snapshot_keep
+    max_age = args.snapshot_days * DAY
+    if args.no_snapshots:
+        enabled = False
+        os.environ["MSRC_SNAPSHOTS"] = "0"
+
+
+# ---- OFFLINE RE-EXTRACTION ----
+def _extract_page(item):
+    from msrc_scraper.extract import extract_html
+
+    root, key, digest, ext, fetched_at = item
+    with open(os.path.join(root, "objects", digest[:2], digest + ext), "rb") as f:
+        html = _decompress(f.read(), ext).decode("utf-8", errors="replace")
+    return key, {**extract_html(html), "fetched_at": fetched_at}
+
+
+def reextract(snapshot_store, cves=None, jobs=None):
+    """{cve: record} from the newest page snapshot of every (or every given) CVE, over ``jobs`` processes.
+
+    Each record carries the ``fetched_at`` time of the snapshot it came from.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    items = [(snapshot_store.root, *latest) for latest in snapshot_store.latest("page", cves)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) < 50:
+        return dict(map(_extract_page, items))
+    with ProcessPoolExecutor(jobs) as pool:
+        return dict(pool.map(_extract_page, items, chunksize=max(1, len(items) // (jobs * 4))))
+
+
+def reextract_cvrf(snapshot_store):
+    """{cve: record} from the newest snapshot of every stored CVRF document."""
+    from msrc_scraper.api import parse_cvrf
+
+    records = {}
+    for _, digest, ext, fetched_at in sorted(snapshot_store.latest("cvrf"), key=lambda latest: latest[3]):
+        # Newer documents win for CVEs that appear in several
+        records.update({cve: {**record, "fetched_at": fetched_at}
+                        for cve, record in parse_cvrf(json.loads(snapshot_store.read(digest, ext))).items()})
+    return records
+
+
+def run(args):
+    """The ``snapshots`` subcommand of msrc_scraper.cli."""
+    snapshot_store = SnapshotStore(args.dir)
+    if args.action == "show":
+        data = snapshot_store.get(args.kind, args.key)
+        if data is None:
+            raise SystemExit(f"No {args.kind} snapshot of {args.key}")
+        print(data.decode("utf-8", errors="replace"))
+    elif args.action == "stats":
+        stats = snapshot_store.stats()
+        for kind, counts in stats["kinds"].items():
+            print(f"{kind}: {counts['keys']} keys, {counts['snapshots']} snapshots")
+        ratio = stats["raw_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0
+        dedup = stats["referenced_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 0
+        print(f"{stats['blobs']} blobs, {stats['raw_bytes'] / 1e6:.1f} MB raw, {stats['stored_bytes'] / 1e6:.1f} MB"
+              f" on disk ({ratio:.1f}x compression, {dedup:.1f}x from deduplication)")
+    elif args.action == "prune":
+        print(f"Dropped {snapshot_store.prune(args.keep, args.days * DAY)} snapshots")
+    else:
+        start = time.perf_counter()
+        if args.source == "page":
+            records = reextract(snapshot_store, args.cves or None, args.jobs)
+        else:
+            records = reextract_cvrf(snapshot_store)
+            if args.cves:
+                records = {cve: records[cve] for cve in args.cves if cve in records}
+        elapsed = time.perf_counter() - start
+        resolved = {field: sum(1 for r in records.values() if r.get(field, "Unknown") != "Unknown")
+                    for field in ("title", "exploitability")}
+        print(f"Re-extracted {len(records)} {args.source} snapshots in {elapsed:.2f}s:"
+              f" {resolved['title']} titles, {resolved['exploitability']} exploitability assessments")
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                for cve, record in records.items():
+                    f.write(json.dumps({"cve": cve, **record}, ensure_ascii=False) + "\n")
+            print(f"Records written to {args.out}")
+        if args.update_cache:
+            from msrc_scraper.cache import CveCache
+
+            cache = CveCache(cache_dir=args.cache_dir)
+            for cve, record in records.items():
+                # Dated as the snapshot, so the exploitability TTL still applies and newer cache entries win
+                cache.put(cve, fetched_at=record["fetched_at"], title=record["title"],
+                          exploitability=record["exploitability"])
+            cache.close()
+    snapshot_store.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from msrc_scraper.cli import main
+
+    raise SystemExit(main(["snapshots", *sys.argv[1:]]))
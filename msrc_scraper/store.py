@@ -0,0 +1,375 @@
+"""Indexed SQLite store of every enriched row the scripts produce.
+
+Each run adds its rows (CVE, release date, affected product, KB article,
+title, exploitability, severity, impact) to ``results.sqlite3`` next to the
+CVE cache, keyed on CVE x product x KB, with the dates the row was first and
+last seen. Release date, product and exploitability are indexed and titles
+are full-text indexed, so questions like
+
+    msrc-scraper store query --product "Windows Server 2016*" --days 90 --exploitability Detected
+
+are answered in milliseconds without a browser or re-reading any workbook.
+``--out subset.xlsx`` (or .csv / .jsonl) exports the matches and
+``import`` loads workbooks written before the store existed.
+"""
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+from msrc_scraper.cache import MISSING, default_cache_dir
+from msrc_scraper.extract import EXPLOITABILITY_LEVELS
+
+# ---- CONFIG ----
+default_store_path = os.path.join(default_cache_dir, "results.sqlite3")
+
+FIELDS = ("cve", "release_date", "product", "kb", "title", "exploitability", "severity", "impact")
+# Per-CVE values; the rest describe the row
+CVE_FIELDS = ("release_date", "title", "exploitability", "severity", "impact")
+# Kept as FTS5 operators in --title searches (upper case, like FTS5 itself wants them)
+FTS_OPERATORS = ("AND", "OR", "NOT")
+EXPORT_COLUMNS = ["Details", "Release date", "Product", "Title", "Exploitability assessment", "Max Severity",
+                  "Impact", "Article", "First seen", "Last seen"]
+
+
+def iso_date(value):
+    """YYYY-MM-DD for a date, datetime or MSRC date string ("Feb 10, 2026"), None when it can't be parsed."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if not value:
+        return None
+    value = str(value).strip()
+    for text, fmt in ((value, "%b %d, %Y"), (value, "%B %d, %Y"), (value, "%m/%d/%Y"), (value[:10], "%Y-%m-%d")):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _value(value):
+    if value in MISSING or (isinstance(value, float) and value != value):
+        return None
+    return str(value)
+
+
+def _like(pattern):
+    """fnmatch-style pattern (* and ?) as a LIKE pattern."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def _fts_query(text):
+    """Search text as an FTS5 query: every word quoted (so "Hyper-V" or ".NET" aren't read as syntax),
+    AND / OR / NOT between two words kept as operators, a trailing * still matches as a prefix."""
+    words = text.split()
+    terms = []
+    for i, word in enumerate(words):
+        if word in FTS_OPERATORS and terms and terms[-1] not in FTS_OPERATORS and i < len(words) - 1:
+            terms.append(word)
+            continue
+        prefix = word.endswith("*") and word.rstrip("*")
+        word = word.rstrip("*") or word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class ResultStore:
+    def __init__(self, path=None):
+        self.path = path or default_store_path
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS result ("
+            " cve TEXT NOT NULL,"
+            " product TEXT NOT NULL COLLATE NOCASE,"
+            " kb TEXT NOT NULL,"
+            " release_date TEXT,"
+            " title TEXT,"
+            " exploitability TEXT,"
+            " severity TEXT,"
+            " impact TEXT,"
+            " source TEXT,"
+            " first_seen TEXT NOT NULL,"
+            " last_seen TEXT NOT NULL,"
+            " PRIMARY KEY (cve, product, kb))"
+        )
+        for column in ("release_date", "product", "exploitability"):
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS result_{column} ON result ({column})")
+        self.fts = self._create_fts()
+        self.conn.commit()
+        self.added = 0
+
+    def _create_fts(self):
+        try:
+            self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS result_fts"
+                              " USING fts5(title, content='result', content_rowid='rowid')")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, title searches fall back to LIKE
+            return False
+        self.conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS result_fts_insert AFTER INSERT ON result BEGIN
+                INSERT INTO result_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS result_fts_delete AFTER DELETE ON result BEGIN
+                INSERT INTO result_fts (result_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS result_fts_update AFTER UPDATE OF title ON result BEGIN
+                INSERT INTO result_fts (result_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+                INSERT INTO result_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+        """)
+        return True
+
+    def add(self, rows, source=""):
+        """Upsert rows (dicts with any of FIELDS). Missing values never overwrite stored ones. Returns the count."""
+        today = date.today().isoformat()
+        values = []
+        fresh = {}
+        for row in rows:
+            cve = _value(row.get("cve"))
+            if cve is None:
+                continue
+            value = (cve, _value(row.get("product")) or "", _value(row.get("kb")) or "",
+                     iso_date(row.get("release_date")), _value(row.get("title")),
+                     _value(row.get("exploitability")), _value(row.get("severity")),
+                     _value(row.get("impact")), source, today, today)
+            values.append(value)
+            known = fresh.setdefault(cve, {})
+            for field, v in zip(CVE_FIELDS, value[3:8]):
+                if v is not None:
+                    known[field] = v
+        self.conn.executemany(
+            "INSERT INTO result (cve, product, kb, release_date, title, exploitability, severity, impact, source,"
+            " first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (cve, product, kb) DO UPDATE SET"
+            " release_date = COALESCE(excluded.release_date, release_date),"
+            " title = COALESCE(excluded.title, title),"
+            " exploitability = COALESCE(excluded.exploitability, exploitability),"
+            " severity = COALESCE(excluded.severity, severity),"
+            " impact = COALESCE(excluded.impact, impact),"
+            " source = excluded.source,"
+            " last_seen = excluded.last_seen",
+            values,
+        )
+        self._merge(fresh)
+        self.conn.commit()
+        self.added += len(values)
+        return len(values)
+
+    def _merge(self, fresh):
+        """Keep per-CVE fields the same on every row of a CVE: the values just seen win, gaps are filled
+        from the other rows, and a product-less row goes once the CVE has real ones."""
+        for cve, fields in fresh.items():
+            if fields:
+                assignments = ", ".join(f"{f} = ?" for f in fields)
+                self.conn.execute(f"UPDATE result SET {assignments} WHERE cve = ?", (*fields.values(), cve))
+        cves = list(fresh)
+        for start in range(0, len(cves), 500):
+            batch = cves[start:start + 500]
+            marks = ", ".join("?" for _ in batch)
+            for field in CVE_FIELDS:
+                self.conn.execute(
+                    f"UPDATE result SET {field} = (SELECT r.{field} FROM result r WHERE r.cve = result.cve"
+                    f" AND r.{field} IS NOT NULL ORDER BY r.last_seen DESC LIMIT 1)"
+                    f" WHERE {field} IS NULL AND cve IN ({marks})", batch)
+            self.conn.execute(
+                f"DELETE FROM result WHERE product = '' AND kb = '' AND cve IN ({marks})"
+                " AND EXISTS (SELECT 1 FROM result r WHERE r.cve = result.cve AND r.product != '')", batch)
+
+    def update(self, records, source=""):
+        """Set per-CVE fields ({cve: {title, exploitability, ...}}) on every stored row of each CVE.
+
+        CVEs the store hasn't seen yet get a row without product or KB until a run that knows them adds some.
+        """
+        return self.add(({"cve": cve, **{f: v for f, v in record.items() if f in CVE_FIELDS}}
+                         for cve, record in records.items()), source)
+
+    def query(self, product=None, since=None, until=None, days=None, exploitability=(), min_exploitability=None,
+              title=None, cves=(), limit=None):
+        """Matching rows, one per CVE x product (KB articles joined), newest release first."""
+        where, params = [], []
+        if product:
+            where.append("r.product LIKE ? ESCAPE '\\'")
+            params.append(_like(product))
+        if days is not None:
+            since = max(since or "", (date.today() - timedelta(days=days)).isoformat())
+        if since:
+            where.append("r.release_date >= ?")
+            params.append(iso_date(since) or since)
+        if until:
+            where.append("r.release_date <= ?")
+            params.append(iso_date(until) or until)
+        if exploitability:
+            where.append("(" + " OR ".join("r.exploitability LIKE ?" for _ in exploitability) + ")")
+            params += [f"%{value}%" for value in exploitability]
+        if min_exploitability:
+            levels = [level for level in EXPLOITABILITY_LEVELS if min_exploitability.lower() in level.lower()]
+            if not levels:
+                raise ValueError(f"Unknown exploitability level {min_exploitability!r},"
+                                 f" expected one of {', '.join(EXPLOITABILITY_LEVELS)}")
+            at_least = EXPLOITABILITY_LEVELS[EXPLOITABILITY_LEVELS.index(levels[0]):]
+            where.append(f"r.exploitability IN ({', '.join('?' for _ in at_least)})")
+            params += at_least
+        if cves:
+            where.append(f"r.cve IN ({', '.join('?' for _ in cves)})")
+            params += list(cves)
+        if title and title.strip():
+            if self.fts:
+                where.append("r.rowid IN (SELECT rowid FROM result_fts WHERE result_fts MATCH ?)")
+                params.append(_fts_query(title))
+            else:
+                where.append("r.title LIKE ?")
+                params.append(f"%{title}%")
+        sql = ("SELECT r.cve, r.release_date, r.product, r.title, r.exploitability, r.severity, r.impact,"
+               " GROUP_CONCAT(NULLIF(r.kb, ''), ', ') AS kb, MIN(r.first_seen) AS first_seen,"
+               " MAX(r.last_seen) AS last_seen FROM result r")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY r.cve, r.product ORDER BY r.release_date DESC, r.cve DESC, r.product"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def signals(self, cves):
+        """{cve: {release_date, title, exploitability, severity, impact}} for the given CVEs seen before."""
+        cves = list(cves)
+        known = {}
+        for start in range(0, len(cves), 500):
+            batch = cves[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT cve, {', '.join(f'MAX({f}) AS {f}' for f in CVE_FIELDS)} FROM result"
+                f" WHERE cve IN ({', '.join('?' for _ in batch)}) GROUP BY cve", batch)
+            known.update((row["cve"], dict(row)) for row in rows)
+        return known
+
+    def stats(self):
+        rows, cves, products, newest = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT cve), COUNT(DISTINCT product), MAX(release_date) FROM result").fetchone()
+        return {"rows": rows, "cves": cves, "products": products, "newest_release": newest}
+
+    def close(self):
+        self.conn.close()
+        if self.added:
+            print(f"Result store: {self.added} rows recorded ({self.path})")
+
+
+def export(rows, path):
+    """Write query results to .xlsx (with CVE links), .csv or .jsonl."""
+    table = [(r["cve"], r["release_date"], r["product"], r["title"], r["exploitability"], r["severity"], r["impact"],
+              r["kb"], r["first_seen"], r["last_seen"]) for r in rows]
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xlsx":
+        from msrc_scraper.writer import LinkedSheetWriter
+
+        with LinkedSheetWriter(path, EXPORT_COLUMNS) as writer:
+            writer.write_rows(table)
+    elif ext == ".csv":
+        import csv
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(table)
+    elif ext == ".jsonl":
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            for row in table:
+                f.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n")
+    else:
+        raise SystemExit(f"Don't know how to export to {path}, use .xlsx, .csv or .jsonl")
+
+
+# Header names per store field in MSRC exports and the workbooks the scripts write. The grid
+# scraper's workbooks put the CVE under "Article" and the KB under "KB Article".
+IMPORT_COLUMNS = {
+    "cve": ("Details", "Article"),
+    "release_date": ("Release date", "Date"),
+    "title": ("Title",),
+    "exploitability": ("Exploitability assessment", "Exploitability"),
+    "severity": ("Max Severity",),
+    "impact": ("Impact",),
+    "kb": ("KB Article",),
+}
+
+
+def import_workbook(result_store, path):
+    """Add the rows of a workbook written by one of the scripts. Returns the count."""
+    from msrc_scraper.reader import _open_sheet
+
+    workbook, worksheet = _open_sheet(path)
+    try:
+        rows = worksheet.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, None) or ()]
+        positions = {}
+        for field, names in IMPORT_COLUMNS.items():
+            for name in names:
+                if name in header:
+                    positions[field] = header.index(name)
+                    break
+        if "Details" in header and "Article" in header:
+            positions["kb"] = header.index("Article")
+        if "Product" in header:
+            # main_final.py's filtered_updates.xlsx has the title under "Product"; exports and the
+            # grid scraper's workbooks have the affected product there
+            affected = "Title" in header or "Platform" in header
+            positions["product" if affected else "title"] = header.index("Product")
+        if "cve" not in positions:
+            raise SystemExit(f"No Details/Article column in {path}; header is {header}")
+        records = ({field: row[i] if i < len(row) else None for field, i in positions.items()} for row in rows if row)
+        return result_store.add(records, source=os.path.basename(path))
+    finally:
+        workbook.close()
+
+
+def store_from_args(args):
+    if args.no_store:
+        return None
+    return ResultStore(args.store)
+
+
+def _print_rows(rows, limit):
+    for row in rows[:limit]:
+        print(f"{row['cve']:<16} {row['release_date'] or '':<10}  {(row['exploitability'] or 'Unknown'):<24}"
+              f"  {row['product'][:40]:<40}  {row['title'] or 'Unknown'}")
+    if len(rows) > limit:
+        print(f"... {len(rows) - limit} more (pass --show or --out)")
+
+
+def run(args):
+    """The ``store`` subcommand of msrc_scraper.cli."""
+    result_store = ResultStore(args.store)
+    if args.action == "query":
+        start = time.perf_counter()
+        try:
+            rows = result_store.query(product=args.product, since=args.since, until=args.until, days=args.days,
+                                      exploitability=args.exploitability, min_exploitability=args.min_exploitability,
+                                      title=args.title, cves=args.cves, limit=args.limit)
+        except (ValueError, sqlite3.OperationalError) as e:
+            raise SystemExit(f"Bad query: {e}")
+        elapsed = (time.perf_counter() - start) * 1000
+        _print_rows(rows, args.show)
+        print(f"{len(rows)} rows in {elapsed:.1f} ms")
+        if args.out:
+            export(rows, args.out)
+            print(f"Exported to {args.out}")
+    elif args.action == "import":
+        for path in args.paths:
+            print(f"{path}: {import_workbook(result_store, path)} rows")
+    else:
+        stats = result_store.stats()
+        print(f"{stats['rows']} rows, {stats['cves']} CVEs, {stats['products']} products,"
+              f" newest release {stats['newest_release']} ({result_store.path})")
+    result_store.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from msrc_scraper.cli import main
+
+    raise SystemExit(main(["store", *sys.argv[1:]]))
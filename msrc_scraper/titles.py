@@ -0,0 +1,146 @@
+"""Tiered CVE title resolution: cache, then the MSRC RSS feed, then the browser.
+
+The RSS feed is fetched with ETag / Last-Modified conditional requests and
+parsed incrementally with iterparse. Every CVE it has ever listed is merged
+into a persisted map, so CVEs that have since dropped off the feed still
+resolve without a page load.
+"""
+import asyncio
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from msrc_scraper.cache import default_cache_dir
+from msrc_scraper.metrics import metrics
+
+rss_url = os.environ.get("MSRC_RSS_URL", "https://api.msrc.microsoft.com/update-guide/rss")
+
+
+def parse_rss(stream):
+    """Yield (cve, description) from an RSS stream without building the whole tree."""
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != "item":
+            continue
+        guid = elem.findtext("guid")
+        title = elem.findtext("title")
+        if guid and title:
+            # Remove CVE-xxxx-xxxx from the title to get only the description
+            if title.startswith(guid):
+                description = title[len(guid):].strip()
+            else:
+                description = title
+            yield guid, description
+        elem.clear()
+
+
+class RssTitleMap:
+    """CVE -> title map from the MSRC RSS feed, persisted and refreshed conditionally."""
+
+    def __init__(self, cache_dir=None, url=None):
+        self.dir = cache_dir or default_cache_dir
+        self.url = url or rss_url
+        self.map_path = os.path.join(self.dir, "rss_titles.json")
+        self.titles = {}
+        self.meta = {}
+        if os.path.exists(self.map_path):
+            try:
+                with open(self.map_path, encoding="utf-8") as f:
+                    saved = json.load(f)
+                self.titles = saved.get("titles", {})
+                self.meta = saved.get("meta", {})
+            except (OSError, ValueError):
+                pass
+
+    def refresh(self, timeout=10):
+        """Fetch the feed unless the server says it hasn't changed. Returns the map."""
+        headers = {"User-Agent": "msrc-scraper"}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        try:
+            with urlopen(Request(self.url, headers=headers), timeout=timeout) as resp:
+                added = 0
+                for cve, title in parse_rss(resp):
+                    added += cve not in self.titles
+                    self.titles[cve] = title
+                self.meta = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+            self._save()
+            print(f"RSS feed: {added} new titles, {len(self.titles)} known")
+        except HTTPError as e:
+            if e.code == 304:
+                print(f"RSS feed not modified, {len(self.titles)} titles known")
+            else:
+                print(f"Could not fetch RSS feed: {e}")
+        except (URLError, OSError, ET.ParseError) as e:
+            print(f"Could not fetch RSS feed: {e}")
+        return self.titles
+
+    def _save(self):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp = self.map_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"meta": self.meta, "titles": self.titles}, f)
+        os.replace(tmp, self.map_path)
+
+
+class TitleResolver:
+    """Resolve titles tier by tier, only passing each tier's misses to the next one.
+
+    ``browser`` is an optional ``async fn(cves) -> {cve: title}`` used for
+    whatever the cache and the RSS map don't cover.
+    """
+
+    def __init__(self, cache=None, rss=None, browser=None):
+        self.cache = cache
+        self.rss = rss
+        self.browser = browser
+        self.stats = {}
+
+    async def resolve(self, cves):
+        pending = list(dict.fromkeys(cves))
+        titles = {}
+        fetched = {}
+
+        def tier(name, found):
+            self.stats[name] = (len(found), len(pending))
+            metrics.cache(f"title_{name}", len(found), len(pending) - len(found))
+            titles.update(found)
+            return [cve for cve in pending if cve not in found]
+
+        if self.cache:
+            found = {}
+            for cve in pending:
+                title = self.cache.get(cve, "title")
+                if title is not None:
+                    found[cve] = title
+            pending = tier("cache", found)
+        if self.rss is not None and pending:
+            known = await asyncio.get_running_loop().run_in_executor(None, self.rss.refresh)
+            found = {cve: known[cve] for cve in pending if known.get(cve)}
+            fetched.update(found)
+            pending = tier("rss", found)
+        if self.browser is not None and pending:
+            found = {cve: t for cve, t in (await self.browser(pending)).items() if t and t != "Unknown"}
+            fetched.update(found)
+            pending = tier("browser", found)
+        if self.cache:
+            for cve, title in fetched.items():
+                self.cache.put(cve, title=title)
+        self.report()
+        return titles
+
+    def report(self):
+        parts = []
+        for name, (hits, asked) in self.stats.items():
+            ratio = hits / asked if asked else 0
+            parts.append(f"{name} {hits}/{asked} ({ratio:.0%})")
+        if parts:
+            print("Title tiers: " + ", ".join(parts))
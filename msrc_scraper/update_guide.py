@@ -0,0 +1,298 @@
+"""Scrape the MSRC Update Guide grid for one or more products.
+
+The ``grid-scrape`` subcommand of msrc_scraper.cli, formerly
+using__python/main.py. Each scan picks a product family and the products
+matching its patterns, reads every row (from the grid's JSON API, or by
+scrolling), looks up the CVE titles once across all scans and writes one
+workbook per scan or one sheet per scan.
+"""
+import asyncio
+import json
+import re
+from datetime import datetime
+from fnmatch import fnmatchcase
+
+from msrc_scraper.api import site_base
+from msrc_scraper.browser import open_browser, warm_context
+from msrc_scraper.dedup import CveGroups
+from msrc_scraper.grid import COLUMNS as GRID_COLUMNS, GridCapture
+from msrc_scraper.metrics import failure_kind, metrics, report_path_for
+from msrc_scraper import readiness
+from msrc_scraper.readiness import wait_for_title
+from msrc_scraper.snapshots import capture_page
+
+
+async def fetch_title(context, url):
+    try:
+        cve = url.rsplit("/", 1)[-1]
+        page = await context.new_page()
+        with metrics.step(cve, "goto"):
+            await page.goto(url, timeout=30000)
+        title = None
+        with metrics.step(cve, "ready"):
+            ready = await wait_for_title(page, timeout=10000)
+        with metrics.step(cve, "snapshot"):
+            await capture_page(page, cve)
+        if ready is not None:
+            with metrics.step(cve, "extract"):
+                title = await page.text_content("h1.ms-fontWeight-semibold")
+        else:
+            metrics.failure("empty_page")
+        await page.close()
+        return title.strip() if title else "Unknown"
+    except Exception as e:
+        metrics.failure(failure_kind(e))
+        print(f"Error fetching title for {url}: {e}")
+        return "Unknown"
+
+
+async def scroll_grid(page):
+    """Collect date/details from the rendered grid by scrolling it (slow, capped at 50 scrolls)."""
+    print("Extracting all data by scrolling...")
+    results_container = await page.query_selector('.ms-DetailsList-contentWrapper')
+    data = []
+    seen = set()
+    last_seen_count = 0
+    if results_container:
+        await results_container.evaluate("(el) => el.scrollTo(0, 0)")
+        for scroll_num in range(50):  # Adjust as needed for more rows
+            rows = await page.query_selector_all('div[role="rowgroup"] div[role="row"]')
+            print(f"Scroll {scroll_num}: Found {len(rows)} rows currently visible")
+
+            for row in rows:
+                cells = await row.query_selector_all('div[role="gridcell"]')
+                if len(cells) < 9:
+                    continue
+                date = await cells[0].inner_text()
+                details = await cells[8].inner_text()
+                key = f"{date.strip()}|{details.strip()}"
+                if key not in seen:
+                    seen.add(key)
+                    data.append({"date": date.strip(), "details": details.strip()})
+            if len(seen) == last_seen_count:
+                print("No new rows found, stopping scroll.")
+                break
+            last_seen_count = len(seen)
+            await results_container.evaluate("(el) => el.scrollBy(0, 1000)")
+            await page.wait_for_timeout(300)
+    else:
+        print("❌ Could not find scroll container for results")
+    return data
+
+
+# Windows Server 2016 plus the .NET Framework versions shipped for it
+DEFAULT_SCANS = [
+    {"name": "Windows Server 2016", "family": "Windows",
+     "products": ["Windows Server 2016", "Microsoft .NET Framework*"]},
+]
+
+
+def load_scans(products_file=None, products=(), family="Windows"):
+    """Scans from a JSON file ([{"name", "family", "products": [patterns]}]) and/or --product, else the default."""
+    scans = []
+    if products_file:
+        with open(products_file, encoding="utf-8") as f:
+            for scan in json.load(f):
+                patterns = scan.get("products") or [scan["name"]]
+                scans.append({"name": scan.get("name") or patterns[0], "family": scan.get("family", family),
+                              "products": patterns})
+    for product in products:
+        scans.append({"name": product, "family": family, "products": [product]})
+    return scans or DEFAULT_SCANS
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+async def select_filters(page, scan):
+    """Pick the scan's product family and every product whose menu text matches one of its patterns."""
+    print("Checking for cookie popup...")
+    buttons = await page.query_selector_all("button")
+    for btn in buttons:
+        text = (await btn.inner_text()).strip()
+        if text == "Accept":
+            await btn.click()
+            print("Cookie popup dismissed")
+            break
+
+    print(f"Selecting Product Family: {scan['family']}")
+    await page.click("text=Product Family")
+    await page.wait_for_selector(f"text={scan['family']}")
+    await page.click(f"text={scan['family']}")
+
+    print(f"Selecting Product: {', '.join(scan['products'])}")
+    await page.click("text=Product")
+    await page.wait_for_selector('span.ms-ContextualMenu-itemText')
+    items = await page.query_selector_all('span.ms-ContextualMenu-itemText')
+    for item in items:
+        text = (await item.inner_text()).strip()
+        if any(fnmatchcase(text, pattern) for pattern in scan["products"]):
+            print(f"✔️ Clicking: {text}")
+            await item.click()
+
+    await page.mouse.click(100, 100)  # Dismiss dropdown
+    await page.wait_for_timeout(3000)
+
+
+async def scrape_scan(page, context, capture, scan, mode):
+    """Rows of the grid for one scan, read on a freshly loaded Update Guide."""
+    capture.urls.clear()
+    await page.goto(f"{site_base}/update-guide", timeout=60000)
+    await select_filters(page, scan)
+
+    print("Waiting for result rows...")
+    await page.wait_for_selector('div[role="rowgroup"] div[role="row"]', timeout=20000)
+
+    data = []
+    if mode == "capture":
+        print("Reading all rows from the grid API...")
+        data = await capture.fetch_all(context.request)
+        for row in data:
+            row["date"] = row["Release date"]
+            row["details"] = row["Details"]
+        if not data:
+            print("No grid API response captured, falling back to scrolling")
+    if not data:
+        data = await scroll_grid(page)
+    print(f"{scan['name']}: extracted {len(data)} unique rows")
+    return data
+
+
+def parse_date(row):
+    try:
+        return datetime.strptime(row["date"], "%b %d, %Y")
+    except ValueError:
+        return datetime.min
+
+
+def write_sheet(workbook, worksheet, data):
+    headers = ["Article", "Date", "Title"]
+    # Rows read from the grid API carry every export column, keep them
+    extra = [c for c in GRID_COLUMNS if c not in ("Release date", "Details")] if data and "Product" in data[0] else []
+    extra_headers = ["KB Article" if c == "Article" else c for c in extra]
+    for col, header in enumerate(headers + extra_headers):
+        worksheet.write(0, col, header)
+
+    hyperlink_format = workbook.add_format({'color': 'blue', 'underline': 1})
+
+    for i, row in enumerate(data, start=1):
+        if row["details"].startswith("CVE-"):
+            url = f"https://msrc.microsoft.com/update-guide/vulnerability/{row['details']}"
+            worksheet.write_url(i, 0, url, hyperlink_format, row["details"])
+        else:
+            worksheet.write(i, 0, row["details"])
+        worksheet.write(i, 1, row["date"])
+        worksheet.write(i, 2, row["title"])
+        for col, column in enumerate(extra, start=len(headers)):
+            worksheet.write(i, col, row.get(column, ""))
+
+
+def write_results(results, output="workbooks"):
+    """One workbook per scan (msrc_<name>.xlsx) or one sheet per scan in msrc_update_guide.xlsx."""
+    import xlsxwriter
+
+    print("Writing to Excel...")
+    paths = []
+    if output == "sheets":
+        workbook = xlsxwriter.Workbook("msrc_update_guide.xlsx")
+        used = set()
+        for scan, data in results:
+            # Excel caps sheet names at 31 characters and forbids []:*?/\
+            name = re.sub(r"[\[\]:*?/\\]", " ", scan["name"])[:31]
+            while name.lower() in used:
+                name = name[:28] + f"~{len(used)}"
+            used.add(name.lower())
+            write_sheet(workbook, workbook.add_worksheet(name), data)
+        workbook.close()
+        paths.append("msrc_update_guide.xlsx")
+    else:
+        for scan, data in results:
+            path = f"msrc_{slug(scan['name'])}.xlsx"
+            workbook = xlsxwriter.Workbook(path)
+            write_sheet(workbook, workbook.add_worksheet(), data)
+            workbook.close()
+            paths.append(path)
+    for path in paths:
+        print(f"Excel saved as {path}")
+    return paths
+
+
+async def scrape(cache=None, mode="capture", headless=False, metrics_path=None, prometheus_path=None,
+                 scans=None, output="workbooks", store=None):
+    from playwright.async_api import async_playwright
+
+    from msrc_scraper.titles import RssTitleMap, TitleResolver
+
+    scans = scans or DEFAULT_SCANS
+    async with async_playwright() as p, open_browser(p, headless=headless, slow_mo=0 if headless else 100) as browser:
+        # Attached to the browser daemon this is its context with the cookie consent already given
+        context, owned = await warm_context(browser)
+        page = await context.new_page()
+        capture = GridCapture(page)
+
+        # Every scan runs in the same page and session, one after the other
+        results = []
+        with metrics.phase("grid"):
+            for scan in scans:
+                results.append((scan, await scrape_scan(page, context, capture, scan, mode)))
+
+        print("Fetching CVE titles...")
+        # Each CVE is looked up once, however many scans it shows up in
+        groups = CveGroups(row["details"] for _, data in results for row in data)
+        groups.summary()
+
+        async def browser_tier(cves):
+            titles = {}
+            for cve in cves:
+                url = f"{site_base}/update-guide/vulnerability/{cve}"
+                titles[cve] = await fetch_title(context, url)
+            return titles
+
+        # Cache, then the RSS feed, and a page load only for what neither of them knows
+        resolver = TitleResolver(cache=cache, rss=RssTitleMap(), browser=browser_tier)
+        with metrics.phase("titles"):
+            titles = await resolver.resolve(groups.unique)
+        for _, data in results:
+            for row in data:
+                row["title"] = titles.get(row["details"], "Unknown")
+            # Newest first
+            data.sort(key=parse_date, reverse=True)
+        if store is not None:
+            for scan, data in results:
+                # Scrolled rows only know which scan they came from
+                store.add(({"cve": row["details"], "release_date": row["date"], "title": row["title"],
+                            "product": row.get("Product") or scan["name"], "kb": row.get("Article"),
+                            "severity": row.get("Max Severity"), "impact": row.get("Impact")} for row in data),
+                          source="grid")
+
+        with metrics.phase("write"):
+            paths = write_results(results, output)
+        readiness.stats.report()
+        await page.close()
+        if owned:
+            await context.close()
+    if cache:
+        metrics.cache("cve_cache", cache.hits, cache.misses)
+    report_for = paths[0] if len(paths) == 1 else "msrc_update_guide.xlsx"
+    metrics.write_report(metrics_path or report_path_for(report_for), prometheus_path)
+
+
+def run(args):
+    from msrc_scraper.browser import browser_from_args
+    from msrc_scraper.cache import cache_from_args
+    from msrc_scraper import snapshots
+    from msrc_scraper.store import store_from_args
+
+    browser_from_args(args)
+    snapshots.snapshots_from_args(args)
+    cache = cache_from_args(args)
+    store = store_from_args(args)
+    scans = load_scans(args.products_file, args.product, args.family)
+    asyncio.run(scrape(cache=cache, mode=args.mode, headless=args.headless, metrics_path=args.metrics,
+                       prometheus_path=args.prometheus, scans=scans, output=args.output, store=store))
+    snapshots.close()
+    if cache:
+        cache.close()
+    if store:
+        store.close()
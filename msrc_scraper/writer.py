@@ -0,0 +1,87 @@
+"""Single-pass, constant-memory Excel output with clickable CVE links.
+
+Rows go straight to disk through xlsxwriter's ``constant_memory`` mode and
+every cell is written exactly once: the CVE link is emitted as part of the
+row instead of overwriting column 0 after ``to_excel``. Header and link
+styling match what ``DataFrame.to_excel`` + ``write_url`` produced.
+"""
+import math
+
+base_url = "https://msrc.microsoft.com/update-guide/vulnerability/"
+
+# pandas' default to_excel header style
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class LinkedSheetWriter:
+    """Write rows to ``path`` as they arrive, turning CVE ids in ``link_column`` into links.
+
+    Rows can be tuples in ``columns`` order, dicts, or whole DataFrames
+    (``write_frame``) so enriched chunks can be flushed as soon as they are
+    ready. Use as a context manager or call ``close()``.
+    """
+
+    def __init__(self, path, columns, link_column="Details", sheet_name="Sheet1"):
+        import xlsxwriter
+
+        self.path = path
+        self.columns = list(columns)
+        self.link_index = self.columns.index(link_column) if link_column in self.columns else None
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self.worksheet = self.workbook.add_worksheet(sheet_name)
+        self.worksheet.write_row(0, 0, self.columns, self.workbook.add_format(HEADER_FORMAT))
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_row(self, values):
+        if isinstance(values, dict):
+            values = [values.get(c) for c in self.columns]
+        self.rows += 1
+        row = self.rows
+        worksheet = self.worksheet
+        for col, value in enumerate(values):
+            # Advisories and other non-CVE ids stay as plain text, like to_excel wrote them
+            if col == self.link_index and isinstance(value, str) and value.startswith("CVE-"):
+                worksheet.write_url(row, col, base_url + value, string=value)
+                continue
+            if _is_blank(value):
+                continue
+            worksheet.write(row, col, value)
+
+    def write_rows(self, rows):
+        for values in rows:
+            self.write_row(values)
+
+    def write_frame(self, df):
+        self.write_rows(df[self.columns].itertuples(index=False, name=None))
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.close()
+            self.workbook = None
+
+
+def write_with_links(df_or_chunks, output_file, columns=None):
+    """Write a DataFrame, or an iterable of DataFrame chunks, in one streaming pass."""
+    chunks = [df_or_chunks] if hasattr(df_or_chunks, "columns") else df_or_chunks
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                writer = LinkedSheetWriter(output_file, columns or list(chunk.columns))
+            writer.write_frame(chunk)
+        if writer is None and columns:
+            writer = LinkedSheetWriter(output_file, columns)
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer.rows if writer else 0
@@ -0,0 +1,48 @@
+from msrc_scraper.api import document_id_for, parse_cvrf, parse_exploit_status
+
+
+def test_parse_exploit_status():
+    assert parse_exploit_status("Publicly Disclosed:No;Exploited:No;Latest Software Release:Exploitation Less Likely"
+                                ) == "Exploitation Less Likely"
+    assert parse_exploit_status("Publicly Disclosed:No;Exploited:Yes;Latest Software Release:Exploitation More Likely"
+                                ) == "Exploitation Detected"
+    assert parse_exploit_status("Exploited:No;Older Software Release:Exploitation Unlikely") == "Exploitation Unlikely"
+    assert parse_exploit_status("Publicly Disclosed:No") == "Unknown"
+
+
+def test_parse_cvrf():
+    doc = {
+        "DocumentTracking": {"InitialReleaseDate": "2026-02-10T08:00:00"},
+        "Vulnerability": [
+            {
+                "CVE": "CVE-2026-21001",
+                "Title": {"Value": " Windows Kernel Elevation of Privilege Vulnerability "},
+                "Threats": [
+                    {"Type": 0, "Description": {"Value": "Elevation of Privilege"}},
+                    {"Type": 1, "Description": {"Value": "Publicly Disclosed:No;Exploited:No;"
+                                                         "Latest Software Release:Exploitation More Likely"}},
+                    {"Type": 1, "Description": {"Value": "Exploited:Yes"}},
+                    {"Type": 3, "Description": {"Value": "Important"}},
+                ],
+                "CVSSScoreSets": [{"BaseScore": 7.0}, {"BaseScore": 7.8}, {"TemporalScore": 6.8}],
+                "RevisionHistory": [{"Date": "2026-01-13T08:00:00"}],
+            },
+            {"CVE": "CVE-2026-21002", "Threats": [{"Type": 1, "Description": {"Value": ""}}]},
+            {"Title": {"Value": "No CVE id"}},
+        ],
+    }
+    assert parse_cvrf(doc) == {
+        "CVE-2026-21001": {"title": "Windows Kernel Elevation of Privilege Vulnerability",
+                           "exploitability": "Exploitation More Likely", "cvss": "7.8", "severity": "Important",
+                           "impact": "Elevation of Privilege", "release_date": "2026-01-13"},
+        "CVE-2026-21002": {"title": "Unknown", "exploitability": "Unknown", "cvss": "Unknown", "severity": "Unknown",
+                           "impact": "Unknown", "release_date": "2026-02-10"},
+    }
+    assert parse_cvrf({}) == {}
+
+
+def test_document_id_for():
+    assert document_id_for("2026-02-10") == "2026-Feb"
+    assert document_id_for("2026-12-09T08:00:00Z") == "2026-Dec"
+    assert document_id_for("Feb 10, 2026") is None
+    assert document_id_for(None) is None
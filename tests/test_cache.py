@@ -0,0 +1,51 @@
+import time
+
+from msrc_scraper.cache import DAY, CveCache
+
+
+def test_fields_expire_on_their_own_ttl(tmp_path):
+    cache = CveCache(cache_dir=str(tmp_path))
+    try:
+        cache.put("CVE-2026-21001", fetched_at=time.time() - 2 * DAY, title="Kernel Vulnerability",
+                  exploitability="Exploitation Less Likely")
+        assert cache.get("CVE-2026-21001", "title") == "Kernel Vulnerability"
+        # Exploitability is re-assessed, so it goes stale after a day while the title stays
+        assert cache.get("CVE-2026-21001", "exploitability") is None
+        assert cache.get_all("CVE-2026-21001", ("title", "exploitability")) is None
+
+        cache.put("CVE-2026-21001", exploitability="Exploitation Detected")
+        assert cache.get_all("CVE-2026-21001", ("title", "exploitability")) == {
+            "title": "Kernel Vulnerability", "exploitability": "Exploitation Detected"}
+    finally:
+        cache.close()
+
+
+def test_older_values_and_placeholders_dont_replace_newer_ones(tmp_path):
+    cache = CveCache(cache_dir=str(tmp_path))
+    try:
+        cache.put("CVE-2026-21001", exploitability="Exploitation Detected")
+        cache.put("CVE-2026-21001", fetched_at=time.time() - 3600, exploitability="Exploitation Less Likely")
+        cache.put("CVE-2026-21001", exploitability="Unknown", title="")
+        assert cache.get("CVE-2026-21001", "exploitability") == "Exploitation Detected"
+        assert cache.get("CVE-2026-21001", "title") is None
+    finally:
+        cache.close()
+
+
+def test_get_all_counts_one_hit_or_miss_per_cve(tmp_path):
+    cache = CveCache(cache_dir=str(tmp_path))
+    try:
+        cache.put("CVE-2026-21001", title="Kernel Vulnerability", exploitability="Exploitation Less Likely")
+        cache.put("CVE-2026-21002", title="Hyper-V Vulnerability")
+        fields = ("title", "exploitability")
+        assert cache.get_all("CVE-2026-21001", fields) is not None
+        assert cache.get_all("CVE-2026-21002", fields) is None
+        assert cache.get_all("CVE-2026-21003", fields) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        refreshing = CveCache(cache_dir=str(tmp_path), refresh=True)
+        assert refreshing.get_all("CVE-2026-21001", fields) is None
+        assert (refreshing.hits, refreshing.misses) == (0, 1)
+        refreshing.close()
+    finally:
+        cache.close()
@@ -0,0 +1,12 @@
+from msrc_scraper.dedup import CveGroups
+
+
+def test_fan_out():
+    details = ["CVE-2026-21001", "CVE-2026-21002", None, "CVE-2026-21001", "ADV260001", "CVE-2026-21003"]
+    groups = CveGroups(details)
+    assert groups.unique == ["CVE-2026-21001", "CVE-2026-21002", "CVE-2026-21003"]
+    assert groups.cve_rows == 4
+    assert groups.fan_out({"CVE-2026-21001": "Kernel Vulnerability", "CVE-2026-21002": "Hyper-V Vulnerability",
+                           "ADV260001": "Advisory"}) == [
+        "Kernel Vulnerability", "Hyper-V Vulnerability", "Unknown", "Kernel Vulnerability", "Unknown", "Unknown"]
+    assert groups.fan_out({}, default="") == [""] * len(details)
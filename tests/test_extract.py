@@ -0,0 +1,37 @@
+from msrc_scraper.extract import extract_html
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>CVE-2026-21001 - Security Update Guide</title><style>h1 { color: red }</style></head>
+<body>
+<h1 class="ms-fontWeight-semibold">Windows Kernel   Elevation of Privilege Vulnerability
+<span>CVE-2026-21001</span></h1>
+<div id="content">
+<p>Released: Feb 10, 2026</p>
+<p>CVSS:3.1 7.8 / 6.8</p>
+<dl class="css-354"><dt>Impact</dt><dd>Elevation of Privilege</dd><dt>Max Severity</dt><dd>Important</dd></dl>
+<h2>Exploitability</h2>
+<dl class="css-354"><dt>Exploitability Assessment</dt><dd><b>Exploitation</b> More Likely</dd></dl>
+<script>document.title = "Exploitation Detected";</script>
+</div>
+</body></html>"""
+
+
+def test_extract_html():
+    assert extract_html(PAGE) == {
+        "title": "Windows Kernel Elevation of Privilege Vulnerability", "exploitability": "Exploitation More Likely",
+        "cvss": "7.8", "severity": "Important", "impact": "Elevation of Privilege", "release_date": "2026-02-10"}
+
+
+def test_extract_html_before_the_page_rendered():
+    page = """<html><body><div class="ms-Spinner">Loading...</div>
+<h1 class="ms-fontWeight-semibold">Loading...</h1><div id="content"></div></body></html>"""
+    assert set(extract_html(page).values()) == {"Unknown"}
+
+
+def test_extract_html_falls_back_to_the_page_text():
+    page = """<html><body><h1 class="ms-fontWeight-semibold">Hyper-V Denial of Service Vulnerability</h1>
+<p>Exploitability assessment:</p><p>Exploitation Less Likely</p><p>Max Severity: Moderate</p></body></html>"""
+    record = extract_html(page)
+    assert record["exploitability"] == "Exploitation Less Likely"
+    assert record["severity"] == "Moderate"
+    assert record["impact"] == "Denial of Service"
@@ -0,0 +1,53 @@
+import pandas as pd
+from openpyxl import Workbook
+
+from msrc_scraper.incremental import Journal, carry_over, resolved
+
+
+def test_journal_resumes_field_by_field(tmp_path):
+    path = tmp_path / "out.journal.jsonl"
+    journal = Journal(str(path))
+    journal.record("CVE-2026-21001", {"title": "Kernel Vulnerability", "exploitability": "Unknown"})
+    journal.record("CVE-2026-21001", {"title": "Unknown", "exploitability": "Exploitation Less Likely"})
+    journal.record("CVE-2026-21002", {"title": "Unknown", "exploitability": "Exploitation More Likely"})
+    journal.close()
+    # A crash mid-write leaves a torn last line
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"cve": "CVE-2026-21003", "ti')
+
+    records = Journal(str(path)).load()
+    assert records == {
+        "CVE-2026-21001": {"title": "Kernel Vulnerability", "exploitability": "Exploitation Less Likely"},
+        "CVE-2026-21002": {"title": "Unknown", "exploitability": "Exploitation More Likely"},
+    }
+    assert resolved(records["CVE-2026-21001"])
+    assert not resolved(records["CVE-2026-21002"])
+
+
+def test_carry_over(tmp_path):
+    previous = tmp_path / "out.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Details", "Release date", "Today's Date", "Exploitability assessment", "Product"])
+    sheet.append(["CVE-2026-21001", "2026-02-10", "2026-03-01", "Exploitation Less Likely", "Kernel Vulnerability"])
+    sheet.append(["CVE-2026-21001", "2026-02-10", "2026-03-01", "Exploitation Less Likely", "Kernel Vulnerability"])
+    sheet.append(["CVE-2026-21002", "2026-02-10", "2026-03-01", "Unknown", "Hyper-V Vulnerability"])
+    sheet.append(["CVE-2026-21003", "2026-02-10", "2026-03-01", "Unknown", "Unknown"])
+    sheet.append(["CVE-2026-21004", "2026-02-10", "2026-03-01", "Exploitation More Likely", "Revised Vulnerability"])
+    sheet.append(["ADV260001", "2026-02-10", "2026-03-01", "Unknown", "Unknown"])
+    workbook.save(previous)
+    df = pd.DataFrame({
+        "Details": ["CVE-2026-21001", "CVE-2026-21002", "CVE-2026-21003", "CVE-2026-21004", "CVE-2026-21005"],
+        "Release date": ["2026-02-10", "2026-02-10", "2026-02-10", "2026-03-10", "2026-03-10"],
+    })
+
+    records = carry_over(df, str(previous), {"Product": "title", "Exploitability assessment": "exploitability"},
+                         compare=("Release date",))
+    assert records == {
+        "CVE-2026-21001": {"title": "Kernel Vulnerability", "exploitability": "Exploitation Less Likely"},
+        # Carried over for its title, but fetched again for the assessment
+        "CVE-2026-21002": {"title": "Hyper-V Vulnerability", "exploitability": "Unknown"},
+    }
+    assert not resolved(records["CVE-2026-21002"])
+    assert carry_over(df, str(previous), {"Exploitability": "exploitability"}) == {}
+    assert carry_over(df, str(tmp_path / "missing.xlsx"), {"Product": "title"}) == {}
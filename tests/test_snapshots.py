@@ -0,0 +1,36 @@
+import time
+
+from msrc_scraper.cache import DAY, CveCache
+from msrc_scraper.snapshots import SnapshotStore
+
+
+def test_prune_keeps_newest_per_key(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    try:
+        for n in range(5):
+            store.put("page", "CVE-2026-21001", f"<h1>version {n}</h1>")
+        store.put("page", "CVE-2026-21002", "<h1>only version</h1>")
+        store.conn.execute("UPDATE snapshot SET fetched_at = ? WHERE key = 'CVE-2026-21002'",
+                           (time.time() - 100 * DAY,))
+
+        assert store.prune(keep=2, max_age=90 * DAY) == 4
+        assert store.get("page", "CVE-2026-21001") == b"<h1>version 4</h1>"
+        assert store.get("page", "CVE-2026-21002") is None
+        assert store.stats()["blobs"] == 2
+        assert len(list((tmp_path / "snapshots" / "objects").rglob("*.*"))) == 2
+    finally:
+        store.close()
+
+
+def test_older_values_do_not_replace_newer(tmp_path):
+    cache = CveCache(cache_dir=str(tmp_path))
+    try:
+        cache.put("CVE-2026-21001", title="New title")
+        cache.put("CVE-2026-21001", fetched_at=time.time() - 3600, title="Old title", exploitability="Old")
+        assert cache.get("CVE-2026-21001", "title") == "New title"
+        assert cache.get("CVE-2026-21001", "exploitability") == "Old"
+        # A day-old snapshot is already past the exploitability TTL
+        cache.put("CVE-2026-21002", fetched_at=time.time() - 2 * DAY, exploitability="Stale")
+        assert cache.get("CVE-2026-21002", "exploitability") is None
+    finally:
+        cache.close()
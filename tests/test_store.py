@@ -0,0 +1,37 @@
+from msrc_scraper.store import ResultStore
+
+
+def test_title_search_with_fts_syntax_characters(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.add([
+        {"cve": "CVE-2026-21001", "product": "Windows Server 2016",
+         "title": "Windows Hyper-V Remote Code Execution Vulnerability"},
+        {"cve": "CVE-2026-21002", "product": ".NET Framework 4.8",
+         "title": ".NET Framework Out-of-Bounds Read Vulnerability"},
+    ])
+    try:
+        assert [r["cve"] for r in store.query(title="Hyper-V")] == ["CVE-2026-21001"]
+        assert [r["cve"] for r in store.query(title=".NET")] == ["CVE-2026-21002"]
+        assert [r["cve"] for r in store.query(title="Out-of-Bounds")] == ["CVE-2026-21002"]
+        assert [r["cve"] for r in store.query(title="Remot*")] == ["CVE-2026-21001"]
+    finally:
+        store.close()
+
+
+def test_title_search_keeps_operators(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.add([
+        {"cve": "CVE-2026-21001", "product": "Windows Server 2016",
+         "title": "Windows Kernel Elevation of Privilege Vulnerability"},
+        {"cve": "CVE-2026-21002", "product": "Windows Server 2016",
+         "title": "Windows Hyper-V Remote Code Execution Vulnerability"},
+    ])
+    try:
+        assert [r["cve"] for r in store.query(title="kernel AND elevation")] == ["CVE-2026-21001"]
+        assert [r["cve"] for r in store.query(title="kernel OR foo")] == ["CVE-2026-21001"]
+        assert [r["cve"] for r in store.query(title="Windows NOT kernel")] == ["CVE-2026-21002"]
+        # Operators without a word on both sides are just words
+        assert store.query(title="AND kernel") == []
+        assert [r["cve"] for r in store.query(title="kernel AND")] == []
+    finally:
+        store.close()
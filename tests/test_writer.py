@@ -0,0 +1,31 @@
+import openpyxl
+import pandas as pd
+
+from msrc_scraper.writer import base_url, write_with_links
+
+
+def _baseline(df, path):
+    # exploitability.py's write_excel before the single-pass writer
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False, sheet_name="Sheet1")
+        worksheet = writer.sheets["Sheet1"]
+        for row_num, value in enumerate(df["Details"], start=1):
+            if isinstance(value, str) and value.startswith("CVE-"):
+                worksheet.write_url(row_num, 0, base_url + value, string=value)
+
+
+def _cells(path):
+    sheet = openpyxl.load_workbook(path).active
+    return [[(cell.value, cell.hyperlink.target if cell.hyperlink else None) for cell in row]
+            for row in sheet.iter_rows()]
+
+
+def test_same_cells_and_links_as_to_excel(tmp_path):
+    df = pd.DataFrame({"Details": ["CVE-2026-21001", "ADV990001", None, "CVE-2026-21002"],
+                       "Exploitability": ["Exploitation Less Likely", "Unknown", "Unknown", None]})
+    _baseline(df, str(tmp_path / "baseline.xlsx"))
+    write_with_links(df, str(tmp_path / "new.xlsx"))
+    cells = _cells(str(tmp_path / "new.xlsx"))
+    assert cells == _cells(str(tmp_path / "baseline.xlsx"))
+    assert cells[2][0] == ("ADV990001", None)
+    assert cells[1][0] == ("CVE-2026-21001", base_url + "CVE-2026-21001")